@@ -0,0 +1,215 @@
+# 벤치마크용 데이터셋 시딩(같은 --seed면 같은 데이터)
+# - 사용자/게시글/댓글(대댓글 포함)/좋아요/채팅 메시지를 scale 프리셋 또는 개수 지정으로 생성
+# - 모든 사용자는 같은 비밀번호(BENCH_PASSWORD) -> 해시는 1번만 계산
+# - ORM 객체 대신 Core insert(executemany)로 저장
+# - 벤치마크 대상 DB 전용(--reset은 모든 테이블을 지우고 다시 만듦)
+#   --reset 없이 시딩하면 기존 데이터 뒤에 추가(같은 --seed로 이미 시딩했으면 실패)
+#   python -m benchmarks.dataset --scale small --reset --output dataset.json
+import argparse
+import json
+import random
+from dataclasses import dataclass, asdict
+from datetime import datetime, timedelta
+
+from sqlalchemy import Engine, create_engine, insert, select, func
+
+from chat.ids import message_id_generator
+from chat.models import ChatMessage, ChatRoom
+from config.database.orm import Base
+from feed.models import Post, PostComment, PostLike
+from user.models import User
+from user.service.authentication import hash_password
+
+BENCH_PASSWORD = "bench-pw"
+BENCH_IMAGE = "feed/posts/bench.jpg"
+BATCH_SIZE = 5_000
+
+SCALES = {
+    "small": dict(users=200, posts=1_000, comments=5_000, likes=10_000, rooms=10, messages=10_000),
+    "medium": dict(users=2_000, posts=20_000, comments=100_000, likes=200_000, rooms=50, messages=200_000),
+    "large": dict(users=20_000, posts=200_000, comments=1_000_000, likes=2_000_000, rooms=200, messages=1_000_000),
+}
+
+
+@dataclass
+class Dataset:
+    seed: int
+    users: int
+    posts: int
+    comments: int
+    likes: int
+    rooms: int
+    messages: int
+    # 시딩 후 실제 id 범위(벤치마크 요청에서 사용)
+    usernames: list[str]
+    password: str
+    post_ids: tuple[int, int]
+
+
+def _insert(engine: Engine, model, rows) -> None:
+    batch = []
+    with engine.begin() as connection:
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= BATCH_SIZE:
+                connection.execute(insert(model), batch)
+                batch = []
+        if batch:
+            connection.execute(insert(model), batch)
+
+
+def _max_id(engine: Engine, model) -> int:
+    with engine.connect() as connection:
+        return connection.execute(select(func.max(model.id))).scalar() or 0
+
+
+# 이번에 추가한 행의 id 범위(auto increment, 벤치마크 DB에 다른 쓰기가 없다고 가정)
+# -> --reset 없이 시딩해도 기존 행은 요청 대상에서 제외
+def _insert_range(engine: Engine, model, rows) -> tuple[int, int]:
+    before = _max_id(engine, model)
+    _insert(engine, model, rows)
+    return before + 1, _max_id(engine, model)
+
+
+def seed(engine: Engine, seed: int, reset: bool, **counts) -> Dataset:
+    rng = random.Random(seed)
+    if reset:
+        Base.metadata.drop_all(engine)
+        Base.metadata.create_all(engine)
+
+    created_at = datetime(2024, 1, 1)
+    hashed_password = hash_password(plain_text=BENCH_PASSWORD)
+    prefix = f"b{seed % 1000:03d}"  # username은 최대 10자
+    usernames = [f"{prefix}{i:06d}" for i in range(counts["users"])]
+    if usernames:
+        with engine.connect() as connection:
+            if connection.execute(select(User.id).where(User.username == usernames[0])).first():
+                raise ValueError(
+                    f"Dataset for seed {seed} already exists (use --reset or another --seed)"
+                )
+    user_low, user_high = _insert_range(engine, User, (
+        {"username": username, "password": hashed_password, "created_at": created_at}
+        for username in usernames
+    ))
+
+    post_low, post_high = _insert_range(engine, Post, (
+        {
+            "user_id": rng.randint(user_low, user_high),
+            "image": BENCH_IMAGE,
+            "content": f"bench post {i}",
+            "created_at": created_at + timedelta(seconds=i),
+        }
+        for i in range(counts["posts"])
+    ))
+
+    # 절반은 댓글, 절반은 대댓글(앞에서 만든 댓글 중 하나에 달림)
+    parent_count = counts["comments"] // 2
+    comment_low, comment_high = _insert_range(engine, PostComment, (
+        {
+            "user_id": rng.randint(user_low, user_high),
+            "post_id": rng.randint(post_low, post_high),
+            "content": f"bench comment {i}",
+            "created_at": created_at,
+        }
+        for i in range(parent_count)
+    ))
+    with engine.connect() as connection:
+        parents = connection.execute(
+            select(PostComment.id, PostComment.post_id)
+            .where(PostComment.id.between(comment_low, comment_high))
+        ).all()
+    if parents:
+        replies = (rng.choice(parents) for _ in range(counts["comments"] - parent_count))
+        _insert(engine, PostComment, (
+            {
+                "user_id": rng.randint(user_low, user_high),
+                "post_id": parent.post_id,
+                "parent_id": parent.id,
+                "content": f"bench reply {i}",
+                "created_at": created_at,
+            }
+            for i, parent in enumerate(replies)
+        ))
+
+    # (user_id, post_id) 중복 없이
+    pairs = set()
+    max_pairs = 0
+    if counts["users"] and counts["posts"]:
+        max_pairs = (user_high - user_low + 1) * (post_high - post_low + 1)
+    while len(pairs) < min(counts["likes"], max_pairs):
+        pairs.add((rng.randint(user_low, user_high), rng.randint(post_low, post_high)))
+    _insert(engine, PostLike, (
+        {"user_id": user_id, "post_id": post_id, "created_at": created_at}
+        for user_id, post_id in sorted(pairs)
+    ))
+
+    room_low, room_high = _insert_range(
+        engine, ChatRoom, ({"name": f"bench room {i}"} for i in range(counts["rooms"]))
+    )
+    if counts["rooms"]:
+        _insert(engine, ChatMessage, (
+            {
+                "id": message_id_generator.generate(),
+                "user_id": rng.randint(user_low, user_high),
+                "chat_room_id": rng.randint(room_low, room_high),
+                "content": f"bench message {i}",
+                "created_at": created_at + timedelta(milliseconds=i),
+            }
+            for i in range(counts["messages"])
+        ))
+
+    return Dataset(
+        seed=seed,
+        usernames=usernames,
+        password=BENCH_PASSWORD,
+        post_ids=(post_low, post_high),
+        **{**counts, "likes": len(pairs)},  # 중복 제거/상한으로 요청한 수보다 적을 수 있음
+    )
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--database-url", default=None, help="기본값: settings.database_url")
+    parser.add_argument("--scale", choices=SCALES, default="small")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--reset", action="store_true", help="모든 테이블을 지우고 다시 생성(없으면 기존 데이터 뒤에 추가)"
+    )
+    for name in SCALES["small"]:
+        parser.add_argument(f"--{name}", type=int, default=None, help="scale 프리셋 대신 개수 지정")
+
+
+def seed_from_args(args) -> Dataset:
+    database_url = args.database_url
+    if database_url is None:
+        from config import settings
+        database_url = settings.database_url
+
+    counts = {
+        name: getattr(args, name) if getattr(args, name) is not None else default
+        for name, default in SCALES[args.scale].items()
+    }
+    engine = create_engine(database_url)
+    try:
+        return seed(engine, seed=args.seed, reset=args.reset, **counts)
+    finally:
+        engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    add_arguments(parser)
+    parser.add_argument("--output", default=None, help="데이터셋 정보 JSON 파일 경로")
+    args = parser.parse_args()
+
+    dataset = seed_from_args(args)
+    print(
+        f"users={dataset.users} posts={dataset.posts} comments={dataset.comments} "
+        f"likes={dataset.likes} rooms={dataset.rooms} messages={dataset.messages}"
+    )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(asdict(dataset), f)
+
+
+if __name__ == "__main__":
+    main()
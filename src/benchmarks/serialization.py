@@ -0,0 +1,151 @@
+# 응답 직렬화 마이크로 벤치마크(DB 없이 메모리에서 만든 ORM 객체 사용)
+# - feed: 게시글 1,000개 목록
+# - detail: 댓글 5,000개(댓글 1,000 + 대댓글 4,000) 게시글 상세
+# - baseline: Pydantic 모델 생성 -> FastAPI 방식(model_dump(mode="json") + json.dumps)
+# - fast: row/ORM 객체에서 dict 생성 -> orjson
+#   python -m benchmarks.serialization --iterations 200 --output serialization.json
+import argparse
+import json
+import time
+from datetime import datetime, timedelta
+
+from benchmarks.stats import LatencySummary, print_table, write_json
+from config.serialization import dumps, orjson
+from feed.models import Post, PostComment
+from feed.response import PostDetailResponse, PostListResponse
+from user.models import User
+
+
+class FakeUserLoader:
+    # UserLoader와 같은 인터페이스(DB 조회 X)
+    def __init__(self, users: dict[int, User]):
+        self.users = users
+
+    def add(self, user_id: int) -> None:
+        pass
+
+    def dispatch(self) -> None:
+        pass
+
+    def get(self, user_id: int) -> User | None:
+        return self.users.get(user_id)
+
+
+def _build_posts(count: int) -> list[Post]:
+    now = datetime.now()
+    return [
+        Post(
+            id=i,
+            user_id=i % 100,
+            image=f"feed/posts/{i}_image.png",
+            content=f"post {i}",
+            created_at=now - timedelta(seconds=i),
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def _build_post_detail(comments: int, replies_per_comment: int) -> Post:
+    now = datetime.now()
+    post = Post(id=1, user_id=1, image="feed/posts/1_image.png", content="post", created_at=now)
+    comment_id = 0
+    parents = []
+    for _ in range(comments):
+        comment_id += 1
+        parent = PostComment(
+            id=comment_id, user_id=comment_id % 100, post_id=1,
+            content=f"comment {comment_id}", parent_id=None, created_at=now,
+        )
+        for _ in range(replies_per_comment):
+            comment_id += 1
+            parent.replies.append(
+                PostComment(
+                    id=comment_id, user_id=comment_id % 100, post_id=1,
+                    content=f"reply {comment_id}", parent_id=parent.id, created_at=now,
+                )
+            )
+        parents.append(parent)
+    post.comments = parents
+    return post
+
+
+def _baseline_dumps(model) -> bytes:
+    # FastAPI 기본 경로: response_model 직렬화 -> JSONResponse(json.dumps)
+    return json.dumps(
+        model.model_dump(mode="json"), ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def _measure(name: str, fn, iterations: int) -> LatencySummary:
+    fn()  # warm-up
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(iterations):
+        t = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - t)
+    return LatencySummary.build(
+        name=name, latencies=latencies, errors=0, duration=time.perf_counter() - start
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--posts", type=int, default=1_000)
+    parser.add_argument("--comments", type=int, default=1_000)
+    parser.add_argument("--replies", type=int, default=4, help="댓글당 대댓글 수")
+    parser.add_argument("--output", default=None, help="결과 JSON 파일 경로")
+    args = parser.parse_args()
+
+    posts = _build_posts(args.posts)
+    rows = [(p.id, p.image) for p in posts]
+    post = _build_post_detail(args.comments, args.replies)
+    users = {i: User(id=i, username=f"user{i}", password="pw") for i in range(100)}
+    loader = FakeUserLoader(users)
+
+    # 두 경로의 결과가 같은지 먼저 확인
+    assert json.loads(_baseline_dumps(PostListResponse.build(posts=posts))) == json.loads(
+        dumps(PostListResponse.build_content(rows=rows))
+    )
+    assert json.loads(
+        _baseline_dumps(PostDetailResponse.build(post=post, user_loader=loader))
+    ) == json.loads(dumps(PostDetailResponse.build_content(post=post, user_loader=loader)))
+
+    summaries = [
+        _measure(
+            "feed:baseline",
+            lambda: _baseline_dumps(PostListResponse.build(posts=posts)),
+            args.iterations,
+        ),
+        _measure(
+            "feed:fast",
+            lambda: dumps(PostListResponse.build_content(rows=rows)),
+            args.iterations,
+        ),
+        _measure(
+            "detail:baseline",
+            lambda: _baseline_dumps(PostDetailResponse.build(post=post, user_loader=loader)),
+            args.iterations,
+        ),
+        _measure(
+            "detail:fast",
+            lambda: dumps(PostDetailResponse.build_content(post=post, user_loader=loader)),
+            args.iterations,
+        ),
+    ]
+    print_table(summaries)
+    if orjson is None:
+        print("orjson is not installed: fast path used the standard json module")
+    if args.output:
+        write_json(
+            args.output,
+            summaries,
+            posts=args.posts,
+            comments=args.comments * (1 + args.replies),
+            orjson=orjson is not None,
+        )
+
+
+if __name__ == "__main__":
+    main()
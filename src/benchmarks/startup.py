@@ -0,0 +1,99 @@
+# 서버 시작 시간 벤치마크(콜드 스타트)
+# - 매번 새 파이썬 프로세스에서 측정
+#   import: import main (앱 생성 포함)
+#   create_app: 모듈 import가 끝난 뒤 앱 생성만
+#   startup/shutdown: lifespan(엔진/Redis/HTTP 클라이언트 생성 + warm-up / 정리)
+# - --importtime: python -X importtime 결과에서 누적 시간이 큰 모듈 출력
+#   python -m benchmarks.startup --runs 10 --output startup.json
+#   python -m benchmarks.startup --no-lifespan --importtime
+import argparse
+import json
+import subprocess
+import sys
+
+from benchmarks.stats import percentile
+
+CHILD = """
+import asyncio, json, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+app = main.create_app()
+created = time.perf_counter()
+result = {"import": imported - start, "create_app": created - imported}
+
+async def lifespan():
+    async with app.router.lifespan_context(app):
+        started = time.perf_counter()
+        result["startup"] = started - created
+    result["shutdown"] = time.perf_counter() - started
+
+if %(lifespan)s:
+    asyncio.run(lifespan())
+print(json.dumps(result))
+"""
+
+
+def _run_child(lifespan: bool) -> dict[str, float]:
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD % {"lifespan": lifespan}],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def _importtime(top: int) -> list[tuple[str, int]]:
+    # stderr: "import time: self [us] | cumulative | imported package"
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    modules = []
+    for line in output.stderr.splitlines()[1:]:
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        # 최상위(들여쓰기 1단계) 모듈만
+        if name.startswith(" ") and not name.startswith("   "):
+            modules.append((name.strip(), int(cumulative)))
+    return sorted(modules, key=lambda m: m[1], reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--no-lifespan", action="store_true", help="DB/Redis 없이 import만 측정")
+    parser.add_argument("--importtime", action="store_true")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--output", default=None, help="결과 JSON 파일 경로")
+    args = parser.parse_args()
+
+    runs = [_run_child(lifespan=not args.no_lifespan) for _ in range(args.runs)]
+    stats = {}
+    print(f"{'phase':<12}{'p50(ms)':>10}{'max(ms)':>10}")
+    for phase in runs[0]:
+        values = sorted(run[phase] for run in runs)
+        stats[phase] = {
+            "p50_ms": percentile(values, 50) * 1000,
+            "max_ms": values[-1] * 1000,
+        }
+        print(f"{phase:<12}{stats[phase]['p50_ms']:>10.1f}{stats[phase]['max_ms']:>10.1f}")
+
+    modules = []
+    if args.importtime:
+        modules = _importtime(args.top)
+        print(f"\n{'module':<40}{'cumulative(ms)':>16}")
+        for name, cumulative in modules:
+            print(f"{name:<40}{cumulative / 1000:>16.1f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(
+                {"runs": args.runs, "phases": stats, "importtime": modules}, f, indent=2
+            )
+
+
+if __name__ == "__main__":
+    main()
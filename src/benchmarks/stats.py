@@ -0,0 +1,92 @@
+import json
+import math
+from dataclasses import dataclass, asdict
+
+
+def percentile(sorted_values: list[float], p: float) -> float:
+    # nearest-rank 방식 (sorted_values는 오름차순 정렬되어 있어야 함)
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(p / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+@dataclass
+class LatencySummary:
+    name: str
+    requests: int
+    errors: int
+    duration: float  # 초
+    throughput: float  # 초당 요청 수
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+
+    @classmethod
+    def build(
+        cls, name: str, latencies: list[float], errors: int, duration: float
+    ):
+        values = sorted(latencies)
+        return cls(
+            name=name,
+            requests=len(values),
+            errors=errors,
+            duration=duration,
+            throughput=len(values) / duration if duration else 0.0,
+            p50_ms=percentile(values, 50) * 1000,
+            p95_ms=percentile(values, 95) * 1000,
+            p99_ms=percentile(values, 99) * 1000,
+            max_ms=(values[-1] * 1000) if values else 0.0,
+        )
+
+
+def print_table(summaries: list[LatencySummary]) -> None:
+    header = (
+        f"{'name':<32}{'req':>9}{'err':>7}{'rps':>10}"
+        f"{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}{'max(ms)':>10}"
+    )
+    print(header)
+    print("-" * len(header))
+    for s in summaries:
+        print(
+            f"{s.name:<32}{s.requests:>9}{s.errors:>7}{s.throughput:>10.1f}"
+            f"{s.p50_ms:>10.2f}{s.p95_ms:>10.2f}{s.p99_ms:>10.2f}{s.max_ms:>10.2f}"
+        )
+
+
+def write_json(path: str, summaries: list[LatencySummary], **meta) -> None:
+    with open(path, "w") as f:
+        json.dump(
+            {"meta": meta, "results": [asdict(s) for s in summaries]},
+            f,
+            indent=2,
+        )
+
+
+def load_results(path: str) -> dict[str, dict]:
+    with open(path) as f:
+        return {result["name"]: result for result in json.load(f)["results"]}
+
+
+# 기준값(baseline) 대비 max_regression 비율 이상 나빠진 항목
+# - 처리량은 낮아지면, latency는 높아지면 회귀
+# - 기준값에 없는 항목은 비교하지 않음
+def find_regressions(
+    summaries: list[LatencySummary], baseline: dict[str, dict], max_regression: float
+) -> list[str]:
+    regressions = []
+    for s in summaries:
+        if (base := baseline.get(s.name)) is None:
+            continue
+        if s.throughput < base["throughput"] * (1 - max_regression):
+            regressions.append(
+                f"{s.name}: throughput {s.throughput:.1f} < baseline {base['throughput']:.1f}"
+            )
+        for key in ("p50_ms", "p95_ms", "p99_ms"):
+            value, base_value = getattr(s, key), base[key]
+            if value > base_value * (1 + max_regression):
+                regressions.append(f"{s.name}: {key} {value:.2f} > baseline {base_value:.2f}")
+        if s.errors and not base["errors"]:
+            regressions.append(f"{s.name}: {s.errors} errors (baseline 0)")
+    return regressions
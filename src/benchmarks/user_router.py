@@ -0,0 +1,151 @@
+# 동기(user/api/router.py) vs 비동기(user/api/router_async.py) user 라우터 벤치마크
+#
+# 1) 같은 DB/Redis를 바라보는 서버 두 개를 띄운다.
+#   USER_ROUTER=sync  uvicorn main:app --port 8000
+#   USER_ROUTER=async uvicorn main:app --port 8001
+# 2) 두 서버에 같은 부하를 걸어서 처리량과 tail latency를 비교한다.
+#   python -m benchmarks.user_router \
+#       --target sync=http://127.0.0.1:8000 \
+#       --target async=http://127.0.0.1:8001 \
+#       --concurrency 64 --duration 20 --output user_router.json
+import argparse
+import asyncio
+import time
+import uuid
+
+import httpx
+
+from benchmarks.stats import LatencySummary, print_table, write_json
+
+SCENARIOS = ("login", "me", "profile")
+
+
+async def _prepare_user(client: httpx.AsyncClient) -> tuple[str, str, str]:
+    # username은 최대 10자
+    username, password = f"b{uuid.uuid4().hex[:9]}", "bench-pw"
+    response = await client.post(
+        "/users", json={"username": username, "password": password}
+    )
+    response.raise_for_status()
+
+    response = await client.post("/users/login", auth=(username, password))
+    response.raise_for_status()
+    return username, password, response.json()["access_token"]
+
+
+def _build_request(
+    client: httpx.AsyncClient,
+    scenario: str,
+    username: str,
+    password: str,
+    access_token: str,
+):
+    match scenario:
+        case "login":
+            return lambda: client.post("/users/login", auth=(username, password))
+        case "me":
+            headers = {"Authorization": f"Bearer {access_token}"}
+            return lambda: client.get("/users/me", headers=headers)
+        case "profile":
+            headers = {"Authorization": f"Bearer {access_token}"}
+            return lambda: client.get(f"/users/{username}", headers=headers)
+    raise ValueError(f"Unknown scenario: {scenario}")
+
+
+async def run_scenario(
+    name: str, send, concurrency: int, duration: float, warmup: float
+) -> LatencySummary:
+    latencies: list[float] = []
+    errors = 0
+
+    async def worker(deadline: float, record: bool):
+        nonlocal errors
+        while (now := time.perf_counter()) < deadline:
+            try:
+                response = await send()
+                ok = response.is_success
+            except httpx.HTTPError:
+                ok = False
+
+            if not record:
+                continue
+            if ok:
+                latencies.append(time.perf_counter() - now)
+            else:
+                errors += 1
+
+    if warmup:
+        deadline = time.perf_counter() + warmup
+        await asyncio.gather(*(worker(deadline, False) for _ in range(concurrency)))
+
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*(worker(deadline, True) for _ in range(concurrency)))
+    return LatencySummary.build(
+        name=name,
+        latencies=latencies,
+        errors=errors,
+        duration=time.perf_counter() - start,
+    )
+
+
+async def run(args) -> list[LatencySummary]:
+    summaries = []
+    limits = httpx.Limits(
+        max_connections=args.concurrency,
+        max_keepalive_connections=args.concurrency,
+    )
+    for target in args.target:
+        label, base_url = target.split("=", 1)
+        async with httpx.AsyncClient(
+            base_url=base_url, limits=limits, timeout=30
+        ) as client:
+            username, password, access_token = await _prepare_user(client)
+            for scenario in args.scenario:
+                send = _build_request(
+                    client, scenario, username, password, access_token
+                )
+                summaries.append(
+                    await run_scenario(
+                        name=f"{label}:{scenario}",
+                        send=send,
+                        concurrency=args.concurrency,
+                        duration=args.duration,
+                        warmup=args.warmup,
+                    )
+                )
+    return summaries
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--target",
+        action="append",
+        required=True,
+        help="label=base_url (여러 번 지정 가능)",
+    )
+    parser.add_argument(
+        "--scenario", action="append", choices=SCENARIOS, default=None
+    )
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--output", default=None, help="결과 JSON 파일 경로")
+    args = parser.parse_args()
+    args.scenario = args.scenario or list(SCENARIOS)
+
+    summaries = asyncio.run(run(args))
+    print_table(summaries)
+    if args.output:
+        write_json(
+            args.output,
+            summaries,
+            concurrency=args.concurrency,
+            duration=args.duration,
+            targets=args.target,
+        )
+
+
+if __name__ == "__main__":
+    main()
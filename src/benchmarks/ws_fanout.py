@@ -0,0 +1,133 @@
+# 채팅 메시지 1건의 fan-out 비용 마이크로 벤치마크
+# - 유휴 소켓 50,000개 / 방 5,000개(방당 평균 10명)
+# - 기존 방식(전체 연결 순회 후 room_id 비교) vs ConnectionRegistry(방 인덱스)
+#   python -m benchmarks.ws_fanout --sockets 50000 --rooms 5000 --messages 2000
+import argparse
+import asyncio
+import random
+import time
+import tracemalloc
+from datetime import datetime
+
+from benchmarks.stats import percentile
+from chat.connection import ConnectionRegistry
+from chat.models import ChatMessage
+from chat.protocol import message_event
+
+
+class FakeWebSocket:
+    __slots__ = ("sent",)
+
+    def __init__(self):
+        self.sent = 0
+
+    async def send_text(self, data: str):
+        self.sent += 1
+
+
+async def _linear_fanout(connections: dict, room_id: int, user_id: int, content: str):
+    for conn, (conn_room_id, conn_user_id) in connections.items():
+        if room_id == conn_room_id:
+            if conn_user_id == user_id:
+                await conn.send_text(f"Me > {content}")
+            else:
+                await conn.send_text(f"Friend > {content}")
+
+
+async def _indexed_fanout(
+    registry: ConnectionRegistry, room_id: int, user_id: int, content: str
+):
+    # broadcast는 연결별 송신 큐에 넣기만 함(실제 전송은 writer task)
+    event = message_event(
+        ChatMessage(
+            id=0, chat_room_id=room_id, user_id=user_id, content=content,
+            created_at=datetime.now(),
+        )
+    )
+    for conn in registry.get_room_members(room_id=room_id):
+        conn.send(event)
+        # writer 대신 직렬화 후 비워줌
+        while conn.queue:
+            conn._encode(conn.queue.popleft())
+
+
+def _measure_memory(build) -> tuple[object, int]:
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    result = build()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, after - before
+
+
+async def _run(fanout, target, messages: list[tuple[int, int]]) -> list[float]:
+    timings = []
+    for room_id, user_id in messages:
+        start = time.perf_counter()
+        await fanout(target, room_id, user_id, "hello")
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def _report(name: str, timings: list[float], memory: int):
+    values = sorted(timings)
+    print(
+        f"{name:<10}"
+        f"{percentile(values, 50) * 1e6:>12.1f}"
+        f"{percentile(values, 99) * 1e6:>12.1f}"
+        f"{sum(values) / len(values) * 1e6:>12.1f}"
+        f"{memory / 1024 / 1024:>12.2f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sockets", type=int, default=50_000)
+    parser.add_argument("--rooms", type=int, default=5_000)
+    parser.add_argument("--messages", type=int, default=2_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    websockets = [FakeWebSocket() for _ in range(args.sockets)]
+    placements = [
+        (ws, rng.randrange(args.rooms), user_id)
+        for user_id, ws in enumerate(websockets)
+    ]
+    messages = [
+        (rng.randrange(args.rooms), rng.randrange(args.sockets))
+        for _ in range(args.messages)
+    ]
+
+    def build_linear():
+        return {ws: (room_id, user_id) for ws, room_id, user_id in placements}
+
+    def build_indexed():
+        registry = ConnectionRegistry()
+        for ws, room_id, user_id in placements:
+            registry.add(websocket=ws, room_id=room_id, user_id=user_id)
+        return registry
+
+    linear, linear_memory = _measure_memory(build_linear)
+    indexed, indexed_memory = _measure_memory(build_indexed)
+
+    print(
+        f"sockets={args.sockets} rooms={args.rooms} messages={args.messages}"
+    )
+    print(
+        f"{'':<10}{'p50(us)':>12}{'p99(us)':>12}{'mean(us)':>12}{'mem(MB)':>12}"
+    )
+    _report(
+        "linear",
+        asyncio.run(_run(_linear_fanout, linear, messages)),
+        linear_memory,
+    )
+    _report(
+        "indexed",
+        asyncio.run(_run(_indexed_fanout, indexed, messages)),
+        indexed_memory,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,334 @@
+# 채팅 웹소켓 부하 테스트(/ws/rooms/{room_id}/{user_id})
+# - 방 크기별로 클라이언트 소켓 수천 개를 열고, 목표 속도(msg/s)로 메시지를 보낸 뒤
+#   송신 -> 다른 멤버 수신까지의 end-to-end 지연(p50/p95/p99), 처리량, 서버 메모리를 측정
+#
+# 1) 로컬 MySQL/Redis(docker-compose.yml) + 서버 실행
+#   docker compose up -d db cache
+#   uvicorn main:app --port 8000
+# 2) 부하 생성(클라이언트는 1프로세스에서 실행 -> 송신/수신 시각을 같은 시계로 측정)
+#   python -m benchmarks.ws_load --url ws://127.0.0.1:8000 \
+#       --room-size 2 --room-size 10 --room-size 50 --rooms 100 \
+#       --rate 500 --duration 30 --server-pid $(pgrep -f "uvicorn main:app") \
+#       --output ws_load.json
+#
+# 참고
+# - 메시지는 write-behind로 DB에 저장됨 -> 방/사용자가 DB에 없으면 저장 단계에서 버려짐
+#   (전달 지연 측정에는 영향 없음, 저장까지 포함하려면 방/사용자를 미리 만들고 offset 지정)
+# - 소켓 수가 많으면 ulimit -n 을 충분히 늘려야 함
+import argparse
+import asyncio
+import json
+import random
+import time
+
+import websockets
+
+from benchmarks.stats import LatencySummary, print_table, write_json
+
+try:
+    import msgpack
+except ImportError:  # 선택 의존성
+    msgpack = None
+
+PROTOCOLS = {
+    "legacy": None,
+    "json": "chat.v1.json",
+    "msgpack": "chat.v1.msgpack",
+}
+# 부하 테스트 메시지 표시(+ 송신 시각 ns)
+MARK = "bench:"
+
+
+class LoadClient:
+    def __init__(self, url: str, room_id: int, user_id: int, group: str, protocol: str):
+        self.url = url
+        self.room_id = room_id
+        self.user_id = user_id
+        self.group = group
+        self.protocol = protocol
+        self.websocket = None
+        self.reader: asyncio.Task | None = None
+
+    async def connect(self, recorder: "Recorder"):
+        subprotocol = PROTOCOLS[self.protocol]
+        self.websocket = await websockets.connect(
+            f"{self.url}/ws/rooms/{self.room_id}/{self.user_id}",
+            subprotocols=[subprotocol] if subprotocol else None,
+            max_size=None,
+            ping_interval=None,  # 서버 heartbeat(ping 이벤트)에는 pong으로 응답
+        )
+        self.reader = asyncio.create_task(self._read(recorder))
+
+    async def send(self):
+        await self.websocket.send(f"{MARK}{time.perf_counter_ns()}")
+
+    async def _read(self, recorder: "Recorder"):
+        try:
+            async for frame in self.websocket:
+                for event in self._parse(frame):
+                    await self._handle(event, recorder)
+        except websockets.ConnectionClosed:
+            recorder.closed += 1
+
+    def _parse(self, frame: str | bytes) -> list[dict]:
+        if isinstance(frame, bytes):
+            event = msgpack.unpackb(frame)
+        elif self.protocol == "legacy":
+            return [self._parse_legacy(line) for line in frame.split("\n")]
+        else:
+            event = json.loads(frame)
+        return event["e"] if event.get("t") == "batch" else [event]
+
+    @staticmethod
+    def _parse_legacy(frame: str) -> dict:
+        if frame.startswith("{"):
+            data = json.loads(frame)
+            return {"t": data.get("type")}
+        if frame.startswith("Friend > "):
+            return {"t": "msg", "c": frame.removeprefix("Friend > ")}
+        return {"t": "msg", "mine": True}
+
+    async def _handle(self, event: dict, recorder: "Recorder"):
+        match event.get("t"):
+            case "msg":
+                content = event.get("c", "")
+                mine = event.get("mine") or event.get("u") == self.user_id
+                if not mine and content.startswith(MARK):
+                    sent_at = int(content.removeprefix(MARK))
+                    recorder.record(self.group, (time.perf_counter_ns() - sent_at) / 1e9)
+            case "ping":
+                await self.websocket.send(json.dumps({"type": "pong"}))
+
+    async def close(self):
+        if self.websocket is not None:
+            await self.websocket.close()
+        if self.reader is not None:
+            await self.reader
+
+
+class Recorder:
+    def __init__(self):
+        self.recording = False
+        self.latencies: dict[str, list[float]] = {}
+        self.sent: dict[str, int] = {}
+        self.expected: dict[str, int] = {}
+        self.closed = 0
+
+    def record(self, group: str, latency: float):
+        if self.recording:
+            self.latencies.setdefault(group, []).append(latency)
+
+    def on_send(self, group: str, room_size: int):
+        if self.recording:
+            self.sent[group] = self.sent.get(group, 0) + 1
+            self.expected[group] = self.expected.get(group, 0) + room_size - 1
+
+
+class MemorySampler:
+    # 서버 프로세스 RSS(/proc/{pid}/status)를 주기적으로 기록
+    def __init__(self, pid: int | None, interval: float = 1.0):
+        self.pid = pid
+        self.interval = interval
+        self.samples: list[int] = []
+        self._task: asyncio.Task | None = None
+
+    def _read_rss(self) -> int | None:
+        try:
+            with open(f"/proc/{self.pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        return int(line.split()[1]) * 1024
+        except OSError:
+            return None
+        return None
+
+    def sample(self):
+        if self.pid and (rss := self._read_rss()) is not None:
+            self.samples.append(rss)
+
+    async def _run(self):
+        while True:
+            self.sample()
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self.pid:
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self) -> dict:
+        if self._task:
+            self._task.cancel()
+        self.sample()
+        if not self.samples:
+            return {}
+        mb = 1024 * 1024
+        return {
+            "start_mb": self.samples[0] / mb,
+            "peak_mb": max(self.samples) / mb,
+            "end_mb": self.samples[-1] / mb,
+        }
+
+
+def _build_clients(args) -> list[list[LoadClient]]:
+    rooms = []
+    room_id, user_id = args.room_offset, args.user_offset
+    for size in args.room_size:
+        for _ in range(args.rooms):
+            room_id += 1
+            members = []
+            for _ in range(size):
+                user_id += 1
+                members.append(
+                    LoadClient(
+                        url=args.url,
+                        room_id=room_id,
+                        user_id=user_id,
+                        group=f"{args.protocol}:room{size}",
+                        protocol=args.protocol,
+                    )
+                )
+            rooms.append(members)
+    return rooms
+
+
+async def _connect_all(clients: list[LoadClient], recorder: Recorder, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    failed = 0
+
+    async def connect(client: LoadClient):
+        nonlocal failed
+        async with semaphore:
+            try:
+                await client.connect(recorder)
+            except (OSError, websockets.WebSocketException):
+                failed += 1
+
+    await asyncio.gather(*(connect(c) for c in clients))
+    return failed
+
+
+async def _generate(rooms: list[list[LoadClient]], recorder: Recorder, rate: float, duration: float):
+    # open-loop: 응답을 기다리지 않고 일정 간격으로 전송(느려져도 부하가 줄지 않음)
+    tick = 0.01
+    per_tick = rate * tick
+    carry = 0.0
+    deadline = time.perf_counter() + duration
+    next_tick = time.perf_counter()
+    while next_tick < deadline:
+        carry += per_tick
+        count, carry = int(carry), carry - int(carry)
+        for _ in range(count):
+            members = random.choice(rooms)
+            sender = random.choice(members)
+            if sender.websocket is None:
+                continue
+            recorder.on_send(sender.group, len(members))
+            try:
+                await sender.send()
+            except websockets.ConnectionClosed:
+                pass
+        next_tick += tick
+        await asyncio.sleep(max(next_tick - time.perf_counter(), 0))
+
+
+async def run(args) -> tuple[list[LatencySummary], dict]:
+    recorder = Recorder()
+    memory = MemorySampler(pid=args.server_pid)
+    rooms = _build_clients(args)
+    clients = [client for members in rooms for client in members]
+
+    memory.start()
+    start = time.perf_counter()
+    failed = await _connect_all(clients, recorder, args.connect_concurrency)
+    connect_time = time.perf_counter() - start
+    print(f"connected {len(clients) - failed}/{len(clients)} sockets in {connect_time:.1f}s")
+
+    if args.warmup:
+        await _generate(rooms, recorder, args.rate, args.warmup)
+
+    recorder.recording = True
+    start = time.perf_counter()
+    await _generate(rooms, recorder, args.rate, args.duration)
+    await asyncio.sleep(args.drain)  # 전송 중인 메시지 수신 대기
+    recorder.recording = False
+    duration = time.perf_counter() - start
+
+    memory_stats = memory.stop()
+    await asyncio.gather(*(c.close() for c in clients), return_exceptions=True)
+
+    summaries = []
+    delivery = {}
+    for group, expected in recorder.expected.items():
+        latencies = recorder.latencies.get(group, [])
+        summaries.append(
+            LatencySummary.build(
+                name=group,
+                latencies=latencies,
+                errors=max(expected - len(latencies), 0),  # 받지 못한 전달 수
+                duration=duration,
+            )
+        )
+        delivery[group] = {
+            "sent": recorder.sent[group],
+            "expected": expected,
+            "delivered": len(latencies),
+        }
+
+    meta = {
+        "sockets": len(clients),
+        "failed_connects": failed,
+        "closed_by_server": recorder.closed,
+        "connect_seconds": connect_time,
+        "server_memory": memory_stats,
+        "delivery": delivery,
+    }
+    return summaries, meta
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="ws://127.0.0.1:8000")
+    parser.add_argument(
+        "--room-size", type=int, action="append", default=None,
+        help="방 인원 수(여러 번 지정 가능)",
+    )
+    parser.add_argument("--rooms", type=int, default=100, help="방 크기별 방 개수")
+    parser.add_argument("--rate", type=float, default=200, help="초당 송신 메시지 수")
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--drain", type=float, default=2.0)
+    parser.add_argument("--protocol", choices=PROTOCOLS, default="legacy")
+    parser.add_argument("--connect-concurrency", type=int, default=200)
+    parser.add_argument("--room-offset", type=int, default=1_000_000)
+    parser.add_argument("--user-offset", type=int, default=1_000_000)
+    parser.add_argument("--server-pid", type=int, default=None, help="RSS를 측정할 서버 pid")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="결과 JSON 파일 경로")
+    args = parser.parse_args()
+    args.room_size = args.room_size or [2, 10, 50]
+    if args.protocol == "msgpack" and msgpack is None:
+        parser.error("msgpack is not installed")
+    random.seed(args.seed)
+
+    summaries, meta = asyncio.run(run(args))
+    print_table(summaries)
+    if memory := meta["server_memory"]:
+        print(
+            f"server rss(MB): start {memory['start_mb']:.1f} "
+            f"peak {memory['peak_mb']:.1f} end {memory['end_mb']:.1f}"
+        )
+    if args.output:
+        write_json(
+            args.output,
+            summaries,
+            url=args.url,
+            protocol=args.protocol,
+            rate=args.rate,
+            room_sizes=args.room_size,
+            rooms=args.rooms,
+            **meta,
+        )
+
+
+if __name__ == "__main__":
+    main()
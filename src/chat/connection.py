@@ -0,0 +1,281 @@
+import asyncio
+import logging
+import time
+from collections import deque
+
+from fastapi import WebSocket, status
+
+from chat.protocol import OutboundEvent, Protocol, encode_batch
+from config import WebSocketOverflowPolicy
+from config.metrics import Counter, Gauge
+
+logger = logging.getLogger(__name__)
+
+WS_SEND_QUEUE_DEPTH = Gauge(
+    "chat_ws_send_queue_depth", "Frames waiting in websocket send queues", ("stat",)
+)
+WS_DROPPED_FRAMES = Counter(
+    "chat_ws_dropped_frames_total", "Frames dropped by send queue overflow", ("policy",)
+)
+WS_COALESCED_FRAMES = Counter(
+    "chat_ws_coalesced_frames_total", "Frames merged by send queue overflow"
+)
+WS_SLOW_CONSUMER_DISCONNECTS = Counter(
+    "chat_ws_slow_consumer_disconnects_total", "Connections closed for a full send queue"
+)
+WS_OCCUPANCY = Gauge(
+    "chat_ws_occupancy", "Websocket connections, rooms and users on this worker", ("stat",)
+)
+
+# batch 프레임 1개에 담는 최대 이벤트 수
+MAX_BATCH_SIZE = 64
+
+
+# 큐가 가득 차서 합쳐진 프레임들(이미 직렬화됨)
+class CoalescedFrames:
+    __slots__ = ("frames",)
+
+    def __init__(self, frames: list[str | bytes]):
+        self.frames = frames
+
+
+# 웹소켓 연결 1개당 1개 생성 -> __slots__로 메모리 절약
+# broadcast는 queue에 넣기만 하고, 실제 전송은 연결별 writer task가 담당
+# -> 느린 클라이언트 1명이 방 전체의 전송을 지연시키지 않음
+class ChatConnection:
+    __slots__ = (
+        "websocket", "room_id", "user_id", "protocol", "last_seen", "pinged",
+        "queue", "max_queue_size", "overflow_policy", "writer", "closer", "_ready",
+    )
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        room_id: int,
+        user_id: int,
+        protocol: Protocol = Protocol.LEGACY,
+        max_queue_size: int = 256,
+        overflow_policy: WebSocketOverflowPolicy = WebSocketOverflowPolicy.DROP_OLDEST,
+    ):
+        self.websocket = websocket
+        self.room_id = room_id
+        self.user_id = user_id
+        self.protocol = protocol
+        self.last_seen = time.monotonic()  # 마지막으로 클라이언트 프레임을 받은 시각
+        self.pinged = False
+
+        self.queue: deque[OutboundEvent | CoalescedFrames] = deque()
+        self.max_queue_size = max_queue_size
+        self.overflow_policy = overflow_policy
+        self.writer: asyncio.Task | None = None
+        self.closer: asyncio.Task | None = None  # 느린 클라이언트 연결 종료(DISCONNECT)
+        self._ready = asyncio.Event()
+
+    # 클라이언트가 보낸 프레임(pong 포함)을 받을 때마다 호출
+    def touch(self) -> None:
+        self.last_seen = time.monotonic()
+        self.pinged = False
+
+    def send(self, event: OutboundEvent) -> None:
+        if self.writer is not None and self.writer.done():
+            return  # 이미 닫힌 연결
+
+        if len(self.queue) >= self.max_queue_size:
+            if not self._handle_overflow():
+                return
+
+        self.queue.append(event)
+        self._ready.set()
+
+    def _encode(self, item: OutboundEvent | CoalescedFrames) -> list[str | bytes]:
+        if isinstance(item, CoalescedFrames):
+            return item.frames
+        return [item.encode(self.protocol, self.user_id)]
+
+    async def _send_frame(self, frame: str | bytes) -> None:
+        if isinstance(frame, bytes):
+            await self.websocket.send_bytes(frame)
+        else:
+            await self.websocket.send_text(frame)
+
+    # 큐를 거치지 않고 바로 전송(writer 시작 전 초기 메시지)
+    async def send_now(self, event: OutboundEvent) -> None:
+        await self._send_frame(event.encode(self.protocol, self.user_id))
+
+    # 큐가 가득 찼을 때, 새 프레임을 넣을 수 있으면 True
+    def _handle_overflow(self) -> bool:
+        match self.overflow_policy:
+            case WebSocketOverflowPolicy.DROP_OLDEST:
+                self.queue.popleft()
+                WS_DROPPED_FRAMES.inc(policy=self.overflow_policy)
+                return True
+            case WebSocketOverflowPolicy.COALESCE:
+                # 대기 중인 프레임을 한 항목으로 합쳐서 큐 항목 수를 줄임
+                WS_COALESCED_FRAMES.inc(len(self.queue))
+                frames = [frame for item in self.queue for frame in self._encode(item)]
+                # 합친 항목도 max_queue_size 프레임까지만(읽지 않는 클라이언트의 메모리 무한 증가 방지)
+                # -> 큐 전체는 최대 2 * max_queue_size 프레임
+                if (dropped := len(frames) - self.max_queue_size) > 0:
+                    del frames[:dropped]  # 오래된 프레임부터 버림
+                    WS_DROPPED_FRAMES.inc(dropped, policy=self.overflow_policy)
+                self.queue.clear()
+                self.queue.append(CoalescedFrames(frames=frames))
+                return True
+            case _:
+                WS_DROPPED_FRAMES.inc(policy=self.overflow_policy)
+                WS_SLOW_CONSUMER_DISCONNECTS.inc()
+                self.queue.clear()
+                # 참조를 유지해야 종료 도중 GC되지 않음
+                if self.closer is None:
+                    self.closer = asyncio.create_task(
+                        self.close(code=status.WS_1008_POLICY_VIOLATION)
+                    )
+                return False
+
+    def start_writer(self) -> None:
+        self.writer = asyncio.create_task(self._write())
+
+    async def _write(self):
+        try:
+            while True:
+                if not self.queue:
+                    self._ready.clear()
+                    await self._ready.wait()
+                    continue
+                await self._flush_queue()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # 연결이 끊긴 경우 -> 수신 루프의 WebSocketDisconnect에서 정리
+            logger.debug("websocket writer stopped", exc_info=True)
+
+    # 큐 앞쪽에서 최대 limit개 프레임(합쳐진 항목은 나눠서 꺼냄)
+    def _take_frames(self, limit: int) -> list[str | bytes]:
+        frames = []
+        while self.queue and len(frames) < limit:
+            item = self.queue[0]
+            if isinstance(item, CoalescedFrames):
+                room = limit - len(frames)
+                frames.extend(item.frames[:room])
+                del item.frames[:room]
+                if not item.frames:
+                    self.queue.popleft()
+            else:
+                frames.extend(self._encode(self.queue.popleft()))
+        return frames
+
+    async def _flush_queue(self):
+        if not self.protocol.supports_batch:
+            # 기존 포맷은 batch 프레임이 없으므로 1개씩 전송(합쳐진 프레임은 줄바꿈으로 연결)
+            if isinstance(self.queue[0], CoalescedFrames):
+                frames = self._take_frames(limit=MAX_BATCH_SIZE)
+            else:
+                frames = self._encode(self.queue.popleft())
+            await self._send_frame(frames[0] if len(frames) == 1 else "\n".join(frames))
+            return
+
+        # 쌓인 이벤트를 batch 프레임 1개로 묶어서 전송 -> 프레임/시스템 콜 수 감소
+        frames = self._take_frames(limit=MAX_BATCH_SIZE)
+
+        if len(frames) == 1:
+            await self._send_frame(frames[0])
+        else:
+            await self._send_frame(encode_batch(self.protocol, frames))
+
+    async def stop_writer(self) -> None:
+        if self.writer and not self.writer.done():
+            self.writer.cancel()
+        self.queue.clear()
+
+    async def close(self, code: int) -> None:
+        await self.stop_writer()
+        try:
+            await self.websocket.close(code=code)
+        except Exception:
+            logger.debug("websocket already closed", exc_info=True)
+
+
+# 방 기준으로 인덱싱한 연결 목록
+# - connect/disconnect: O(1)
+# - 방 멤버 조회: O(방 멤버 수)
+class ConnectionRegistry:
+    def __init__(
+        self,
+        max_queue_size: int = 256,
+        overflow_policy: WebSocketOverflowPolicy = WebSocketOverflowPolicy.DROP_OLDEST,
+    ):
+        self.max_queue_size = max_queue_size
+        self.overflow_policy = overflow_policy
+        self.connections: dict[WebSocket, ChatConnection] = dict()
+        self.rooms: dict[int, dict[WebSocket, ChatConnection]] = dict()
+        self.users: dict[int, int] = dict()  # user_id -> 연결 수
+
+    def __len__(self) -> int:
+        return len(self.connections)
+
+    def add(
+        self,
+        websocket: WebSocket,
+        room_id: int,
+        user_id: int,
+        protocol: Protocol = Protocol.LEGACY,
+    ) -> ChatConnection:
+        conn = ChatConnection(
+            websocket=websocket,
+            room_id=room_id,
+            user_id=user_id,
+            protocol=protocol,
+            max_queue_size=self.max_queue_size,
+            overflow_policy=self.overflow_policy,
+        )
+        self.connections[websocket] = conn
+        self.rooms.setdefault(room_id, dict())[websocket] = conn
+        self.users[user_id] = self.users.get(user_id, 0) + 1
+        return conn
+
+    def get(self, websocket: WebSocket) -> ChatConnection | None:
+        return self.connections.get(websocket)
+
+    # 이미 제거된 연결(reaper가 먼저 정리한 경우)이면 None
+    def remove(self, websocket: WebSocket) -> ChatConnection | None:
+        conn = self.connections.pop(websocket, None)
+        if conn is None:
+            return None
+
+        members = self.rooms[conn.room_id]
+        del members[websocket]
+        if not members:
+            del self.rooms[conn.room_id]  # 빈 방은 정리
+
+        self.users[conn.user_id] -= 1
+        if not self.users[conn.user_id]:
+            del self.users[conn.user_id]
+        return conn
+
+    def get_room_members(self, room_id: int) -> list[ChatConnection]:
+        # 전송 중 connect/disconnect가 일어나도 안전하도록 복사본 반환
+        return list(self.rooms.get(room_id, {}).values())
+
+    def has_room(self, room_id: int) -> bool:
+        return room_id in self.rooms
+
+    def count_room(self, room_id: int) -> int:
+        return len(self.rooms.get(room_id, ()))
+
+    def count_user(self, user_id: int) -> int:
+        return self.users.get(user_id, 0)
+
+    def occupancy_stats(self) -> dict[tuple, float]:
+        return {
+            ("connections",): len(self.connections),
+            ("rooms",): len(self.rooms),
+            ("users",): len(self.users),
+            ("max_room_size",): max(map(len, self.rooms.values()), default=0),
+        }
+
+    def queue_depth_stats(self) -> dict[tuple, float]:
+        depths = [len(conn.queue) for conn in self.connections.values()]
+        return {
+            ("total",): sum(depths),
+            ("max",): max(depths, default=0),
+        }
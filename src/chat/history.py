@@ -0,0 +1,147 @@
+# 채팅 이전 메시지 조회(Redis Stream 우선, Stream 범위를 넘어가면 DB)
+from dataclasses import dataclass
+from datetime import timedelta
+
+from chat.ids import get_created_at
+from chat.models import ChatMessage
+from chat.repository import ChatRepository
+from chat.stream import ChatMessageStream, StreamEntry
+from config.pagination import encode_cursor, decode_cursor
+
+# 워커 간 시계 오차를 고려한 created_at 여유
+CLOCK_SKEW = timedelta(seconds=5)
+REPLAY_SCAN_SIZE = 100
+
+
+@dataclass
+class HistoryPage:
+    messages: list[ChatMessage]  # 최신순
+    next_cursor: str | None
+
+
+@dataclass
+class ReplayPage:
+    messages: list[ChatMessage]  # 오래된 순
+    has_more: bool
+
+
+class ChatHistory:
+    def __init__(
+        self, stream: ChatMessageStream, chat_repo: ChatRepository, page_size: int
+    ):
+        self.stream = stream
+        self.chat_repo = chat_repo
+        self.page_size = page_size
+
+    async def _warm(self, room_id: int) -> None:
+        messages = await self.chat_repo.get_recent_messages(
+            room_id=room_id, limit=self.stream.max_len
+        )
+        await self.stream.warm(room_id=room_id, messages=list(reversed(messages)))
+
+    async def _get_stream_entries(
+        self, room_id: int, count: int, before: str | None
+    ) -> tuple[list[StreamEntry], bool]:
+        # (최신순 entry 목록, Stream이 잘렸는지 여부)
+        entries, length, warmed = await self.stream.get_latest(
+            room_id=room_id, count=count, before=before
+        )
+        if not warmed:
+            await self._warm(room_id=room_id)
+            entries, length, _ = await self.stream.get_latest(
+                room_id=room_id, count=count, before=before
+            )
+
+        # MAXLEN ~ 로 한 번이라도 잘렸다면 길이가 max_len 이상으로 유지됨
+        return entries, length >= self.stream.max_len
+
+    def _build_page(self, entries: list[tuple[str | None, ChatMessage]]) -> HistoryPage:
+        # entries: 최신순으로 최대 page_size + 1개(1개 더 조회해서 다음 페이지 여부 확인)
+        has_more = len(entries) > self.page_size
+        entries = entries[:self.page_size]
+        next_cursor = None
+        if has_more:
+            position, last = entries[-1]
+            next_cursor = encode_cursor(last.created_at, last.id, position=position)
+        return HistoryPage(
+            messages=[message for _, message in entries], next_cursor=next_cursor
+        )
+
+    # cursor가 없으면 최신 페이지
+    async def get_page(self, room_id: int, cursor: str | None = None) -> HistoryPage:
+        count = self.page_size + 1
+        before = decode_cursor(cursor) if cursor else None
+
+        entries: list[tuple[str | None, ChatMessage]] = []
+        truncated = True
+        # DB에서 받은 커서(position 없음)는 이미 Stream 범위를 벗어난 것
+        if before is None or before.position:
+            entries, truncated = await self._get_stream_entries(
+                room_id=room_id,
+                count=count,
+                before=before.position if before else None,
+            )
+
+        if len(entries) >= count or not truncated:
+            return self._build_page(entries)
+
+        # Stream 범위를 넘어간 나머지만 DB에서 조회
+        if entries:
+            oldest = entries[-1][1]
+            created_at, message_id = oldest.created_at, oldest.id
+        elif before:
+            created_at, message_id = before.created_at, before.id
+        else:
+            created_at = message_id = None
+
+        if created_at is None:
+            messages = await self.chat_repo.get_recent_messages(
+                room_id=room_id, limit=count
+            )
+        else:
+            messages = await self.chat_repo.get_messages_before(
+                room_id=room_id,
+                created_at=created_at,
+                message_id=message_id,
+                limit=count - len(entries),
+            )
+        return self._build_page(entries + [(None, m) for m in messages])
+
+    # 재접속 시 마지막으로 받은 메시지(last_id) 이후 메시지
+    async def get_replay(self, room_id: int, last_id: int) -> ReplayPage:
+        limit = self.stream.max_len
+        collected: list[ChatMessage] = []
+        found = False
+        before = None
+
+        while not found and len(collected) <= limit:
+            entries, truncated = await self._get_stream_entries(
+                room_id=room_id,
+                count=REPLAY_SCAN_SIZE,
+                before=before,
+            )
+            for _, message in entries:
+                if message.id <= last_id:
+                    found = True
+                    break
+                collected.append(message)
+
+            if len(entries) < REPLAY_SCAN_SIZE:
+                break  # Stream 끝까지 확인
+            before = entries[-1][0]
+
+        if not found and truncated:
+            # last_id가 Stream 범위보다 오래됨 -> DB에서 조회
+            # (아직 DB에 저장되지 않은 최신 메시지는 Stream에서 가져온 것과 합침)
+            messages = await self.chat_repo.get_messages_after(
+                room_id=room_id,
+                message_id=last_id,
+                since=get_created_at(last_id).replace(microsecond=0) - CLOCK_SKEW,
+                limit=limit + 1,
+            )
+            merged = {m.id: m for m in collected}
+            merged.update({m.id: m for m in messages})
+            collected = list(merged.values())
+
+        collected.sort(key=lambda m: m.id)
+        return ReplayPage(messages=collected[:limit], has_more=len(collected) > limit)
@@ -0,0 +1,68 @@
+# Snowflake 방식 메시지 id 생성
+# - DB에 저장되기 전에 id를 발급해서 클라이언트에 바로 전달 가능
+# - 시간순 정렬 가능, 여러 워커에서 생성해도 겹치지 않음
+#
+# | 41bit: 밀리초 타임스탬프(EPOCH 기준) | 10bit: 워커 id | 12bit: 시퀀스 |
+import os
+import threading
+import time
+from datetime import datetime
+
+EPOCH_MS = 1704034800000  # 2024-01-01 00:00:00 KST
+WORKER_ID_BITS = 10
+SEQUENCE_BITS = 12
+MAX_WORKER_ID = (1 << WORKER_ID_BITS) - 1
+MAX_SEQUENCE = (1 << SEQUENCE_BITS) - 1
+
+
+class SnowflakeGenerator:
+    def __init__(self, worker_id: int):
+        if not 0 <= worker_id <= MAX_WORKER_ID:
+            raise ValueError(f"worker_id must be between 0 and {MAX_WORKER_ID}")
+
+        self.worker_id = worker_id
+        self._last_ms = -1
+        self._sequence = 0
+        self._lock = threading.Lock()
+
+    # 서버 시작 시 임대한 워커 id로 변경(chat/worker_id.py)
+    def set_worker_id(self, worker_id: int) -> None:
+        if not 0 <= worker_id <= MAX_WORKER_ID:
+            raise ValueError(f"worker_id must be between 0 and {MAX_WORKER_ID}")
+        with self._lock:
+            self.worker_id = worker_id
+
+    def generate(self) -> int:
+        with self._lock:
+            now_ms = int(time.time() * 1000)
+            if now_ms < self._last_ms:
+                now_ms = self._last_ms  # 시계가 뒤로 가도 id는 증가
+
+            if now_ms == self._last_ms:
+                self._sequence = (self._sequence + 1) & MAX_SEQUENCE
+                if self._sequence == 0:
+                    # 같은 밀리초에 4096개를 넘으면 다음 밀리초까지 대기
+                    while now_ms <= self._last_ms:
+                        now_ms = int(time.time() * 1000)
+            else:
+                self._sequence = 0
+
+            self._last_ms = now_ms
+            return (
+                ((now_ms - EPOCH_MS) << (WORKER_ID_BITS + SEQUENCE_BITS))
+                | (self.worker_id << SEQUENCE_BITS)
+                | self._sequence
+            )
+
+
+# id에서 생성 시각 추출
+def get_created_at(message_id: int) -> datetime:
+    ms = (message_id >> (WORKER_ID_BITS + SEQUENCE_BITS)) + EPOCH_MS
+    return datetime.fromtimestamp(ms / 1000)
+
+
+# CHAT_WORKER_ID 미지정 시 서버 시작 시 Redis에서 임대한 id로 바뀜(chat/worker_id.py)
+# 임대 전(스크립트 등)에는 pid로 구분
+message_id_generator = SnowflakeGenerator(
+    worker_id=int(os.getenv("CHAT_WORKER_ID", os.getpid() & MAX_WORKER_ID))
+)
@@ -1,8 +1,8 @@
 from datetime import datetime
 
-from sqlalchemy import Column, Integer, Text, ForeignKey, DateTime, String
-from starlette.datastructures import State
+from sqlalchemy import Column, Integer, BigInteger, Text, ForeignKey, DateTime, String, Index
 
+from chat.ids import message_id_generator
 from config.database.orm import Base
 
 
@@ -16,12 +16,34 @@ class ChatRoom(Base):
 class ChatMessage(Base):
     __tablename__ = "chat_message"
 
-    id = Column(Integer, primary_key=True)
+    # Snowflake id(chat/ids.py) -> 저장 전에 발급
+    id = Column(BigInteger, primary_key=True, autoincrement=False)
     user_id = Column(Integer, ForeignKey("service_user.id"))
     chat_room_id = Column(Integer, ForeignKey("chat_room.id"), nullable=True)
     content = Column(Text)
     created_at = Column(DateTime, default=datetime.now, nullable=False)
 
+    __table_args__ = (
+        # 방별 최신 메시지 / 커서 페이지네이션 조회용
+        Index("ix_chat_message_room_created_id", "chat_room_id", "created_at", "id"),
+    )
+
     @classmethod
     def create(cls, room_id: int, user_id: int, content: str):
-        return cls(chat_room_id=room_id, user_id=user_id, content=content)
+        return cls(
+            id=message_id_generator.generate(),
+            chat_room_id=room_id,
+            user_id=user_id,
+            content=content,
+            # DB(DATETIME)와 Redis Stream에 같은 값이 저장되도록 초 단위로 저장
+            created_at=datetime.now().replace(microsecond=0),
+        )
+
+    def to_row(self) -> dict:
+        return {
+            "id": self.id,
+            "user_id": self.user_id,
+            "chat_room_id": self.chat_room_id,
+            "content": self.content,
+            "created_at": self.created_at,
+        }
@@ -0,0 +1,120 @@
+# 채팅 메시지 write-behind 저장
+# - broadcast는 버퍼에 넣기만 하고 바로 전달(메시지마다 트랜잭션 X)
+# - flush_interval마다 또는 batch_size개가 쌓이면 multi-row INSERT 1번으로 저장
+# - 서버 종료 시 남은 메시지 flush
+import asyncio
+import contextlib
+import logging
+
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from chat.models import ChatMessage
+from config import settings
+from config.database.connection_async import AsyncSessionFactory
+from config.metrics import Gauge
+
+logger = logging.getLogger(__name__)
+
+CHAT_WRITE_BUFFER_DEPTH = Gauge(
+    "chat_write_buffer_depth", "Chat messages waiting to be persisted"
+)
+
+
+class ChatMessageWriter:
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        flush_interval: float,
+        batch_size: int,
+        max_buffer_size: int,
+    ):
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_buffer_size = max_buffer_size
+
+        self.buffer: list[dict] = []
+        self._has_items = asyncio.Event()
+        self._full = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        CHAT_WRITE_BUFFER_DEPTH.set_function(lambda: len(self.buffer))
+
+    def enqueue(self, message: ChatMessage) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+        self.buffer.append(message.to_row())
+        self._has_items.set()
+        if len(self.buffer) >= self.batch_size:
+            self._full.set()
+
+    async def _run(self):
+        while True:
+            await self._has_items.wait()
+            try:
+                # 첫 메시지 이후 flush_interval 동안 모으거나, batch_size가 차면 바로 저장
+                await asyncio.wait_for(self._full.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+
+            if not await self.flush():
+                await asyncio.sleep(1)  # DB 장애 시 재시도 간격
+
+    async def _insert(self, rows: list[dict]) -> None:
+        async with self.session_factory() as session:
+            await session.execute(insert(ChatMessage).values(rows))
+            await session.commit()
+
+    async def flush(self) -> bool:
+        rows, self.buffer = self.buffer[:self.batch_size], self.buffer[self.batch_size:]
+        if not self.buffer:
+            self._has_items.clear()
+        if len(self.buffer) < self.batch_size:
+            self._full.clear()
+        if not rows:
+            return True
+
+        try:
+            await self._insert(rows)
+        except asyncio.CancelledError:
+            self.buffer[:0] = rows  # 종료 중 취소되면 되돌려서 close()에서 저장
+            raise
+        except IntegrityError:
+            # 잘못된 메시지 1개(없는 방/사용자) 때문에 배치 전체가 막히지 않도록 1건씩 저장
+            for row in rows:
+                try:
+                    await self._insert([row])
+                except IntegrityError:
+                    logger.warning("Dropped chat message %s", row["id"], exc_info=True)
+        except Exception:
+            logger.exception("Failed to persist %d chat messages", len(rows))
+            # 버퍼 앞쪽에 되돌려서 다음 flush에서 재시도(최대 max_buffer_size)
+            self.buffer[:0] = rows
+            if (dropped := len(self.buffer) - self.max_buffer_size) > 0:
+                # 가장 최근 메시지부터 버림(방별 최근 메시지는 Redis Stream에 남아 있을 수 있음)
+                logger.error("Chat write buffer full, dropped %d messages", dropped)
+                del self.buffer[self.max_buffer_size:]
+            self._has_items.set()
+            return False
+        return True
+
+    async def close(self) -> None:
+        if self._task:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+        while self.buffer:
+            if not await self.flush():
+                break
+
+
+chat_message_writer = ChatMessageWriter(
+    session_factory=AsyncSessionFactory,
+    flush_interval=settings.chat_flush_interval_ms / 1000,
+    batch_size=settings.chat_flush_batch_size,
+    max_buffer_size=settings.chat_max_buffer_size,
+)
@@ -0,0 +1,183 @@
+# 채팅 웹소켓 프로토콜
+# - 클라이언트가 Sec-WebSocket-Protocol로 버전/포맷을 선택(opt-in)
+#   - chat.v1.msgpack: MessagePack 바이너리 프레임(msgpack 설치 시)
+#   - chat.v1.json: 짧은 키를 쓰는 compact JSON 텍스트 프레임
+#   - 미지정: 기존 텍스트 포맷("Me > ..." / "Friend > ...")
+# - 이벤트는 broadcast 당 1번만 직렬화하고 모든 수신자가 같은 bytes를 재사용
+# - 큐에 쌓인 이벤트 여러 개는 batch 프레임 1개로 묶어서 전송
+# - permessage-deflate 압축은 웹소켓 서버(uvicorn --ws-per-message-deflate)가 핸드셰이크에서 협상
+import json
+from enum import StrEnum
+
+from fastapi import WebSocket
+
+from chat.models import ChatMessage
+
+try:
+    import msgpack
+except ImportError:  # 선택 의존성
+    msgpack = None
+
+VERSION = 1
+
+
+class Protocol(StrEnum):
+    LEGACY = "legacy"
+    JSON = "chat.v1.json"
+    MSGPACK = "chat.v1.msgpack"
+
+    @property
+    def is_binary(self) -> bool:
+        return self is Protocol.MSGPACK
+
+    @property
+    def supports_batch(self) -> bool:
+        return self is not Protocol.LEGACY
+
+    # 기존 텍스트 포맷 클라이언트는 ping 이벤트를 모르고 pong도 보내지 않음
+    @property
+    def supports_heartbeat(self) -> bool:
+        return self is not Protocol.LEGACY
+
+
+def negotiate(websocket: WebSocket) -> Protocol:
+    # 클라이언트가 보낸 순서(선호도)대로 지원하는 첫 번째 프로토콜 선택
+    for requested in websocket.scope.get("subprotocols", []):
+        if requested == Protocol.MSGPACK and msgpack is not None:
+            return Protocol.MSGPACK
+        if requested == Protocol.JSON:
+            return Protocol.JSON
+    return Protocol.LEGACY
+
+
+def _dumps(data) -> str:
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+
+def _pack_message(message: ChatMessage) -> dict:
+    return {
+        "id": message.id,
+        "u": message.user_id,
+        "c": message.content,
+        "ts": int(message.created_at.timestamp() * 1000),
+    }
+
+
+def _legacy_message(message: dict, user_id: int) -> dict:
+    return {
+        "id": message["id"],
+        "user_id": message["u"],
+        "content": message["c"],
+        "created_at": message["created_at"],
+        "mine": message["u"] == user_id,
+    }
+
+
+class OutboundEvent:
+    __slots__ = ("event", "legacy", "_encoded")
+
+    def __init__(self, event: dict, legacy: dict | None = None):
+        self.event = event  # v1 envelope
+        self.legacy = legacy  # 기존 포맷에 필요한 추가 정보
+        self._encoded: dict = {}
+
+    # 프로토콜(기존 포맷은 + 내 메시지 여부)별로 1번만 직렬화
+    def encode(self, protocol: Protocol, user_id: int) -> str | bytes:
+        key = protocol
+        if protocol is Protocol.LEGACY:
+            key = (protocol, self.event.get("u") == user_id)
+
+        if (encoded := self._encoded.get(key)) is None:
+            encoded = self._encoded[key] = self._encode(protocol, user_id)
+        return encoded
+
+    def _encode(self, protocol: Protocol, user_id: int) -> str | bytes:
+        match protocol:
+            case Protocol.MSGPACK:
+                return msgpack.packb(self.event)
+            case Protocol.JSON:
+                return _dumps(self.event)
+        return self._encode_legacy(user_id)
+
+    def _encode_legacy(self, user_id: int) -> str:
+        event_type = self.event["t"]
+        if event_type == "msg":
+            prefix = "Me" if self.event["u"] == user_id else "Friend"
+            return f"{prefix} > {self.event['c']}"
+
+        if event_type in ("history", "replay"):
+            data = {
+                "type": event_type,
+                "messages": [
+                    _legacy_message(m, user_id) for m in self.legacy["messages"]
+                ],
+            }
+            data.update(self.legacy["extra"])
+            return json.dumps(data, ensure_ascii=False)
+
+        data = {k: v for k, v in self.event.items() if k not in ("v", "t")}
+        return json.dumps({"type": event_type, **data}, ensure_ascii=False)
+
+
+def encode_batch(protocol: Protocol, frames: list[str | bytes]) -> str | bytes:
+    # 이미 직렬화된 이벤트를 다시 직렬화하지 않고 이어붙여서 batch 프레임 생성
+    # {"v": 1, "t": "batch", "e": [frame, frame, ...]}
+    if protocol is Protocol.MSGPACK:
+        # 빈 배열(0x90)을 뺀 map 앞부분 + 배열 헤더 + 이벤트들
+        prefix = msgpack.packb({"v": VERSION, "t": "batch", "e": []})[:-1]
+        return prefix + _msgpack_array_header(len(frames)) + b"".join(frames)
+    return f'{{"v":{VERSION},"t":"batch","e":[' + ",".join(frames) + "]}"
+
+
+def _msgpack_array_header(size: int) -> bytes:
+    if size < 16:
+        return bytes([0x90 | size])
+    if size < 2 ** 16:
+        return b"\xdc" + size.to_bytes(2, "big")
+    return b"\xdd" + size.to_bytes(4, "big")
+
+
+# 이벤트 생성
+def message_event(message: ChatMessage) -> OutboundEvent:
+    return OutboundEvent({"v": VERSION, "t": "msg", **_pack_message(message)})
+
+
+def _messages_event(
+    event_type: str, messages: list[ChatMessage], extra: dict, legacy_extra: dict
+) -> OutboundEvent:
+    packed = [_pack_message(m) for m in messages]
+    legacy_messages = [
+        {**p, "created_at": m.created_at.isoformat()} for p, m in zip(packed, messages)
+    ]
+    return OutboundEvent(
+        {"v": VERSION, "t": event_type, "m": packed, **extra},
+        legacy={"messages": legacy_messages, "extra": legacy_extra},
+    )
+
+
+# messages: 오래된 순
+def history_event(messages: list[ChatMessage], next_cursor: str | None) -> OutboundEvent:
+    return _messages_event(
+        "history",
+        messages,
+        extra={"n": next_cursor},
+        legacy_extra={"next_cursor": next_cursor},
+    )
+
+
+def replay_event(messages: list[ChatMessage], has_more: bool) -> OutboundEvent:
+    return _messages_event(
+        "replay",
+        messages,
+        extra={"more": has_more},
+        legacy_extra={"has_more": has_more},
+    )
+
+
+# 클라이언트는 {"type": "pong"}으로 응답
+def ping_event() -> OutboundEvent:
+    return OutboundEvent({"v": VERSION, "t": "ping"})
+
+
+def error_event(detail: str) -> OutboundEvent:
+    return OutboundEvent({"v": VERSION, "t": "error", "detail": detail})
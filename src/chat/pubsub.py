@@ -0,0 +1,81 @@
+# 여러 워커(프로세스/서버)에 흩어진 웹소켓에 메시지를 전파하기 위한 Redis Pub/Sub
+# - 채팅방마다 채널 1개(chat:rooms:{room_id})
+# - 워커는 로컬에 접속자가 있는 방의 채널만 구독
+import asyncio
+import json
+import logging
+from typing import Awaitable, Callable
+
+from redis.asyncio import Redis
+from redis.asyncio.client import Pipeline
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = "chat:rooms:"
+
+MessageHandler = Callable[[int, dict], Awaitable[None]]
+
+
+class ChatPubSub:
+    def __init__(self, client: Redis, on_message: MessageHandler):
+        self.client = client
+        self.on_message = on_message
+        self.pubsub = client.pubsub(ignore_subscribe_messages=True)
+        self.rooms: set[int] = set()  # 현재 구독 중인 방
+        self._listener: asyncio.Task | None = None
+
+    @staticmethod
+    def get_channel(room_id: int) -> str:
+        return f"{CHANNEL_PREFIX}{room_id}"
+
+    # broadcast 시 Stream XADD와 같은 pipeline으로 전송(Redis 왕복 1번)
+    def publish(self, pipe: Pipeline, room_id: int, payload: dict) -> None:
+        pipe.publish(self.get_channel(room_id), json.dumps(payload))
+
+    async def subscribe(self, room_id: int) -> None:
+        if room_id in self.rooms:
+            return
+
+        self.rooms.add(room_id)
+        await self.pubsub.subscribe(self.get_channel(room_id))
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+
+    async def unsubscribe(self, room_id: int) -> None:
+        if room_id not in self.rooms:
+            return
+
+        self.rooms.discard(room_id)
+        await self.pubsub.unsubscribe(self.get_channel(room_id))
+
+    async def _listen(self):
+        while True:
+            if not self.pubsub.subscribed:
+                await asyncio.sleep(1)
+                continue
+
+            try:
+                message = await self.pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=1.0
+                )
+                if message is None:
+                    continue
+
+                room_id = int(message["channel"].removeprefix(CHANNEL_PREFIX))
+                await self.on_message(room_id, json.loads(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except RedisConnectionError:
+                logger.exception("Chat pub/sub connection lost, retrying")
+                await asyncio.sleep(1)
+            except Exception:
+                # 메시지 하나 처리 실패로 구독 루프가 죽지 않도록
+                logger.exception("Failed to handle chat pub/sub message")
+
+    async def close(self) -> None:
+        if self._listener:
+            self._listener.cancel()
+            self._listener = None
+        self.rooms.clear()
+        await self.pubsub.aclose()
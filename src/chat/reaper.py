@@ -0,0 +1,98 @@
+# 응답 없는 웹소켓 정리(half-open 연결 방지)
+# - TCP가 끊겨도 WebSocketDisconnect가 바로 오지 않아서 연결 목록에 계속 남을 수 있음
+# - ping_interval 동안 수신이 없으면 ping 이벤트 전송(0 이하면 ping 없이 idle_timeout만 적용)
+# - idle_timeout 동안 수신(pong 포함)이 없으면 연결 종료 후 목록에서 제거
+# - 기존 텍스트 포맷(LEGACY) 연결은 대상에서 제외(수신만 하는 클라이언트가 끊기지 않도록)
+#   -> 웹소켓 서버의 프로토콜 레벨 ping/pong(uvicorn --ws-ping-interval/--ws-ping-timeout)으로
+#      끊긴 연결을 감지하면 WebSocketDisconnect로 정리됨
+import asyncio
+import contextlib
+import logging
+import time
+from typing import Awaitable, Callable
+
+from fastapi import WebSocket, status
+
+from chat.connection import ChatConnection, ConnectionRegistry
+from chat.protocol import ping_event
+from config.metrics import Counter
+
+logger = logging.getLogger(__name__)
+
+WS_REAPED_CONNECTIONS = Counter(
+    "chat_ws_reaped_connections_total", "Idle websocket connections closed by the reaper"
+)
+
+DisconnectHandler = Callable[[WebSocket], Awaitable[None]]
+
+# 확인 주기 최소값(초)
+MIN_SWEEP_INTERVAL_S = 1.0
+
+
+class ConnectionReaper:
+    def __init__(
+        self,
+        registry: ConnectionRegistry,
+        on_reap: DisconnectHandler,
+        ping_interval: float,
+        idle_timeout: float,
+    ):
+        self.registry = registry
+        self.on_reap = on_reap
+        self.ping_interval = ping_interval
+        self.idle_timeout = idle_timeout
+        self._task: asyncio.Task | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.idle_timeout > 0
+
+    def start(self) -> None:
+        if self.enabled and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._run())
+
+    @property
+    def pings_enabled(self) -> bool:
+        return self.ping_interval > 0
+
+    @property
+    def sweep_interval(self) -> float:
+        # ping_interval보다 자주 확인해서 idle_timeout 초과 후 지연을 줄임
+        timeout = self.idle_timeout
+        if self.pings_enabled:
+            timeout = min(self.ping_interval, timeout)
+        return max(timeout / 2, MIN_SWEEP_INTERVAL_S)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                await self.sweep()
+            except Exception:
+                logger.exception("Failed to reap websocket connections")
+
+    async def sweep(self) -> int:
+        now = time.monotonic()
+        expired: list[ChatConnection] = []
+        for conn in list(self.registry.connections.values()):
+            if not conn.protocol.supports_heartbeat:
+                continue
+            idle = now - conn.last_seen
+            if idle >= self.idle_timeout:
+                expired.append(conn)
+            elif self.pings_enabled and idle >= self.ping_interval and not conn.pinged:
+                conn.pinged = True
+                conn.send(ping_event())
+
+        for conn in expired:
+            await self.on_reap(conn.websocket)
+            await conn.close(code=status.WS_1001_GOING_AWAY)
+        WS_REAPED_CONNECTIONS.inc(len(expired))
+        return len(expired)
+
+    async def close(self) -> None:
+        if self._task:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
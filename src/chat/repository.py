@@ -1,26 +1,72 @@
-from fastapi import Depends
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+
+from sqlalchemy import select, or_, and_
+from sqlalchemy.ext.asyncio import async_sessionmaker
 
 from chat.models import ChatMessage
-from config.database.connection_async import get_async_session
+from config.database.connection_async import AsyncSessionFactory
 
 
+# 웹소켓 연결 수와 DB 커넥션 수를 분리하기 위해
+# 요청(웹소켓 연결)마다 세션을 주입받지 않고, 작업마다 짧게 세션을 열고 닫음
 class ChatRepository:
-    def __init__(self, session: AsyncSession = Depends(get_async_session)):
-        self.session = session
+    def __init__(self, session_factory: async_sessionmaker = AsyncSessionFactory):
+        self.session_factory = session_factory
 
     async def save(self, message: ChatMessage) -> None:
-        self.session.add(message)
-        await self.session.commit()
-
-    async def get_messages_by_room(self, room_id: int):
-        # 1) DB에서 조회(I/O -> await)
-        result = await self.session.execute(
-            select(ChatMessage)
-            .filter_by(chat_room_id=room_id)
-            .order_by(ChatMessage.created_at.asc())
-        )
-
-        # 2) 데이터를 ORM 객체로 변환(I/O 대기 없음)
-        return result.scalars().all()
+        async with self.session_factory() as session:
+            session.add(message)
+            await session.commit()
+
+    async def get_recent_messages(
+        self, room_id: int, limit: int
+    ) -> list[ChatMessage]:
+        # 최신 메시지 limit개(created_at, id 역순)
+        async with self.session_factory() as session:
+            result = await session.execute(
+                select(ChatMessage)
+                .filter_by(chat_room_id=room_id)
+                .order_by(ChatMessage.created_at.desc(), ChatMessage.id.desc())
+                .limit(limit)
+            )
+            return list(result.scalars().all())
+
+    async def get_messages_before(
+        self, room_id: int, created_at: datetime, message_id: int, limit: int
+    ) -> list[ChatMessage]:
+        # 커서(created_at, id)보다 이전 메시지 limit개(created_at, id 역순)
+        async with self.session_factory() as session:
+            result = await session.execute(
+                select(ChatMessage)
+                .filter(
+                    ChatMessage.chat_room_id == room_id,
+                    or_(
+                        ChatMessage.created_at < created_at,
+                        and_(
+                            ChatMessage.created_at == created_at,
+                            ChatMessage.id < message_id,
+                        ),
+                    ),
+                )
+                .order_by(ChatMessage.created_at.desc(), ChatMessage.id.desc())
+                .limit(limit)
+            )
+            return list(result.scalars().all())
+
+    async def get_messages_after(
+        self, room_id: int, message_id: int, since: datetime, limit: int
+    ) -> list[ChatMessage]:
+        # message_id 이후 메시지 limit개(created_at, id 순)
+        # since: 인덱스 범위 조회를 위한 created_at 하한
+        async with self.session_factory() as session:
+            result = await session.execute(
+                select(ChatMessage)
+                .filter(
+                    ChatMessage.chat_room_id == room_id,
+                    ChatMessage.created_at >= since,
+                    ChatMessage.id > message_id,
+                )
+                .order_by(ChatMessage.created_at.asc(), ChatMessage.id.asc())
+                .limit(limit)
+            )
+            return list(result.scalars().all())
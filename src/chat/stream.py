@@ -0,0 +1,105 @@
+# 방별 최근 메시지를 Redis Stream에 보관(hot tail)
+# - XADD MAXLEN ~ max_len 으로 최근 메시지만 유지
+# - 입장/history/재접속 시 대부분 Stream에서 처리하고, max_len 이전 메시지만 DB 조회
+# - Stream과 warm 표시 키는 같은 TTL(XADD마다 함께 연장) -> 메시지가 없는 방은 만료
+#   (둘이 같이 만료되므로 warm 표시만 남아서 빈 Stream을 믿는 일이 없음, 만료 후에는 DB에서 다시 채움)
+from datetime import datetime
+
+from redis.asyncio import Redis
+from redis.asyncio.client import Pipeline
+from redis.exceptions import WatchError
+
+from chat.models import ChatMessage
+
+# (Stream entry id, 메시지)
+StreamEntry = tuple[str, ChatMessage]
+
+
+class ChatMessageStream:
+    def __init__(self, client: Redis, max_len: int, ttl: int):
+        self.client = client
+        self.max_len = max_len
+        self.ttl = ttl
+
+    @staticmethod
+    def get_key(room_id: int) -> str:
+        return f"chat:rooms:{room_id}:stream"
+
+    # DB에서 최근 메시지를 채웠는지 표시(빈 방을 매번 DB에서 다시 채우지 않도록)
+    @staticmethod
+    def get_warm_key(room_id: int) -> str:
+        return f"chat:rooms:{room_id}:stream:warm"
+
+    @staticmethod
+    def _to_fields(message: ChatMessage) -> dict:
+        return {
+            "id": message.id,
+            "user_id": message.user_id,
+            "content": message.content,
+            "created_at": message.created_at.isoformat(),
+        }
+
+    @staticmethod
+    def _to_entry(room_id: int, entry: tuple[str, dict]) -> StreamEntry:
+        stream_id, fields = entry
+        return stream_id, ChatMessage(
+            id=int(fields["id"]),
+            user_id=int(fields["user_id"]),
+            chat_room_id=room_id,
+            content=fields["content"],
+            created_at=datetime.fromisoformat(fields["created_at"]),
+        )
+
+    # broadcast 시 PUBLISH와 같은 pipeline으로 전송(Redis 왕복 1번)
+    def append(self, pipe: Pipeline, message: ChatMessage) -> None:
+        key = self.get_key(message.chat_room_id)
+        pipe.xadd(key, self._to_fields(message), maxlen=self.max_len, approximate=True)
+        pipe.expire(key, self.ttl)
+        pipe.expire(self.get_warm_key(message.chat_room_id), self.ttl)  # 없으면 무시됨
+
+    async def get_latest(
+        self, room_id: int, count: int, before: str | None = None
+    ) -> tuple[list[StreamEntry], int, bool]:
+        # before(Stream id)보다 이전 메시지 count개(최신순), Stream 길이, warm 여부
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.xrevrange(
+                self.get_key(room_id),
+                max=f"({before}" if before else "+",
+                min="-",
+                count=count,
+            )
+            pipe.xlen(self.get_key(room_id))
+            pipe.exists(self.get_warm_key(room_id))
+            entries, length, warmed = await pipe.execute()
+
+        return (
+            [self._to_entry(room_id, entry) for entry in entries],
+            length,
+            bool(warmed),
+        )
+
+    # DB에서 읽은 최근 메시지(오래된 순)로 Stream을 채움
+    # - 그 사이 Stream에 추가된 메시지와 합쳐서 id 순으로 다시 기록
+    # - WATCH로 동시에 XADD가 일어나면 재시도
+    async def warm(self, room_id: int, messages: list[ChatMessage]) -> None:
+        key = self.get_key(room_id)
+        async with self.client.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    await pipe.watch(key)
+                    entries = await pipe.xrange(key, min="-", max="+")
+                    merged = {m.id: m for m in messages}
+                    for entry in entries:
+                        _, message = self._to_entry(room_id, entry)
+                        merged[message.id] = message
+
+                    pipe.multi()
+                    pipe.delete(key)
+                    for message_id in sorted(merged)[-self.max_len:]:
+                        self.append(pipe, merged[message_id])
+                    pipe.set(self.get_warm_key(room_id), 1, ex=self.ttl)
+                    pipe.expire(key, self.ttl)  # 메시지가 하나도 없으면 키가 없어서 무시됨
+                    await pipe.execute()
+                    return
+                except WatchError:
+                    continue
@@ -0,0 +1,112 @@
+# Snowflake 워커 id 임대(Redis)
+# - pid는 컨테이너마다 1이고 한 호스트 안에서도 겹칠 수 있음
+#   -> 워커 id가 같은 프로세스 2개가 같은 밀리초에 같은 메시지 id를 발급
+# - 서버 시작 시 chat:worker_id:{n} 키를 SET NX EX로 선점하고, ttl/3마다 만료 연장
+# - CHAT_WORKER_ID를 직접 지정하면 임대하지 않음(프로세스마다 다른 값이어야 함)
+# - local 외 환경에서는 임대에 실패하면 서버 시작 실패(pid로 대신하지 않음)
+import asyncio
+import contextlib
+import logging
+import os
+import random
+import uuid
+
+from redis.asyncio import Redis
+
+from chat.ids import MAX_WORKER_ID, SnowflakeGenerator, message_id_generator
+from config import ENV, ServerEnv, settings
+from config.cache import async_redis_client
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "chat:worker_id:"
+# MAX_WORKER_ID는 commands/generate_data.py 전용
+LEASABLE_WORKER_IDS = MAX_WORKER_ID
+
+# 내가 임대한 키일 때만 만료 연장/삭제
+_RENEW_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class WorkerIdLease:
+    def __init__(self, client: Redis, generator: SnowflakeGenerator, ttl: int):
+        self.client = client
+        self.generator = generator
+        self.ttl = ttl
+        self.token = uuid.uuid4().hex
+        self.worker_id: int | None = None
+        self._task: asyncio.Task | None = None
+
+    def _get_key(self) -> str:
+        return f"{KEY_PREFIX}{self.worker_id}"
+
+    async def acquire(self) -> int:
+        # 동시에 시작한 워커끼리 같은 번호부터 경쟁하지 않도록 임의 위치부터 탐색
+        start = random.randrange(LEASABLE_WORKER_IDS)
+        for i in range(LEASABLE_WORKER_IDS):
+            worker_id = (start + i) % LEASABLE_WORKER_IDS
+            if await self.client.set(f"{KEY_PREFIX}{worker_id}", self.token, nx=True, ex=self.ttl):
+                self.worker_id = worker_id
+                self.generator.set_worker_id(worker_id)
+                return worker_id
+        raise RuntimeError("No chat worker id available")
+
+    async def start(self) -> None:
+        if os.getenv("CHAT_WORKER_ID") is not None:
+            return  # 직접 지정
+
+        try:
+            await self.acquire()
+        except Exception:
+            if ENV != ServerEnv.LOCAL:
+                raise
+            logger.warning(
+                "Failed to lease chat worker id, using %d (pid)",
+                self.generator.worker_id,
+                exc_info=True,
+            )
+            return
+        self._task = asyncio.create_task(self._renew())
+
+    async def _renew(self):
+        while True:
+            await asyncio.sleep(self.ttl / 3)
+            try:
+                renewed = await self.client.eval(
+                    _RENEW_SCRIPT, 1, self._get_key(), self.token, self.ttl
+                )
+                if not renewed:
+                    # Redis 장애 등으로 만료됨 -> 다른 프로세스가 가져갔을 수 있으므로 새로 임대
+                    logger.error("Lost chat worker id %d, leasing a new one", self.worker_id)
+                    await self.acquire()
+            except Exception:
+                logger.exception("Failed to renew chat worker id %d", self.worker_id)
+
+    async def close(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+        try:
+            await self.client.eval(_RELEASE_SCRIPT, 1, self._get_key(), self.token)
+        except Exception:
+            logger.warning("Failed to release chat worker id %d", self.worker_id, exc_info=True)
+
+
+worker_id_lease = WorkerIdLease(
+    client=async_redis_client,
+    generator=message_id_generator,
+    ttl=settings.chat_worker_id_ttl_s,
+)
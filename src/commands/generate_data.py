@@ -0,0 +1,368 @@
+# 대량 합성 데이터 생성(운영 규모 재현용, 개발/벤치마크 DB 전용)
+#   python -m commands.generate_data --scale 1 --workers 8           # 약 1,000만 행
+#   python -m commands.generate_data --scale 0.1 --method load-data  # LOAD DATA LOCAL INFILE
+# - 분포: 좋아요/댓글은 인기 게시글에 몰림(power-law), 글을 많이 쓰는 사용자, 메시지가 몰리는 채팅방
+# - 댓글은 스레드 단위로 생성(댓글 + 같은 게시글의 대댓글 0~n개, 대댓글에는 댓글을 달 수 없음)
+# - id를 미리 정해서 넣으므로 테이블/청크끼리 서로 조회하지 않고 프로세스별로 병렬 저장
+#   (적재 중에는 세션 단위로 FK/unique 검사를 끔)
+# - 비밀번호 해시는 미리 만든 pool에서 돌려씀: 사용자 id의 비밀번호는 f"pool-{id % pool_size}"
+# 적재 후 username 블룸 필터를 다시 만들어야 함(python -m commands.rebuild_username_filter)
+import argparse
+import bisect
+import functools
+import math
+import os
+import random
+import tempfile
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from sqlalchemy import Engine, create_engine, func, select
+
+from chat.ids import EPOCH_MS, MAX_WORKER_ID, SEQUENCE_BITS, WORKER_ID_BITS
+from chat.models import ChatMessage, ChatRoom
+from feed.models import Post, PostComment, PostLike
+from user.models import User
+from user.service.authentication import hash_password
+
+# --scale 1 기준 행 수(합계 약 1,000만)
+BASE_COUNTS = {
+    "users": 200_000,
+    "posts": 1_000_000,
+    "comments": 3_000_000,
+    "likes": 4_800_000,
+    "rooms": 2_000,
+    "messages": 1_000_000,
+}
+CHUNK_SIZE = 100_000
+INSERT_BATCH_SIZE = 5_000
+# 생성기가 만든 메시지 id가 서버의 Snowflake id와 겹치지 않도록 마지막 워커 id 사용
+GENERATOR_WORKER_ID = MAX_WORKER_ID
+START_AT = datetime(2024, 1, 1)
+PERIOD = timedelta(days=365)
+
+
+@dataclass(frozen=True)
+class Plan:
+    seed: int
+    skew: float  # 클수록 상위(인기) 항목에 몰림
+    password_pool: tuple[str, ...]
+    # 테이블별 (시작 id, 개수), messages는 (시작 시각(ms), 개수)
+    users: tuple[int, int]
+    posts: tuple[int, int]
+    comments: tuple[int, int]
+    likes: tuple[int, int]
+    rooms: tuple[int, int]
+    messages: tuple[int, int]
+    message_span_ms: int  # 메시지 시각 범위
+    # 인기 순위별 게시글의 좋아요 시작 위치(누적 합, 길이 = 게시글 수 + 1)
+    like_offsets: array
+
+
+# 0 ~ n-1 중 하나(앞쪽일수록 자주 나옴)
+def skewed_rank(rng: random.Random, n: int, skew: float) -> int:
+    return min(int(n * rng.random() ** skew), n - 1)
+
+
+@functools.lru_cache
+def _shuffle_step(n: int) -> int:
+    step = 2_654_435_761 % n or 1
+    while math.gcd(step, n) != 1:
+        step += 1
+    return step
+
+
+# 순위 -> 0 ~ n-1 (1:1 대응, 인기 항목이 최신/오래된 글에 몰리지 않도록 섞음)
+def shuffle_rank(rank: int, n: int) -> int:
+    return rank * _shuffle_step(n) % n
+
+
+# 순위별 좋아요 수: Zipf(1/rank) 분포로 total을 나눔(사용자 수를 넘지 않음)
+def build_like_offsets(total: int, post_count: int, user_count: int) -> array:
+    harmonic = sum(1 / rank for rank in range(1, post_count + 1))
+    offsets = array("q", [0])
+    carry = 0.0  # 소수점 이하는 다음 순위로 넘김
+    for rank in range(1, post_count + 1):
+        expected = total / harmonic / rank + carry
+        carry = expected - int(expected)
+        offsets.append(offsets[-1] + min(int(expected), user_count))
+    return offsets
+
+
+def _offset(created_at: datetime, index: int, count: int) -> datetime:
+    return created_at + PERIOD * (index / max(count, 1))
+
+
+# 테이블별 행 생성(청크 단위, 같은 seed면 같은 결과)
+def user_rows(plan: Plan, start: int, stop: int):
+    first_id, count = plan.users
+    pool = plan.password_pool
+    for i in range(start, stop):
+        user_id = first_id + i
+        yield (
+            user_id,
+            f"gen{user_id}",
+            None,
+            None,
+            pool[user_id % len(pool)],
+            _offset(START_AT, i, count),
+        )
+
+
+def post_rows(plan: Plan, start: int, stop: int):
+    rng = random.Random(f"{plan.seed}:posts:{start}")
+    user_first, user_count = plan.users
+    first_id, count = plan.posts
+    for i in range(start, stop):
+        user_id = user_first + shuffle_rank(skewed_rank(rng, user_count, plan.skew), user_count)
+        yield (
+            first_id + i,
+            user_id,
+            "feed/posts/generated.jpg",
+            f"generated post {first_id + i}",
+            _offset(START_AT, i, count),
+        )
+
+
+def comment_rows(plan: Plan, start: int, stop: int):
+    rng = random.Random(f"{plan.seed}:comments:{start}")
+    user_first, user_count = plan.users
+    post_first, post_count = plan.posts
+    first_id, count = plan.comments
+    i = start
+    while i < stop:
+        # 스레드: 댓글 1개 + 대댓글(인기 게시글일수록 길어지는 건 게시글 선택 분포로 반영)
+        post_id = post_first + shuffle_rank(skewed_rank(rng, post_count, plan.skew), post_count)
+        parent_id = first_id + i
+        replies = min(int(rng.expovariate(0.7)), stop - i - 1)
+        created_at = _offset(START_AT, i, count)
+        for j in range(replies + 1):
+            yield (
+                first_id + i,
+                user_first + rng.randrange(user_count),
+                post_id,
+                f"generated comment {first_id + i}",
+                parent_id if j else None,
+                created_at + timedelta(minutes=j),
+            )
+            i += 1
+
+
+def like_rows(plan: Plan, start: int, stop: int):
+    # 같은 게시글의 좋아요는 서로 다른 사용자(user, post unique)
+    # -> 게시글(순위)마다 정해진 수만큼 사용자를 1:1 섞인 순서로 순회
+    rng = random.Random(f"{plan.seed}:likes:{start}")
+    user_first, user_count = plan.users
+    post_first, post_count = plan.posts
+    like_first, _ = plan.likes
+    offsets = plan.like_offsets
+    rank = bisect.bisect_right(offsets, start) - 1
+    i = start
+    while i < stop:
+        post_id = post_first + shuffle_rank(rank, post_count)
+        user_offset = rank * 7919
+        for j in range(i - offsets[rank], min(offsets[rank + 1], stop) - offsets[rank]):
+            yield (
+                like_first + i,
+                user_first + shuffle_rank((user_offset + j) % user_count, user_count),
+                post_id,
+                START_AT + PERIOD * rng.random(),
+            )
+            i += 1
+        rank += 1
+
+
+def room_rows(plan: Plan, start: int, stop: int):
+    first_id, _ = plan.rooms
+    for i in range(start, stop):
+        yield first_id + i, f"room {first_id + i}"
+
+
+def message_rows(plan: Plan, start: int, stop: int):
+    rng = random.Random(f"{plan.seed}:messages:{start}")
+    user_first, user_count = plan.users
+    room_first, room_count = plan.rooms
+    start_ms, count = plan.messages
+    step_ms = plan.message_span_ms / max(count, 1)
+    for i in range(start, stop):
+        ms = start_ms + int(i * step_ms)
+        # Snowflake 형식(시각 순 정렬 유지), 같은 밀리초 안에서는 i로 구분
+        message_id = (
+            ((ms - EPOCH_MS) << (WORKER_ID_BITS + SEQUENCE_BITS))
+            | (GENERATOR_WORKER_ID << SEQUENCE_BITS)
+            | (i & ((1 << SEQUENCE_BITS) - 1))
+        )
+        yield (
+            message_id,
+            user_first + rng.randrange(user_count),
+            room_first + skewed_rank(rng, room_count, plan.skew),
+            f"generated message {i}",
+            datetime.fromtimestamp(ms / 1000),
+        )
+
+
+# 테이블 -> (모델, 컬럼, 행 생성 함수)
+TABLES = {
+    "users": (User, ("id", "username", "email", "social_provider", "password", "created_at"), user_rows),
+    "posts": (Post, ("id", "user_id", "image", "content", "created_at"), post_rows),
+    "comments": (
+        PostComment, ("id", "user_id", "post_id", "content", "parent_id", "created_at"), comment_rows
+    ),
+    "likes": (PostLike, ("id", "user_id", "post_id", "created_at"), like_rows),
+    "rooms": (ChatRoom, ("id", "name"), room_rows),
+    "messages": (ChatMessage, ("id", "user_id", "chat_room_id", "content", "created_at"), message_rows),
+}
+
+
+# 워커 프로세스별로 1번만 전달/생성(Plan에 좋아요 분포 배열이 있어서 청크마다 보내지 않음)
+_plan: Plan | None = None
+_engine: Engine | None = None
+_method = "insert"
+
+
+def _init_worker(database_url: str, method: str, plan: Plan) -> None:
+    global _plan, _engine, _method
+    connect_args = {"local_infile": True} if method == "load-data" else {}
+    _plan, _method = plan, method
+    _engine = create_engine(database_url, connect_args=connect_args)
+
+
+def _to_field(value) -> str:
+    if value is None:
+        return "\\N"
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n")
+
+
+def load_chunk(table: str, start: int, stop: int) -> int:
+    model, columns, build_rows = TABLES[table]
+    table_name = model.__table__.name
+    column_list = ", ".join(columns)
+    rows = build_rows(_plan, start, stop)
+
+    with _engine.begin() as connection:
+        connection.exec_driver_sql("SET foreign_key_checks = 0, unique_checks = 0")
+        if _method == "load-data":
+            with tempfile.NamedTemporaryFile("w", suffix=".tsv", delete=False) as f:
+                for row in rows:
+                    f.write("\t".join(map(_to_field, row)) + "\n")
+            try:
+                connection.exec_driver_sql(
+                    f"LOAD DATA LOCAL INFILE '{f.name}' INTO TABLE {table_name} "
+                    f"CHARACTER SET utf8mb4 FIELDS TERMINATED BY '\\t' ({column_list})"
+                )
+            finally:
+                os.remove(f.name)
+        else:
+            # pymysql executemany는 INSERT ... VALUES (...), (...) 여러 행 문장으로 묶어서 전송
+            statement = (
+                f"INSERT INTO {table_name} ({column_list}) "
+                f"VALUES ({', '.join(['%s'] * len(columns))})"
+            )
+            batch = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= INSERT_BATCH_SIZE:
+                    connection.exec_driver_sql(statement, batch)
+                    batch = []
+            if batch:
+                connection.exec_driver_sql(statement, batch)
+    return stop - start
+
+
+def build_plan(engine: Engine, counts: dict[str, int], seed: int, skew: float, pool_size: int) -> Plan:
+    if counts["users"] <= 0 or counts["posts"] <= 0 or counts["rooms"] <= 0:
+        raise ValueError("users, posts and rooms must be positive")
+
+    # 기존 데이터 뒤에 이어서 추가
+    ranges = {}
+    with engine.connect() as connection:
+        for table, (model, _, _) in TABLES.items():
+            max_id = connection.execute(select(func.max(model.id))).scalar() or 0
+            ranges[table] = (max_id + 1, counts[table])
+
+    # 메시지는 Snowflake id(시각 기반) -> 기존 메시지(이전 실행/서버)의 마지막 시각 이후로 생성
+    # (START_AT부터 다시 만들면 두 번째 실행에서 같은 id가 나옴)
+    start_ms = int(START_AT.timestamp() * 1000)
+    if last_message_id := ranges["messages"][0] - 1:
+        last_ms = (last_message_id >> (WORKER_ID_BITS + SEQUENCE_BITS)) + EPOCH_MS
+        start_ms = max(start_ms, last_ms + 1)
+    # 미래 시각은 만들지 않음
+    span_ms = min(int(PERIOD.total_seconds() * 1000), int(time.time() * 1000) - start_ms)
+    # 같은 밀리초 안에서는 시퀀스(i의 하위 12bit)로 구분
+    if counts["messages"] and span_ms * (1 << SEQUENCE_BITS) < counts["messages"]:
+        raise ValueError("Not enough time range left for messages after the latest existing one")
+    ranges["messages"] = (start_ms, counts["messages"])
+    like_offsets = build_like_offsets(counts["likes"], counts["posts"], counts["users"])
+    ranges["likes"] = (ranges["likes"][0], like_offsets[-1])  # 반올림/상한으로 조금 달라짐
+
+    # bcrypt는 느리므로(의도된 비용) 사용자마다 해시하지 않음
+    password_pool = tuple(hash_password(plain_text=f"pool-{i}") for i in range(pool_size))
+    return Plan(
+        seed=seed,
+        skew=skew,
+        password_pool=password_pool,
+        like_offsets=like_offsets,
+        message_span_ms=span_ms,
+        **ranges,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--database-url", default=None, help="기본값: settings.database_url")
+    parser.add_argument("--scale", type=float, default=1.0, help="1 = 약 1,000만 행")
+    for table in BASE_COUNTS:
+        parser.add_argument(f"--{table}", type=int, default=None, help="scale 대신 개수 지정")
+    parser.add_argument("--method", choices=("insert", "load-data"), default="insert")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--skew", type=float, default=3.0)
+    parser.add_argument("--password-pool", type=int, default=16)
+    args = parser.parse_args()
+
+    database_url = args.database_url
+    if database_url is None:
+        from config import settings
+        database_url = settings.database_url
+
+    counts = {
+        table: getattr(args, table) if getattr(args, table) is not None else int(base * args.scale)
+        for table, base in BASE_COUNTS.items()
+    }
+    engine = create_engine(database_url)
+    plan = build_plan(engine, counts, args.seed, args.skew, args.password_pool)
+    engine.dispose()
+    counts["likes"] = plan.likes[1]
+
+    # 모든 테이블의 청크를 한 번에 병렬 처리(FK 검사를 끄므로 순서 무관)
+    tasks = [
+        (table, start, min(start + CHUNK_SIZE, count))
+        for table, count in counts.items()
+        for start in range(0, count, CHUNK_SIZE)
+    ]
+    loaded = dict.fromkeys(counts, 0)
+    started_at = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=args.workers,
+        initializer=_init_worker,
+        initargs=(database_url, args.method, plan),
+    ) as executor:
+        futures = {executor.submit(load_chunk, *task): task[0] for task in tasks}
+        for future in as_completed(futures):
+            table = futures[future]
+            loaded[table] += future.result()
+            elapsed = time.perf_counter() - started_at
+            print(f"{table:<10}{loaded[table]:>12,}/{counts[table]:,} rows  {elapsed:8.1f}s")
+
+    elapsed = time.perf_counter() - started_at
+    total = sum(loaded.values())
+    print(f"Loaded {total:,} rows in {elapsed:.1f}s ({total / elapsed:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# 정적 파일 중 압축 가능한 파일(텍스트, JSON, SVG 등)의 .gz / .br 파일 생성
+# -> PrecompressedStaticFiles가 요청마다 압축하지 않고 미리 압축한 파일을 전송
+#   python -m commands.precompress_static --directory feed/posts
+# 이미지(jpeg, png 등)는 이미 압축된 포맷이라 건너뜀
+import argparse
+import gzip
+import mimetypes
+import os
+
+from config.compression import brotli
+
+COMPRESSED_SUFFIXES = (".gz", ".br")
+
+
+def is_compressible(path: str) -> bool:
+    content_type, _ = mimetypes.guess_type(path)
+    if content_type is None:
+        return False
+    return content_type.startswith("text/") or content_type in (
+        "application/json", "application/javascript", "image/svg+xml"
+    )
+
+
+def precompress(path: str) -> list[str]:
+    with open(path, "rb") as f:
+        body = f.read()
+
+    # 한 번만 압축하므로 최고 레벨 사용
+    variants = [(path + ".gz", gzip.compress(body, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        variants.append((path + ".br", brotli.compress(body, quality=11)))
+
+    written = []
+    for variant_path, compressed in variants:
+        if len(compressed) >= len(body):
+            continue  # 압축 효과가 없으면 원본만 사용
+        with open(variant_path, "wb") as f:
+            f.write(compressed)
+        written.append(variant_path)
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--directory", default="feed/posts")
+    args = parser.parse_args()
+
+    count = 0
+    for root, _, filenames in os.walk(args.directory):
+        for filename in filenames:
+            path = os.path.join(root, filename)
+            if filename.endswith(COMPRESSED_SUFFIXES) or not is_compressible(path):
+                continue
+            count += len(precompress(path))
+    print(f"Wrote {count} precompressed files")
+
+
+if __name__ == "__main__":
+    main()
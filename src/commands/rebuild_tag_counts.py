@@ -0,0 +1,55 @@
+# 태그별 게시글 수(Redis tags:count)를 post_tag 테이블 기준으로 다시 계산
+#   python -m commands.rebuild_tag_counts
+#   python -m commands.rebuild_tag_counts --backfill  # post_tag 추가 이전 게시글의 태그도 저장
+# 인기 태그(시간 버킷)는 작성/수정 이벤트 기반이므로 다시 만들지 않음
+import argparse
+
+from sqlalchemy import func, insert, select
+
+from config.database.connection import SessionFactory, init_engine
+from feed.models import Post, PostTag, extract_tags
+from feed.tags import tag_counter
+
+
+def backfill(batch_size: int = 10_000) -> int:
+    # 태그가 하나도 없는 게시글만 다시 파싱
+    count = 0
+    # 조회는 스트리밍(server-side cursor)이므로 저장은 다른 세션(커넥션)에서
+    with SessionFactory() as session, SessionFactory() as write_session:
+        result = session.execute(
+            select(Post.id, Post.content, Post.created_at)
+            .where(~select(PostTag.id).where(PostTag.post_id == Post.id).exists())
+            .execution_options(yield_per=batch_size)
+        )
+        for rows in result.partitions():
+            tags = [
+                {"post_id": post_id, "tag": tag, "created_at": created_at}
+                for post_id, content, created_at in rows
+                for tag in extract_tags(content)
+            ]
+            if tags:
+                write_session.execute(insert(PostTag), tags)
+                write_session.commit()
+                count += len(tags)
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--backfill", action="store_true")
+    args = parser.parse_args()
+
+    init_engine()
+    if args.backfill:
+        print(f"Backfilled {backfill()} post tags")
+
+    with SessionFactory() as session:
+        counts = dict(
+            session.execute(select(PostTag.tag, func.count()).group_by(PostTag.tag)).all()
+        )
+    tag_counter.rebuild(counts=counts)
+    print(f"Rebuilt tag counts for {len(counts)} tags")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+# username 블룸 필터 재생성(Redis 초기화 후 콜드 스타트, 탈퇴 누적으로 오탐률이 올라갔을 때)
+#   python -m commands.rebuild_username_filter
+# 재생성 도중 가입한 사용자는 누락될 수 있으므로 트래픽이 적을 때 실행
+from sqlalchemy import select
+
+from config.database.connection import SessionFactory, init_engine
+from user.models import User
+from user.service.username_filter import username_filter
+
+
+def iter_usernames(batch_size: int = 10_000):
+    with SessionFactory() as session:
+        result = session.execute(
+            select(User.username).execution_options(yield_per=batch_size)
+        )
+        for username in result.scalars():
+            yield username
+
+
+def main():
+    init_engine()
+    count = 0
+
+    def counted():
+        nonlocal count
+        for username in iter_usernames():
+            count += 1
+            yield username
+
+    username_filter.rebuild(usernames=counted())
+    print(f"Rebuilt username filter with {count} usernames")
+
+
+if __name__ == "__main__":
+    main()
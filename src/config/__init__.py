@@ -1,5 +1,6 @@
 import os
 from enum import StrEnum
+from functools import lru_cache
 
 from pydantic_settings import BaseSettings
 
@@ -9,6 +10,19 @@ class ServerEnv(StrEnum):
     DEV = "dev"      # 개발 서버
     PROD = "prod"    # 프로덕션 서버
 
+
+class UserRouterMode(StrEnum):
+    SYNC = "sync"    # user/api/router.py
+    ASYNC = "async"  # user/api/router_async.py
+
+
+# 웹소켓 송신 큐가 가득 찼을 때의 처리 방식
+class WebSocketOverflowPolicy(StrEnum):
+    DROP_OLDEST = "drop_oldest"  # 가장 오래된 프레임 버림
+    COALESCE = "coalesce"        # 쌓인 프레임을 하나로 합침
+    DISCONNECT = "disconnect"    # 느린 클라이언트 연결 종료
+
+
 class Settings(BaseSettings):
     database_url: str
     redis_host: str
@@ -16,7 +30,73 @@ class Settings(BaseSettings):
     kakao_rest_api_key: str
     kakao_redirect_url: str
 
-def get_settings(env: ServerEnv):
+    # 서버 시작 시 마운트할 user 라우터 (USER_ROUTER=async)
+    user_router: UserRouterMode = UserRouterMode.SYNC
+
+    # 비동기 엔진 URL(없으면 database_url의 드라이버만 aiomysql로 변경)
+    async_database_url: str | None = None
+    # 서버 시작 시 DB/Redis 커넥션을 미리 열어서 첫 요청 지연 방지
+    warm_up_on_startup: bool = True
+    # 외부 API(카카오 등) 호출 타임아웃
+    http_client_timeout_s: float = 10.0
+    # bcrypt cost(2^rounds) -> 테스트에서는 최소값(4)으로 낮춤
+    bcrypt_rounds: int = 12
+    # 이 크기(bytes) 이상인 응답만 압축
+    compression_min_size: int = 1024
+    # /metrics 접근: 허용 IP에서 온 요청 또는 Authorization: Bearer <METRICS_TOKEN>
+    metrics_token: str | None = None
+    metrics_allowed_hosts: list[str] = ["127.0.0.1", "::1"]
+
+    # 트레이싱: 요청 중 샘플링 비율(0이면 끄기), 둘 중 하나로 내보냄
+    trace_sample_rate: float = 0.0
+    trace_jsonl_path: str | None = None  # 예: traces.jsonl
+    trace_otlp_endpoint: str | None = None  # 예: http://127.0.0.1:4318
+    # 기록을 기다리는 trace 수 상한(넘으면 버리고 trace_dropped_traces_total 증가)
+    trace_export_queue_size: int = 1000
+    # traceparent 헤더의 sampled 플래그를 따를지(신뢰할 수 있는 프록시/내부 서비스 뒤에서만 켜기)
+    trace_trust_parent_sampling: bool = False
+
+    # 프로파일링: X-Profile 헤더에 토큰을 담은 요청만(없으면 끄기)
+    profiling_token: str | None = None
+    profiling_dir: str = "profiles"
+    profiling_interval_s: float = 0.001
+    # background: 라우트별 N번째 요청마다 프로파일링(0이면 끄기), 가장 느린 K개 보관
+    profiling_sample_every: int = 0
+    profiling_keep_slowest: int = 5
+
+    # 웹소켓 연결별 송신 큐
+    ws_send_queue_size: int = 256
+    ws_overflow_policy: WebSocketOverflowPolicy = WebSocketOverflowPolicy.DROP_OLDEST
+
+    # 웹소켓 heartbeat(chat.v1.* 프로토콜 연결만): ping_interval 동안 수신이 없으면 ping,
+    # idle_timeout을 넘기면 종료(ping_interval이 0이면 ping 없이 종료만, idle_timeout이 0이면 끄기)
+    ws_ping_interval_s: int = 25
+    ws_idle_timeout_s: int = 75
+    # 워커(프로세스)별 웹소켓 연결 수 제한
+    ws_max_connections: int = 10_000
+    ws_max_connections_per_room: int = 1_000
+    ws_max_connections_per_user: int = 5
+
+    # 채팅방 입장 시/history 요청 시 한 번에 보내는 메시지 수
+    chat_history_page_size: int = 50
+    # 방별 Redis Stream에 보관하는 최근 메시지 수
+    chat_stream_max_len: int = 500
+    # 메시지가 없는 방의 Stream 보관 기간(마지막 메시지 기준)
+    chat_stream_ttl_s: int = 7 * 24 * 60 * 60
+
+    # Snowflake 워커 id 임대 만료 시간(CHAT_WORKER_ID 미지정 시)
+    chat_worker_id_ttl_s: int = 60
+
+    # 채팅 메시지 write-behind 저장
+    chat_flush_interval_ms: int = 20
+    chat_flush_batch_size: int = 500
+    chat_max_buffer_size: int = 100_000
+
+ENV = os.getenv("ENV", ServerEnv.LOCAL)
+
+
+@lru_cache
+def get_settings(env: ServerEnv = ENV):
     match env:
         case ServerEnv.DEV:
             return Settings(_env_file="config/.env.dev")
@@ -25,5 +105,11 @@ def get_settings(env: ServerEnv):
         case _:
             return Settings(_env_file="config/.env.local")
 
-ENV = os.getenv("ENV", ServerEnv.LOCAL)
-settings = get_settings(env=ENV)
+
+# config 모듈 import만으로는 env 파일을 읽지 않고, settings에 처음 접근할 때 읽음
+# - `from config import settings`도 접근이므로 그런 모듈을 import하는 순간 읽힘
+# - enum/get_settings만 import하는 모듈(chat/connection.py, user/service/authentication.py)에서만 로딩을 미룸
+def __getattr__(name: str):
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
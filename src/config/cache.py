@@ -1,8 +1,55 @@
+import time
+
 from redis import Redis
+from redis.asyncio import Redis as AsyncRedis
 
 from config import settings
+from config.metrics import Histogram
+from config.tracing import span
+
+REDIS_COMMAND_DURATION = Histogram(
+    "redis_command_duration_seconds", "Redis command latency", ("client", "command")
+)
+
+
+# 명령별 지연 시간 기록(pipeline/pubsub은 execute_command를 거치지 않음)
+class InstrumentedRedis(Redis):
+    def execute_command(self, *args, **options):
+        command = str(args[0]).upper()
+        start = time.perf_counter()
+        try:
+            with span(f"redis {command}"):
+                return super().execute_command(*args, **options)
+        finally:
+            REDIS_COMMAND_DURATION.observe(
+                time.perf_counter() - start, client="sync", command=command
+            )
+
+
+class InstrumentedAsyncRedis(AsyncRedis):
+    async def execute_command(self, *args, **options):
+        command = str(args[0]).upper()
+        start = time.perf_counter()
+        try:
+            with span(f"redis {command}"):
+                return await super().execute_command(*args, **options)
+        finally:
+            REDIS_COMMAND_DURATION.observe(
+                time.perf_counter() - start, client="async", command=command
+            )
+
+
+# import 시 클라이언트 객체만 생성(커넥션은 첫 명령에서 연결), 종료는 lifespan에서
+redis_client = InstrumentedRedis(
+    host=settings.redis_host,
+    port=settings.redis_port,
+    db=0,
+    encoding="utf-8",
+    decode_responses=True,
+)
 
-redis_client = Redis(
+# 비동기 라우터/웹소켓에서 사용
+async_redis_client = InstrumentedAsyncRedis(
     host=settings.redis_host,
     port=settings.redis_port,
     db=0,
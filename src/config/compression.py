@@ -0,0 +1,182 @@
+# 응답 압축(gzip / brotli)
+# - Accept-Encoding 협상(brotli 설치 시 br 우선)
+# - minimum_size 이상인 압축 가능한 타입(JSON, 텍스트 등)만 압축, 타입별로 압축 레벨 조절
+# - 이미 Content-Encoding이 있는 응답(미리 압축된 정적 파일 등), 이미지 등은 건너뜀
+# - 압축에 쓴 CPU 시간/바이트를 메트릭으로 기록 -> 대역폭 vs 워커 CPU 비교
+# - 본문이 여러 조각으로 오는 스트리밍 응답(FileResponse 등)은 그대로 전달
+import gzip
+import mimetypes
+import os
+import time
+
+from anyio import to_thread
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.exceptions import HTTPException
+from starlette.responses import Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from config.metrics import Counter
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성
+    brotli = None
+
+HTTP_COMPRESSION_SECONDS = Counter(
+    "http_compression_cpu_seconds_total", "CPU time spent compressing responses", ("encoding",)
+)
+HTTP_COMPRESSION_BYTES = Counter(
+    "http_compression_bytes_total", "Response bytes before/after compression", ("encoding", "stage")
+)
+
+# content type 앞부분 -> (gzip level, brotli quality)
+# JSON은 요청마다 압축하므로 CPU를 적게 쓰는 레벨, 정적 텍스트는 높은 레벨
+COMPRESSION_LEVELS = {
+    "application/json": (5, 4),
+    "text/html": (6, 5),
+    "text/": (6, 5),
+    "application/javascript": (6, 5),
+    "image/svg+xml": (9, 9),
+}
+# 이 크기 이상은 이벤트 루프를 막지 않도록 스레드에서 압축
+THREAD_OFFLOAD_SIZE = 256 * 1024
+
+
+def parse_accept_encoding(header: str) -> dict[str, float]:
+    encodings = {}
+    for item in header.split(","):
+        name, _, params = item.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            encodings[name.strip().lower()] = q
+    return encodings
+
+
+def choose_encoding(headers: Headers) -> str | None:
+    accepted = parse_accept_encoding(headers.get("accept-encoding", ""))
+    wildcard = accepted.get("*", 0.0)
+    candidates = []
+    if brotli is not None:
+        candidates.append("br")
+    candidates.append("gzip")
+
+    best, best_q = None, 0.0
+    for encoding in candidates:  # q가 같으면 br 우선
+        q = accepted.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def get_levels(content_type: str) -> tuple[int, int] | None:
+    content_type = content_type.split(";")[0].strip().lower()
+    for prefix, levels in COMPRESSION_LEVELS.items():
+        if content_type.startswith(prefix):
+            return levels
+    return None
+
+
+def compress(body: bytes, encoding: str, levels: tuple[int, int]) -> bytes:
+    gzip_level, brotli_quality = levels
+    start = time.thread_time()
+    if encoding == "br":
+        compressed = brotli.compress(body, quality=brotli_quality)
+    else:
+        compressed = gzip.compress(body, compresslevel=gzip_level, mtime=0)
+    HTTP_COMPRESSION_SECONDS.inc(time.thread_time() - start, encoding=encoding)
+    HTTP_COMPRESSION_BYTES.inc(len(body), encoding=encoding, stage="in")
+    HTTP_COMPRESSION_BYTES.inc(len(compressed), encoding=encoding, stage="out")
+    return compressed
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Message | None = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message  # 본문을 보고 압축 여부 결정
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            headers = MutableHeaders(raw=start_message["headers"])
+            levels = get_levels(headers.get("content-type", ""))
+            if (
+                more_body
+                or levels is None
+                or len(body) < self.minimum_size
+                or "content-encoding" in headers
+            ):
+                passthrough = True
+                if start_message["status"] == 304:
+                    # 304도 200과 같은 Vary를 보내야 캐시가 인코딩별로 구분함
+                    headers.add_vary_header("Accept-Encoding")
+                await send(start_message)
+                await send(message)
+                return
+
+            if len(body) >= THREAD_OFFLOAD_SIZE:
+                body = await to_thread.run_sync(compress, body, encoding, levels)
+            else:
+                body = compress(body, encoding, levels)
+
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(body))
+            headers.add_vary_header("Accept-Encoding")
+            # 표현(representation)이 달라지므로 weak ETag로 변경(If-None-Match는 weak 비교)
+            # config/http_cache.py의 ETag는 이미 weak -> 304 응답과 같은 값
+            if (etag := headers.get("etag")) and not etag.startswith("W/"):
+                headers["ETag"] = f"W/{etag}"
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_wrapper)
+
+
+# 미리 압축한 파일(foo.css.br, foo.css.gz)이 있으면 그 파일을 전송
+# (commands/precompress_static.py로 생성)
+class PrecompressedStaticFiles(StaticFiles):
+    VARIANTS = (("br", ".br"), ("gzip", ".gz"))
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        accepted = parse_accept_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        for encoding, suffix in self.VARIANTS:
+            if accepted.get(encoding, accepted.get("*", 0.0)) <= 0:
+                continue
+            try:
+                response = await super().get_response(path + suffix, scope)
+            except HTTPException:
+                continue  # 압축 파일 없음
+
+            content_type, _ = mimetypes.guess_type(os.path.basename(path))
+            response.headers["Content-Type"] = content_type or "application/octet-stream"
+            response.headers["Content-Encoding"] = encoding
+            response.headers.add_vary_header("Accept-Encoding")
+            return response
+
+        return await super().get_response(path, scope)
@@ -1,15 +1,32 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, Engine
 from sqlalchemy.orm import sessionmaker
 
 from config import settings
+from config.instrumentation import instrument_engine
 
-engine = create_engine(settings.database_url)
-SessionFactory = sessionmaker(
-    bind=engine, autocommit=False, autoflush=False, expire_on_commit=False
-)
+# 엔진은 import 시점이 아니라 서버 시작(lifespan) 또는 첫 세션 생성 시 만듦
+engine: Engine | None = None
+SessionFactory = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False)
+
+
+def init_engine() -> Engine:
+    global engine
+    if engine is None:
+        engine = create_engine(settings.database_url)
+        instrument_engine(engine, name="sync")
+        SessionFactory.configure(bind=engine)
+    return engine
+
+
+def dispose_engine() -> None:
+    global engine
+    if engine is not None:
+        engine.dispose()  # 커넥션 풀 정리
+        engine = None
 
 
 def get_session():
+    init_engine()
     session = SessionFactory()
     try:
         yield session
@@ -0,0 +1,35 @@
+"""PostTag.tag binary collation
+
+Revision ID: 2e8b5d1f4a93
+Revises: 7d3a1e9b6c52
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2e8b5d1f4a93'
+down_revision: Union[str, None] = '7d3a1e9b6c52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 태그는 extract_tags(Python)가 정규화한 값 그대로 비교
+    # 기본 collation은 대소문자/악센트를 무시해서 #café, #cafe가 unique key에서 충돌
+    op.alter_column('post_tag', 'tag',
+               existing_type=sa.String(length=50),
+               type_=sa.String(length=50, collation='utf8mb4_bin'),
+               existing_nullable=False)
+
+
+def downgrade() -> None:
+    # 기본 collation에서 같은 값으로 보는 태그가 같은 게시글에 있으면 실패
+    op.alter_column('post_tag', 'tag',
+               existing_type=sa.String(length=50, collation='utf8mb4_bin'),
+               type_=sa.String(length=50),
+               existing_nullable=False)
@@ -0,0 +1,36 @@
+# 외부 API(카카오 등) 호출용 httpx 클라이언트
+# - 요청마다 클라이언트를 만들지 않고 lifespan에서 1개 만들어서 커넥션 풀(keep-alive) 재사용
+import httpx
+from fastapi import Request
+
+from config import settings
+from config.tracing import span
+
+
+# 외부 호출을 span으로 기록
+class TracingTransport(httpx.AsyncBaseTransport):
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self.transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        with span(
+            f"http {request.method} {request.url.host}", **{"http.url": str(request.url)}
+        ) as current:
+            response = await self.transport.handle_async_request(request)
+            if current is not None:
+                current.attributes["http.status_code"] = response.status_code
+            return response
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+def create_http_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        timeout=settings.http_client_timeout_s,
+        transport=TracingTransport(httpx.AsyncHTTPTransport()),
+    )
+
+
+def get_http_client(request: Request) -> httpx.AsyncClient:
+    return request.app.state.http_client
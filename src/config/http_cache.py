@@ -0,0 +1,43 @@
+# ETag / 조건부 GET(If-None-Match -> 304)
+# - ETag는 응답 본문 해시가 아니라 버전(카운터, max id 등)으로 만듦
+#   -> 본문을 만들기 전에 비교해서 304면 조회/직렬화를 건너뜀
+#   -> 바이트 단위로 같다는 보장이 아니므로 항상 weak ETag(W/"...")
+#      (압축 여부와 관계없이 200/304가 같은 ETag를 보냄)
+# - 라우트별 Cache-Control 정책
+from fastapi import Request, Response, status
+
+# 게시글 목록: 자주 새로고침하므로 짧게 캐싱 후 재검증
+POSTS_CACHE_CONTROL = "public, max-age=5, must-revalidate"
+# 게시글 상세: 댓글이 바로 보여야 하므로 매번 재검증(304면 본문 X)
+POST_DETAIL_CACHE_CONTROL = "public, no-cache"
+# 사용자 프로필: 인증이 필요한 응답 -> 공유 캐시(CDN) 저장 X
+USER_PROFILE_CACHE_CONTROL = "private, max-age=60"
+
+
+def make_etag(*parts) -> str:
+    return 'W/"' + "-".join(str(part) for part in parts) + '"'
+
+
+def _opaque(tag: str) -> str:
+    # If-None-Match는 weak 비교(W/ 무시)
+    return tag.strip().removeprefix("W/")
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    if not (header := request.headers.get("if-none-match")):
+        return False
+    if header.strip() == "*":
+        return True
+    return any(_opaque(tag) == _opaque(etag) for tag in header.split(","))
+
+
+def set_cache_headers(response: Response, etag: str, cache_control: str) -> Response:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+    return response
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    return set_cache_headers(
+        Response(status_code=status.HTTP_304_NOT_MODIFIED), etag, cache_control
+    )
@@ -0,0 +1,140 @@
+# HTTP / DB / 스레드풀 메트릭 수집
+# - 라벨은 실제 경로가 아니라 라우트 템플릿(/posts/{post_id}) -> 라벨 개수가 라우트 수로 제한됨
+# - SQL은 문장 종류(SELECT/INSERT/...)만 라벨로 사용
+import time
+
+from anyio import to_thread
+from sqlalchemy import Engine, event
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from config.metrics import Gauge, Histogram
+from config.tracing import end_span, start_span
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ("method", "route", "status"),
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "HTTP requests being processed", ("method", "route")
+)
+THREADPOOL_USAGE = Gauge(
+    "threadpool_usage", "Worker threads used by sync handlers", ("stat",)
+)
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds", "SQL statement latency", ("engine", "operation")
+)
+DB_POOL_CONNECTIONS = Gauge(
+    "db_pool_connections", "SQLAlchemy connection pool usage", ("engine", "stat")
+)
+
+UNMATCHED_ROUTE = "<unmatched>"
+SQL_OPERATIONS = {"SELECT", "INSERT", "UPDATE", "DELETE", "BEGIN", "COMMIT", "ROLLBACK"}
+
+
+def get_route_template(scope: Scope) -> str:
+    app = scope.get("app")
+    routes = getattr(getattr(app, "router", None), "routes", ())
+    partial = None
+    for route in routes:
+        match, _ = route.matches(scope)
+        if match is Match.FULL:
+            return route.path
+        if match is Match.PARTIAL and partial is None:
+            partial = route.path  # 메서드만 다른 경우(405)
+    return partial or UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = get_route_template(scope)
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc(method=method, route=route)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec(method=method, route=route)
+            HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - start, method=method, route=route, status=status_code
+            )
+
+
+# 동기 핸들러가 실행되는 anyio 스레드풀(이벤트 루프에서 조회해야 함 -> /metrics는 async)
+def threadpool_stats() -> dict[tuple, float]:
+    limiter = to_thread.current_default_thread_limiter()
+    stats = limiter.statistics()
+    return {
+        ("in_use",): stats.borrowed_tokens,
+        ("total",): stats.total_tokens,
+        ("waiting",): stats.tasks_waiting,
+    }
+
+
+THREADPOOL_USAGE.set_function(threadpool_stats)
+
+# 엔진 이름 -> 풀 (sync / async)
+_pools: dict = {}
+
+
+def _pool_stats() -> dict[tuple, float]:
+    stats = {}
+    for name, pool in _pools.items():
+        if not hasattr(pool, "checkedout"):
+            continue  # NullPool 등
+        stats[(name, "size")] = pool.size()
+        stats[(name, "checked_out")] = pool.checkedout()
+        stats[(name, "overflow")] = pool.overflow()
+    return stats
+
+
+DB_POOL_CONNECTIONS.set_function(_pool_stats)
+
+
+def instrument_engine(engine: Engine, name: str) -> None:
+    # 비동기 엔진은 engine.sync_engine을 전달
+    _pools[name] = engine.pool
+
+    def get_operation(statement: str) -> str:
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement else ""
+        return operation if operation in SQL_OPERATIONS else "OTHER"
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        query_span = start_span(
+            f"db {get_operation(statement)}", **{"db.statement": statement, "db.engine": name}
+        )
+        conn.info.setdefault("query_start", []).append((time.perf_counter(), query_span))
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        start, query_span = conn.info["query_start"].pop()
+        DB_QUERY_DURATION.observe(
+            time.perf_counter() - start, engine=name, operation=get_operation(statement)
+        )
+        end_span(query_span)
+
+    # 실패한 쿼리는 after_cursor_execute가 호출되지 않음
+    @event.listens_for(engine, "handle_error")
+    def handle_error(context):
+        if context.connection is None:
+            return
+        if starts := context.connection.info.get("query_start"):
+            _, query_span = starts.pop()
+            end_span(query_span, error=context.original_exception)
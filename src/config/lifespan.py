@@ -0,0 +1,66 @@
+# 서버 시작/종료 시 외부 리소스(DB 엔진, Redis, HTTP 클라이언트) 관리
+# - 시작: 엔진/HTTP 클라이언트 생성 후 DB/Redis 커넥션을 미리 열어둠(warm-up), 채팅 메시지 id용 워커 id 임대
+#   (Redis 클라이언트는 config/cache.py import 시 생성됨, 여기서는 연결/종료만)
+# - 종료: 웹소켓/채팅 버퍼를 먼저 정리(DB 저장)한 뒤 커넥션 풀 반납
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+from sqlalchemy import text
+from starlette.concurrency import run_in_threadpool
+
+from chat.worker_id import worker_id_lease
+from config import settings
+from config.cache import async_redis_client, redis_client
+from config.database.connection import dispose_engine, init_engine
+from config.database.connection_async import dispose_async_engine, init_async_engine
+from config.http import create_http_client
+from config.websocket import ws_connection_manager
+
+logger = logging.getLogger(__name__)
+
+
+def _warm_up_sync() -> None:
+    with init_engine().connect() as connection:
+        connection.execute(text("SELECT 1"))
+    redis_client.ping()
+
+
+async def _warm_up_async() -> None:
+    async with init_async_engine().connect() as connection:
+        await connection.execute(text("SELECT 1"))
+    await async_redis_client.ping()
+
+
+async def warm_up() -> None:
+    # 실패해도 서버는 시작(첫 요청에서 다시 연결 시도)
+    results = await asyncio.gather(
+        run_in_threadpool(_warm_up_sync), _warm_up_async(), return_exceptions=True
+    )
+    for result in results:
+        if isinstance(result, Exception):
+            logger.warning("Warm-up failed: %r", result)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    init_engine()
+    init_async_engine()
+    app.state.http_client = create_http_client()
+    if settings.warm_up_on_startup:
+        await warm_up()
+    await worker_id_lease.start()  # 채팅 메시지 id용 워커 id
+
+    try:
+        yield
+    finally:
+        await ws_connection_manager.close()  # 남은 채팅 메시지 저장
+        await worker_id_lease.close()
+        await app.state.http_client.aclose()
+        await async_redis_client.aclose()
+        redis_client.close()
+        await dispose_async_engine()
+        dispose_engine()
+        if app.state.span_exporter is not None:
+            await run_in_threadpool(app.state.span_exporter.shutdown)  # 남은 trace 기록
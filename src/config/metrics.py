@@ -0,0 +1,149 @@
+# 프로세스 내부 메트릭(Counter/Gauge/Histogram)
+# 라벨 값 조합별로 값을 따로 저장
+# - 동기 핸들러(스레드풀)에서도 기록하므로 lock으로 보호
+# - render_text(): Prometheus text format(/metrics)
+import threading
+from bisect import bisect_left
+from typing import Callable
+
+
+class Metric:
+    type: str = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.values: dict[tuple, float] = dict()
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def collect(self) -> dict[tuple, float]:
+        return dict(self.values)
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    type = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        super().__init__(name, documentation, labelnames)
+        self._function: Callable[[], float | dict[tuple, float]] | None = None
+
+    def set(self, value: float, **labels) -> None:
+        self.values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    # 조회 시점에 값을 계산(큐 길이처럼 계속 바뀌는 값)
+    def set_function(self, function: Callable[[], float | dict[tuple, float]]) -> None:
+        self._function = function
+
+    def collect(self) -> dict[tuple, float]:
+        if self._function is None:
+            return dict(self.values)
+
+        value = self._function()
+        return value if isinstance(value, dict) else {(): value}
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    # 초 단위 지연 시간 기본 구간
+    DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # 라벨 조합 -> 구간별 개수(마지막은 +Inf), 합계
+        self.counts: dict[tuple, list[int]] = dict()
+        self.sums: dict[tuple, float] = dict()
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            if (counts := self.counts.get(key)) is None:
+                counts = self.counts[key] = [0] * (len(self.buckets) + 1)
+            counts[index] += 1
+            self.sums[key] = self.sums.get(key, 0.0) + value
+
+    def collect(self) -> dict[tuple, float]:
+        with self._lock:
+            return {key: sum(counts) for key, counts in self.counts.items()}
+
+    def collect_buckets(self) -> list[tuple[tuple, list[int], float]]:
+        with self._lock:
+            return [
+                (key, list(counts), self.sums[key]) for key, counts in self.counts.items()
+            ]
+
+
+REGISTRY: list[Metric] = []
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple, values: tuple, extra: dict | None = None) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs += [f'{n}="{v}"' for n, v in extra.items()]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render_text(registry: list[Metric] = REGISTRY) -> str:
+    lines = []
+    for metric in registry:
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.type}")
+
+        if isinstance(metric, Histogram):
+            for key, counts, total in metric.collect_buckets():
+                cumulative = 0
+                for bound, count in zip(metric.buckets + (float("inf"),), counts):
+                    cumulative += count
+                    labels = _format_labels(
+                        metric.labelnames, key, {"le": _format_value(bound)}
+                    )
+                    lines.append(f"{metric.name}_bucket{labels} {cumulative}")
+                labels = _format_labels(metric.labelnames, key)
+                lines.append(f"{metric.name}_sum{labels} {_format_value(total)}")
+                lines.append(f"{metric.name}_count{labels} {cumulative}")
+            continue
+
+        for key, value in metric.collect().items():
+            labels = _format_labels(metric.labelnames, key)
+            lines.append(f"{metric.name}{labels} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,53 @@
+# (created_at, id) 기준 커서 페이지네이션
+# 검색 결과처럼 점수 순으로 정렬하는 목록은 (score, id) 기준 커서 사용
+# - OFFSET 없이 인덱스 범위 조회만으로 다음 페이지를 가져옴
+# - 클라이언트에는 내부 구조를 숨긴 문자열(base64)로 전달
+# - position: 다음 페이지를 빠르게 찾기 위한 저장소별 위치(e.g. Redis Stream id)
+import base64
+from datetime import datetime
+from typing import NamedTuple
+
+
+class Cursor(NamedTuple):
+    created_at: datetime
+    id: int
+    position: str | None = None
+
+
+def encode_cursor(created_at: datetime, id_: int, position: str | None = None) -> str:
+    raw = f"{created_at.isoformat()}|{id_}"
+    if position:
+        raw += f"|{position}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Cursor:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        created_at, id_, *position = raw.split("|")
+        return Cursor(
+            created_at=datetime.fromisoformat(created_at),
+            id=int(id_),
+            position=position[0] if position else None,
+        )
+    except (ValueError, UnicodeError, IndexError):
+        raise ValueError("Invalid cursor")
+
+
+class ScoreCursor(NamedTuple):
+    score: float
+    id: int
+
+
+def encode_score_cursor(score: float, id_: int) -> str:
+    raw = f"{score!r}|{id_}"  # repr: float 값이 그대로 복원됨
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_score_cursor(cursor: str) -> ScoreCursor:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        score, id_ = raw.split("|")
+        return ScoreCursor(score=float(score), id=int(id_))
+    except (ValueError, UnicodeError):
+        raise ValueError("Invalid cursor")
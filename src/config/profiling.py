@@ -0,0 +1,223 @@
+# 요청 단위 샘플링 프로파일러(pyinstrument)
+# - on-demand: X-Profile 헤더(또는 ?profile= 쿼리)에 PROFILING_TOKEN을 담아 보낸 요청만 프로파일링
+#   - 기본은 PROFILING_DIR에 파일로 저장(응답 헤더 X-Profile-Path)
+#   - X-Profile-Output: inline 이면 원래 응답 대신 프로파일을 응답으로 반환
+#   - X-Profile-Format: speedscope(기본, https://www.speedscope.app 에서 열기) / html(flamegraph)
+#   - 웹소켓은 헤더를 붙일 수 없으므로 ?profile=<token> 으로 연결 전체를 프로파일링(파일 저장만)
+# - background: 라우트별로 N번째 요청마다 프로파일링 -> 라우트별로 가장 느린 K개 파일만 남김
+# - async 코드는 이벤트 루프 스레드에서, 동기 핸들러는 스레드풀 스레드에서 따로 수집한 뒤 합침
+#   (동기 핸들러는 ProfiledRoute를 쓰는 라우터에서만 수집됨)
+import contextlib
+import functools
+import heapq
+import hmac
+import inspect
+import itertools
+import os
+import re
+import threading
+import uuid
+from collections import defaultdict
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from urllib.parse import parse_qs
+
+from anyio import to_thread
+from fastapi.routing import APIRoute
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from config.instrumentation import get_route_template
+
+try:
+    from pyinstrument import Profiler
+    from pyinstrument.renderers import HTMLRenderer, SpeedscopeRenderer
+    from pyinstrument.session import Session
+except ImportError:  # 선택 의존성
+    Profiler = None
+
+# 형식 -> (파일 확장자, content type)
+PROFILE_FORMATS = {
+    "speedscope": (".speedscope.json", "application/json"),
+    "html": (".html", "text/html; charset=utf-8"),
+}
+
+
+@dataclass
+class RequestProfile:
+    name: str
+    interval: float
+    output_format: str = "speedscope"
+    inline: bool = False
+    path: str | None = None
+    # 스레드풀에서 실행된 동기 핸들러의 세션
+    thread_sessions: list = field(default_factory=list)
+
+
+# 프로파일링 중인 요청에서만 값이 있음(run_in_threadpool이 context를 복사하므로 스레드에서도 보임)
+_active: ContextVar[RequestProfile | None] = ContextVar("active_profile", default=None)
+
+
+def render(session, output_format: str) -> str:
+    if output_format == "html":
+        return HTMLRenderer().render(session)
+    return SpeedscopeRenderer().render(session)
+
+
+def profile_thread(func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if (profile := _active.get()) is None:
+            return func(*args, **kwargs)
+
+        profiler = Profiler(interval=profile.interval, async_mode="disabled")
+        profiler.start()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profile.thread_sessions.append(profiler.stop())
+    return wrapper
+
+
+# 동기 핸들러 본문도 프로파일에 포함
+#   router = APIRouter(route_class=ProfiledRoute)
+class ProfiledRoute(APIRoute):
+    def __init__(self, path: str, endpoint, **kwargs):
+        if Profiler is not None and not inspect.iscoroutinefunction(endpoint):
+            endpoint = profile_thread(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+
+# 라우트별로 가장 느린 K개 프로파일만 디스크에 유지
+class SlowestProfiles:
+    def __init__(self, keep: int):
+        self.keep = keep
+        self.heaps: dict[str, list[tuple[float, str]]] = defaultdict(list)  # (duration, path) min-heap
+        self.lock = threading.Lock()
+
+    def is_slow(self, route: str, duration: float) -> bool:
+        with self.lock:
+            heap = self.heaps[route]
+            return len(heap) < self.keep or duration > heap[0][0]
+
+    def add(self, route: str, duration: float, path: str) -> None:
+        with self.lock:
+            heap = self.heaps[route]
+            if len(heap) < self.keep:
+                heapq.heappush(heap, (duration, path))
+                return
+            _, evicted = heapq.heappushpop(heap, (duration, path))
+        if evicted != path:
+            with contextlib.suppress(OSError):
+                os.remove(evicted)
+
+
+class ProfilingMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        token: str | None,
+        directory: str,
+        interval: float = 0.001,
+        sample_every: int = 0,  # 0이면 background 모드 끄기
+        keep_slowest: int = 5,
+    ):
+        self.app = app
+        self.token = token
+        self.directory = directory
+        self.interval = interval
+        self.sample_every = sample_every
+        self.slowest = SlowestProfiles(keep=keep_slowest)
+        self.counters: dict[str, itertools.count] = defaultdict(itertools.count)
+
+    def _is_requested(self, scope: Scope, headers: Headers) -> bool:
+        if not self.token:
+            return False
+        value = headers.get("x-profile")
+        if value is None:
+            query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+            value = query.get("profile", [None])[0]
+        return value is not None and hmac.compare_digest(value.encode(), self.token.encode())
+
+    def _get_profile(self, scope: Scope) -> tuple[RequestProfile | None, bool]:
+        # (프로파일, background 여부)
+        headers = Headers(scope=scope)
+        requested = self._is_requested(scope, headers)
+        sampling = scope["type"] == "http" and self.sample_every > 0
+        if not requested and not sampling:
+            return None, False
+
+        name = f"{scope.get('method', 'WS')} {get_route_template(scope)}"
+        if requested:
+            output_format = headers.get("x-profile-format", "speedscope")
+            return RequestProfile(
+                name=name,
+                interval=self.interval,
+                output_format=output_format if output_format in PROFILE_FORMATS else "speedscope",
+                inline=scope["type"] == "http" and headers.get("x-profile-output") == "inline",
+            ), False
+        if next(self.counters[name]) % self.sample_every == 0:
+            return RequestProfile(name=name, interval=self.interval), True
+        return None, False
+
+    def _get_path(self, profile: RequestProfile) -> str:
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", profile.name).strip("_")
+        suffix, _ = PROFILE_FORMATS[profile.output_format]
+        return os.path.join(self.directory, f"{slug}-{uuid.uuid4().hex[:12]}{suffix}")
+
+    @staticmethod
+    def _write(session, profile: RequestProfile) -> None:
+        os.makedirs(os.path.dirname(profile.path) or ".", exist_ok=True)
+        with open(profile.path, "w") as f:
+            f.write(render(session, profile.output_format))
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if Profiler is None or scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        profile, background = self._get_profile(scope)
+        if profile is None:
+            await self.app(scope, receive, send)
+            return
+        if not profile.inline:
+            profile.path = self._get_path(profile)
+
+        async def send_wrapper(message: Message) -> None:
+            if profile.inline:
+                return  # 원래 응답 대신 프로파일을 보냄
+            if message["type"] == "http.response.start" and not background:
+                MutableHeaders(scope=message)["X-Profile-Path"] = profile.path
+            await send(message)
+
+        profiler = Profiler(interval=self.interval, async_mode="enabled")
+        token = _active.set(profile)
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            session = profiler.stop()
+            _active.reset(token)
+            duration = session.duration  # 합친 세션의 duration은 스레드 시간까지 더해짐
+            for thread_session in profile.thread_sessions:
+                session = Session.combine(session, thread_session)
+
+            if background:
+                if self.slowest.is_slow(profile.name, duration):
+                    await to_thread.run_sync(self._write, session, profile)
+                    self.slowest.add(profile.name, duration, profile.path)
+            elif not profile.inline:
+                await to_thread.run_sync(self._write, session, profile)
+
+        if profile.inline:
+            _, content_type = PROFILE_FORMATS[profile.output_format]
+            body = (await to_thread.run_sync(render, session, profile.output_format)).encode()
+            await send({
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", content_type.encode()),
+                    (b"content-length", str(len(body)).encode()),
+                ],
+            })
+            await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,58 @@
+# 응답 직렬화 fast path
+# - orjson으로 JSON 인코딩(설치되지 않았으면 표준 json)
+# - 목록/상세 응답은 Pydantic 모델 인스턴스를 만들지 않고 dict/row에서 바로 JSON 생성
+#   -> 핸들러가 Response를 반환하면 FastAPI의 response_model 재검증/직렬화를 건너뜀
+#   -> response_model은 OpenAPI 문서용으로만 사용
+# - Pydantic 모델 응답은 미리 만든 TypeAdapter로 바로 bytes로 직렬화
+import json
+from datetime import date, datetime
+from functools import lru_cache
+
+from fastapi import Response, status
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+from config.tracing import span
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성
+    orjson = None
+
+
+def _default(obj):
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(content) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(
+        content, default=_default, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+# 앱 기본 응답 클래스(FastAPI가 만든 dict를 orjson으로 인코딩)
+class FastJSONResponse(JSONResponse):
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+def json_response(content, status_code: int = status.HTTP_200_OK) -> Response:
+    with span("serialize"):
+        body = dumps(content)
+    return Response(content=body, status_code=status_code, media_type="application/json")
+
+
+# 모델 타입별 TypeAdapter는 1번만 생성(core schema 컴파일 비용)
+@lru_cache
+def get_adapter(model_type: type) -> TypeAdapter:
+    return TypeAdapter(model_type)
+
+
+def model_response(model: BaseModel, status_code: int = status.HTTP_200_OK) -> Response:
+    with span("serialize"):
+        body = get_adapter(type(model)).dump_json(model)
+    return Response(content=body, status_code=status_code, media_type="application/json")
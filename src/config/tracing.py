@@ -0,0 +1,318 @@
+# 경량 트레이싱(요청 -> 의존성 -> SQL / Redis / 외부 HTTP 호출)
+# - head-based sampling: 요청 시작 시 샘플링 여부 결정
+#   traceparent 헤더가 있으면 trace id를 이어받음, sampled 플래그는 TRACE_TRUST_PARENT_SAMPLING일 때만 따름
+#   (외부 클라이언트가 헤더로 모든 요청을 샘플링시키지 못하도록 기본은 무시)
+#   샘플링되지 않은 요청은 span()이 contextvar 조회 1번으로 끝남
+# - 요청이 끝나면 trace 단위로 exporter에 전달(백그라운드 스레드에서 기록)
+#   - jsonl: span 1개당 JSON 1줄
+#   - otlp: OTLP/HTTP JSON(/v1/traces)으로 collector에 전송
+import abc
+import contextlib
+import functools
+import inspect
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field, asdict
+
+import httpx
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from config import settings
+from config.metrics import Counter
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "oz-be6-fastapi"
+SPAN_KIND_SERVER = "server"  # 요청 단위 root span
+SPAN_KIND_INTERNAL = "internal"
+
+TRACE_DROPPED_TRACES = Counter(
+    "trace_dropped_traces_total", "Traces dropped because the export queue was full"
+)
+
+
+@dataclass
+class Span:
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+    name: str
+    start_ns: int
+    end_ns: int = 0
+    attributes: dict = field(default_factory=dict)
+    error: str | None = None
+    kind: str = SPAN_KIND_INTERNAL
+
+
+@dataclass
+class Trace:
+    trace_id: str
+    spans: list[Span] = field(default_factory=list)
+
+
+# 샘플링된 요청에서만 값이 있음
+_trace: ContextVar[Trace | None] = ContextVar("trace", default=None)
+_current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+def _new_id(size: int) -> str:
+    return os.urandom(size).hex()
+
+
+def start_span(name: str, **attributes) -> Span | None:
+    if (trace := _trace.get()) is None:
+        return None
+    parent = _current_span.get()
+    return Span(
+        trace_id=trace.trace_id,
+        span_id=_new_id(8),
+        parent_id=parent.span_id if parent else None,
+        name=name,
+        start_ns=time.time_ns(),
+        attributes=attributes,
+    )
+
+
+def end_span(span: Span | None, error: BaseException | None = None) -> None:
+    if span is None or (trace := _trace.get()) is None:
+        return
+    span.end_ns = time.time_ns()
+    if error is not None:
+        span.error = repr(error)
+    trace.spans.append(span)
+
+
+@contextlib.contextmanager
+def span(name: str, **attributes):
+    if (current := start_span(name, **attributes)) is None:
+        yield None
+        return
+
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        end_span(current, error=e)
+        raise
+    else:
+        end_span(current)
+    finally:
+        _current_span.reset(token)
+
+
+# 함수(동기/비동기) 실행 구간을 span으로 기록
+# functools.wraps로 시그니처를 유지하므로 FastAPI Depends에도 사용 가능
+def traced(name: str):
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# Exporters
+class SpanExporter(abc.ABC):
+    # max_queue_size: 기록을 기다리는 trace 수 상한(collector가 느리거나 죽어도 메모리가 늘지 않도록)
+    def __init__(self, max_queue_size: int = 1000):
+        self.queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self._thread: threading.Thread | None = None
+
+    def export(self, spans: list[Span]) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        try:
+            self.queue.put_nowait(spans)
+        except queue.Full:
+            TRACE_DROPPED_TRACES.inc()
+
+    def _run(self):
+        while (spans := self.queue.get()) is not None:
+            try:
+                self.write(spans)
+            except Exception:
+                logger.warning("Failed to export %d spans", len(spans), exc_info=True)
+
+    @abc.abstractmethod
+    def write(self, spans: list[Span]) -> None:
+        ...
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        if self._thread is not None:
+            try:
+                self.queue.put(None, timeout=timeout)  # 남은 trace를 기록한 뒤 종료
+            except queue.Full:
+                logger.warning("Span export queue still full, dropping remaining traces")
+            self._thread.join(timeout)
+            self._thread = None
+
+
+class JSONLinesExporter(SpanExporter):
+    def __init__(self, path: str, max_queue_size: int = 1000):
+        super().__init__(max_queue_size=max_queue_size)
+        self.path = path
+
+    def write(self, spans: list[Span]) -> None:
+        with open(self.path, "a") as f:
+            for s in spans:
+                f.write(json.dumps(asdict(s), default=str) + "\n")
+
+
+def _otlp_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+OTLP_SPAN_KINDS = {SPAN_KIND_INTERNAL: 1, SPAN_KIND_SERVER: 2}
+
+
+class OTLPExporter(SpanExporter):
+    def __init__(self, endpoint: str, max_queue_size: int = 1000):
+        super().__init__(max_queue_size=max_queue_size)
+        self.endpoint = endpoint.rstrip("/") + "/v1/traces"
+        self.client = httpx.Client(timeout=5)
+
+    @staticmethod
+    def _to_otlp(s: Span) -> dict:
+        data = {
+            "traceId": s.trace_id,
+            "spanId": s.span_id,
+            "name": s.name,
+            "kind": OTLP_SPAN_KINDS[s.kind],
+            "startTimeUnixNano": str(s.start_ns),
+            "endTimeUnixNano": str(s.end_ns),
+            "attributes": [
+                {"key": k, "value": _otlp_value(v)} for k, v in s.attributes.items()
+            ],
+            "status": {"code": 2, "message": s.error} if s.error else {"code": 1},
+        }
+        if s.parent_id:
+            data["parentSpanId"] = s.parent_id
+        return data
+
+    def write(self, spans: list[Span]) -> None:
+        payload = {
+            "resourceSpans": [{
+                "resource": {
+                    "attributes": [
+                        {"key": "service.name", "value": {"stringValue": SERVICE_NAME}}
+                    ]
+                },
+                "scopeSpans": [{
+                    "scope": {"name": __name__},
+                    "spans": [self._to_otlp(s) for s in spans],
+                }],
+            }]
+        }
+        self.client.post(self.endpoint, json=payload).raise_for_status()
+
+
+def create_exporter() -> SpanExporter | None:
+    if settings.trace_otlp_endpoint:
+        return OTLPExporter(
+            endpoint=settings.trace_otlp_endpoint,
+            max_queue_size=settings.trace_export_queue_size,
+        )
+    if settings.trace_jsonl_path:
+        return JSONLinesExporter(
+            path=settings.trace_jsonl_path, max_queue_size=settings.trace_export_queue_size
+        )
+    return None
+
+
+# 요청 단위 root span
+def _parse_traceparent(header: str | None) -> tuple[str, str, bool] | None:
+    # version-trace_id-parent_id-flags
+    parts = header.split("-") if header else []
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        sampled = bool(int(parts[3], 16) & 1)
+    except ValueError:
+        return None
+    return parts[1], parts[2], sampled
+
+
+class TracingMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        exporter: SpanExporter | None,
+        sample_rate: float,
+        trust_parent_sampling: bool = False,
+    ):
+        self.app = app
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+        self.trust_parent_sampling = trust_parent_sampling
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self.exporter is None:
+            await self.app(scope, receive, send)
+            return
+
+        if parent := _parse_traceparent(Headers(scope=scope).get("traceparent")):
+            trace_id, parent_id, parent_sampled = parent
+        else:
+            trace_id, parent_id, parent_sampled = _new_id(16), None, False
+        if self.trust_parent_sampling and parent is not None:
+            sampled = parent_sampled
+        else:
+            sampled = random.random() < self.sample_rate
+        if not sampled:
+            await self.app(scope, receive, send)
+            return
+
+        # 라우트 템플릿은 metrics와 같은 방식으로 계산(라벨/이름 개수 제한)
+        from config.instrumentation import get_route_template
+
+        trace = Trace(trace_id=trace_id)
+        trace_token = _trace.set(trace)
+        root = Span(
+            trace_id=trace_id,
+            span_id=_new_id(8),
+            parent_id=parent_id,
+            name=f"{scope['method']} {get_route_template(scope)}",
+            start_ns=time.time_ns(),
+            attributes={"http.method": scope["method"], "http.target": scope["path"]},
+            kind=SPAN_KIND_SERVER,  # traceparent를 이어받아 parent_id가 있어도 SERVER
+        )
+        span_token = _current_span.set(root)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                root.attributes["http.status_code"] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except BaseException as e:
+            root.error = repr(e)
+            raise
+        finally:
+            root.end_ns = time.time_ns()
+            trace.spans.append(root)
+            _current_span.reset(span_token)
+            _trace.reset(trace_token)
+            self.exporter.export(trace.spans)
@@ -1,67 +1,259 @@
-from fastapi import WebSocket
-from fastapi.params import Depends
+import json
+import logging
+import uuid
+from datetime import datetime
 
+from fastapi import WebSocket, status
+
+from chat.connection import (
+    ChatConnection, ConnectionRegistry, WS_OCCUPANCY, WS_SEND_QUEUE_DEPTH
+)
+from chat.history import ChatHistory
 from chat.models import ChatMessage
+from chat.persistence import chat_message_writer
+from chat.protocol import (
+    Protocol, error_event, history_event, message_event, negotiate, replay_event
+)
+from chat.pubsub import ChatPubSub
+from chat.reaper import ConnectionReaper
 from chat.repository import ChatRepository
+from chat.stream import ChatMessageStream
+from config import settings
+from config.cache import async_redis_client
+from config.metrics import Counter
+
+logger = logging.getLogger(__name__)
+
+WS_REJECTED_CONNECTIONS = Counter(
+    "chat_ws_rejected_connections_total", "Websocket connections over a limit", ("limit",)
+)
 
 
 class WebSocketConnectionManager:
     def __init__(self):
-        self.connections: dict[WebSocket, tuple[int, int]] = dict()
+        self.connections = ConnectionRegistry(
+            max_queue_size=settings.ws_send_queue_size,
+            overflow_policy=settings.ws_overflow_policy,
+        )
+        WS_SEND_QUEUE_DEPTH.set_function(self.connections.queue_depth_stats)
+        WS_OCCUPANCY.set_function(self.connections.occupancy_stats)
+
+        # 응답 없는 연결 정리
+        self.reaper = ConnectionReaper(
+            registry=self.connections,
+            on_reap=self.disconnect,
+            ping_interval=settings.ws_ping_interval_s,
+            idle_timeout=settings.ws_idle_timeout_s,
+        )
+
+        # 다른 워커에 접속한 사용자에게도 메시지를 전달하기 위해 Redis Pub/Sub 사용
+        self.worker_id: str = uuid.uuid4().hex
+        self.pubsub = ChatPubSub(
+            client=async_redis_client, on_message=self._on_pubsub_message
+        )
+
+        # 방별 최근 메시지는 Redis Stream에서 조회
+        self.stream = ChatMessageStream(
+            client=async_redis_client,
+            max_len=settings.chat_stream_max_len,
+            ttl=settings.chat_stream_ttl_s,
+        )
+        # 웹소켓마다 세션을 잡지 않도록 작업 단위로 세션을 여는 저장소를 공유
+        self.chat_repo = ChatRepository()
+        self.history = ChatHistory(
+            stream=self.stream,
+            chat_repo=self.chat_repo,
+            page_size=settings.chat_history_page_size,
+        )
 
-    def __call__(self, chat_repo: ChatRepository = Depends()):
-        self.chat_repo = chat_repo
+    def __call__(self):
         return self
 
-    async def _send_message(
-        self, websocket: WebSocket, message: ChatMessage, me_id: int
-    ):
-        if message.user_id == me_id:
-            await self._send_my_message(websocket=websocket, content=message.content)
+    def _get_context(self, websocket: WebSocket) -> tuple[int, int]:
+        conn = self.connections.get(websocket)
+        return conn.room_id, conn.user_id
+
+    # 입장 시 전체 메시지 대신 최신 메시지 1페이지만 전송
+    # 재접속(last_id)이면 놓친 메시지만 전송
+    async def _init_messages(self, conn: ChatConnection, last_id: int | None):
+        if last_id is None:
+            page = await self.history.get_page(room_id=conn.room_id)
+            # 오래된 메시지부터
+            event = history_event(list(reversed(page.messages)), page.next_cursor)
         else:
-            await self._send_friend_message(websocket=websocket, content=message.content)
+            page = await self.history.get_replay(room_id=conn.room_id, last_id=last_id)
+            event = replay_event(page.messages, page.has_more)
+        await conn.send_now(event)
 
-    async def _send_my_message(self, websocket: WebSocket, content: str):
-        await websocket.send_text(f"Me > {content}")
+    # 이전 메시지 페이지 요청: {"type": "history", "cursor": "..."}
+    async def _send_history(self, conn: ChatConnection, cursor: str):
+        try:
+            page = await self.history.get_page(room_id=conn.room_id, cursor=cursor)
+        except ValueError as e:
+            conn.send(error_event(str(e)))
+            return
+        conn.send(history_event(list(reversed(page.messages)), page.next_cursor))
 
-    async def _send_friend_message(self, websocket: WebSocket, content: str):
-        await websocket.send_text(f"Friend > {content}")
+    # 놓친 메시지 요청: {"type": "replay", "last_id": 123}
+    async def _send_replay(self, conn: ChatConnection, last_id: int):
+        page = await self.history.get_replay(room_id=conn.room_id, last_id=last_id)
+        conn.send(replay_event(page.messages, page.has_more))
 
-    async def _get_context(self, websocket: WebSocket) -> tuple[int, int]:
-        return self.connections[websocket]
+    @staticmethod
+    def _parse_command(data: str) -> dict | None:
+        if not data.startswith("{"):
+            return None
+        try:
+            command = json.loads(data)
+        except ValueError:
+            return None
+        if isinstance(command, dict) and command.get("type") in ("history", "replay", "pong"):
+            return command
+        return None
 
-    async def _init_messages(self, websocket: WebSocket):
-        room_id, user_id = self._get_context(websocket=websocket)
+    # 클라이언트가 보낸 텍스트 프레임 처리(명령 or 채팅 메시지)
+    async def receive(self, websocket: WebSocket, data: str):
+        conn = self.connections.get(websocket)
+        if conn is None:
+            return  # reaper가 정리한 연결
+        conn.touch()
+
+        if command := self._parse_command(data):
+            match command["type"]:
+                case "history":
+                    await self._send_history(
+                        conn=conn, cursor=str(command.get("cursor", ""))
+                    )
+                case "replay":
+                    try:
+                        last_id = int(command.get("last_id"))
+                    except (TypeError, ValueError):
+                        conn.send(error_event("Invalid last_id"))
+                        return
+                    await self._send_replay(conn=conn, last_id=last_id)
+                case "pong":
+                    pass  # touch()로 처리
+            return
+
+        await self.broadcast(websocket=websocket, content=data)
+
+    # 넘은 제한 이름(없으면 None)
+    def _check_limits(self, room_id: int, user_id: int) -> str | None:
+        if len(self.connections) >= settings.ws_max_connections:
+            return "process"
+        if self.connections.count_room(room_id) >= settings.ws_max_connections_per_room:
+            return "room"
+        if self.connections.count_user(user_id) >= settings.ws_max_connections_per_user:
+            return "user"
+        return None
+
+    # 연결 제한을 넘으면 핸드셰이크를 거절하고 False
+    async def connect(
+        self,
+        websocket: WebSocket,
+        room_id: int,
+        user_id: int,
+        last_id: int | None = None,
+    ) -> bool:
+        if limit := self._check_limits(room_id=room_id, user_id=user_id):
+            WS_REJECTED_CONNECTIONS.inc(limit=limit)
+            await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+            return False
 
-        messages = await self.chat_repo.get_messages_by_room(room_id=room_id)
-        for message in messages:
-            await self._send_message(
-                websocket=websocket, message=message, me_id=user_id
+        # 클라이언트가 요청한 subprotocol 중 지원하는 포맷 선택(없으면 기존 텍스트 포맷)
+        protocol = negotiate(websocket)
+        # 제한 확인 직후(await 전에) 연결 목록에 추가해서 슬롯 예약
+        # -> 동시에 들어온 핸드셰이크가 accept를 기다리는 동안 제한을 넘지 않음
+        conn = self.connections.add(
+            websocket=websocket, room_id=room_id, user_id=user_id, protocol=protocol
+        )
+        try:
+            await websocket.accept(  # 웹소켓 통신 허용
+                subprotocol=None if protocol is Protocol.LEGACY else protocol
             )
 
-    async def connect(self, websocket: WebSocket, room_id: int, user_id: int):
-        await websocket.accept()  # 웹소켓 통신 허용
-        self.connections[websocket] = room_id, user_id # 클라이언트 웹소켓 연결 목록에 추가
-        await self._init_messages(websocket=websocket)
+            # 이 워커에 방의 첫 접속자가 생기면 채널 구독
+            await self.pubsub.subscribe(room_id=room_id)
 
-    # 서버에서 관리 중인 모든 ws 연결에 메시지를 전파
+            # 이전 메시지를 먼저 보낸 뒤 writer 시작(그 사이 들어온 메시지는 큐에 대기)
+            await self._init_messages(conn=conn, last_id=last_id)
+        except BaseException:
+            # Redis/DB 오류, history 전송 중 연결 끊김 등 -> 예약한 슬롯과 구독 정리
+            try:
+                await self.disconnect(websocket=websocket)
+            except Exception:
+                logger.warning("Failed to clean up websocket connection", exc_info=True)
+            raise
+        conn.start_writer()
+        self.reaper.start()
+        return True
+
+    # 이 워커에 접속한 방 멤버들의 송신 큐에 메시지 추가(전송을 기다리지 않음)
+    # 이벤트는 1개만 만들고, 프로토콜별 직렬화 결과를 모든 수신자가 재사용
+    async def _deliver(self, message: ChatMessage):
+        event = message_event(message)
+        for conn in self.connections.get_room_members(room_id=message.chat_room_id):
+            conn.send(event)
+
+    # 다른 워커에서 발행한 메시지 수신
+    async def _on_pubsub_message(self, room_id: int, payload: dict):
+        if payload["origin"] == self.worker_id:
+            return  # 내가 발행한 메시지는 이미 로컬에 전달함
+
+        await self._deliver(
+            message=ChatMessage(
+                id=payload["id"],
+                chat_room_id=room_id,
+                user_id=payload["user_id"],
+                content=payload["content"],
+                created_at=datetime.fromisoformat(payload["created_at"]),
+            )
+        )
+
+    # 방의 모든 ws 연결(모든 워커)에 메시지를 전파
     async def broadcast(self, websocket: WebSocket, content: str):
         # 지금 메시지를 보낸 user_id
         room_id, user_id = self._get_context(websocket=websocket)
 
-        # 새로운 메시지 DB에 저장
+        # id, created_at은 저장 전에 발급
         message = ChatMessage.create(room_id=room_id, user_id=user_id, content=content)
-        await self.chat_repo.save(message=message)
-
-        # 관리 중인 모든 ws 연결
-        for conn, (conn_room_id, conn_user_id) in self.connections.items():
-            if room_id == conn_room_id:
-                if conn_user_id == user_id:
-                    await self._send_my_message(websocket=conn, content=content)
-                else:
-                    await self._send_friend_message(websocket=conn, content=content)
-
-    def disconnect(self, websocket: WebSocket):
-        self.connections.pop(websocket)
+
+        # 1) 이 워커의 방 멤버에게 바로 전달
+        await self._deliver(message=message)
+
+        # 2) DB 저장은 버퍼에 모아서 일괄 처리(write-behind)
+        #    Redis 왕복보다 먼저 -> Redis 오류가 나도 이미 전달한 메시지는 저장됨
+        chat_message_writer.enqueue(message=message)
+
+        # 3) 최근 메시지 Stream에 추가 + 다른 워커의 방 멤버에게 전달(Redis 왕복 1번)
+        async with async_redis_client.pipeline(transaction=False) as pipe:
+            self.stream.append(pipe=pipe, message=message)
+            self.pubsub.publish(
+                pipe=pipe,
+                room_id=room_id,
+                payload={
+                    "origin": self.worker_id,
+                    "id": message.id,
+                    "user_id": user_id,
+                    "content": content,
+                    "created_at": message.created_at.isoformat(),
+                },
+            )
+            await pipe.execute()
+
+    async def disconnect(self, websocket: WebSocket):
+        conn = self.connections.remove(websocket=websocket)
+        if conn is None:
+            return  # 이미 정리됨(reaper)
+        await conn.stop_writer()
+
+        # 이 워커에서 방이 비면 구독 해제
+        if not self.connections.has_room(room_id=conn.room_id):
+            await self.pubsub.unsubscribe(room_id=conn.room_id)
+
+    async def close(self):
+        await self.reaper.close()
+        await self.pubsub.close()
+        await chat_message_writer.close()  # 남은 메시지 저장
 
 ws_connection_manager = WebSocketConnectionManager()
@@ -1,11 +1,33 @@
+import re
+import unicodedata
 from datetime import datetime
 
-from sqlalchemy import Column, Integer, Text, String, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, Text, String, DateTime, ForeignKey, UniqueConstraint, Index
 from sqlalchemy.orm import relationship, backref
 
 from config.database.orm import Base
 from user.models import User
 
+TAG_PATTERN = re.compile(r"#(\w+)")  # 한글/영문/숫자/_
+TAG_MAX_LENGTH = 50
+MAX_TAGS_PER_POST = 10
+
+
+# 태그 저장/조회 형식(NFC + 소문자)
+# post_tag.tag는 binary collation -> DB 비교도 이 값 그대로(#café와 #cafe는 다른 태그)
+def normalize_tag(tag: str) -> str:
+    return unicodedata.normalize("NFC", tag).lower()
+
+
+# 본문의 #태그 목록(중복 제거, 순서 유지)
+def extract_tags(content: str) -> list[str]:
+    # 결합 문자(e + ◌́)는 \w에 걸리지 않으므로 본문 전체를 먼저 NFC로
+    content = unicodedata.normalize("NFC", content)
+    tags = dict.fromkeys(
+        normalize_tag(tag) for tag in TAG_PATTERN.findall(content) if len(tag) <= TAG_MAX_LENGTH
+    )
+    return list(tags)[:MAX_TAGS_PER_POST]
+
 
 class Post(Base):
     __tablename__ = "feed_post"
@@ -17,17 +39,46 @@ class Post(Base):
     content = Column(Text, nullable=False)
     created_at = Column(DateTime, default=datetime.now, nullable=False)
 
+    __table_args__ = (
+        # 본문 검색용 전문(full-text) 인덱스
+        # ngram parser: 공백 단위가 아니라 n글자(ngram_token_size, 기본 2) 단위로 색인 -> 한국어 검색 가능
+        Index(
+            "ix_feed_post_content_fulltext",
+            "content",
+            mysql_prefix="FULLTEXT",
+            mysql_with_parser="ngram",
+        ),
+    )
+
     # ORM 관계 정의
     user = relationship(User, backref="posts")
+    tags = relationship("PostTag", cascade="all, delete-orphan")
 
     @property
     def image_static_path(self) -> str:
-        filename: str = self.image.split("/")[-1]
+        return self.get_static_path(image=self.image)
+
+    # 객체 없이 image 컬럼 값만으로 계산(목록 조회 fast path)
+    @staticmethod
+    def get_static_path(image: str) -> str:
+        filename: str = image.split("/")[-1]
         return f"http://127.0.0.1:8000/static/{filename}"
 
+    @property
+    def tag_names(self) -> set[str]:
+        return {t.tag for t in self.tags}
+
     @classmethod
     def create(cls, user_id: int, image: str, content: str):
-        return cls(user_id=user_id, image=image, content=content)
+        # 태그 목록 정렬 기준(created_at)을 게시글과 맞추기 위해 직접 지정
+        created_at = datetime.now()
+        return cls(
+            user_id=user_id,
+            image=image,
+            content=content,
+            created_at=created_at,
+            tags=[PostTag(tag=tag, created_at=created_at) for tag in extract_tags(content)],
+        )
 
     def update_content(self, content: str):
         # 욕설 필터링
@@ -36,6 +87,29 @@ class Post(Base):
 
         self.content = content
 
+        # 바뀐 태그만 추가/삭제(delete-orphan)
+        tags, current = extract_tags(content), self.tag_names
+        self.tags = [t for t in self.tags if t.tag in tags] + [
+            PostTag(tag=tag, created_at=self.created_at) for tag in tags if tag not in current
+        ]
+
+
+class PostTag(Base):
+    __tablename__ = "post_tag"
+
+    id = Column(Integer, primary_key=True)
+    post_id = Column(Integer, ForeignKey("feed_post.id"), nullable=False)
+    # 기본 collation(대소문자/악센트 무시)이면 extract_tags에서 다르게 본 태그가 unique key에서 충돌
+    tag = Column(String(TAG_MAX_LENGTH, collation="utf8mb4_bin"), nullable=False)
+    # 게시글 작성 시각(태그별 최신순 조회를 인덱스만으로 처리)
+    created_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("post_id", "tag", name="uq_post_tag_post_tag"),
+        # 태그별 게시글 목록: WHERE tag = ? AND (created_at, post_id) < cursor -> 인덱스 범위 조회
+        Index("ix_post_tag_tag_created_post", "tag", "created_at", "post_id"),
+    )
+
 
 class PostComment(Base):
     __tablename__ = "post_comment"
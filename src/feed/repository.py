@@ -1,11 +1,18 @@
+from datetime import datetime
+
 from fastapi import Depends
-from sqlalchemy.orm import Session, joinedload, contains_eager
+from sqlalchemy import and_, func, or_
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.orm import Session, contains_eager
 
 from config.database.connection import get_session
-from feed.models import Post, PostComment, PostLike
+from config.pagination import Cursor, ScoreCursor
+from config.tracing import traced
+from feed.models import Post, PostComment, PostLike, PostTag
 
 
 class PostRepository:
+    @traced("PostRepository")
     def __init__(self, session: Session = Depends(get_session)):
         self.session = session
 
@@ -16,6 +23,61 @@ class PostRepository:
     def get_posts(self):
         return self.session.query(Post).order_by(Post.created_at.desc()).all()
 
+    # 목록 ETag용 (게시글 수, 최대 id) -> 추가/삭제가 있으면 바뀜(PK 인덱스만 사용)
+    def get_posts_version(self) -> tuple[int, int | None]:
+        return self.session.query(func.count(Post.id), func.max(Post.id)).one()
+
+    # 목록에 필요한 컬럼만 (id, image) 튜플로 조회(ORM 객체 생성 X)
+    def get_post_rows(self) -> list[tuple[int, str]]:
+        return (
+            self.session.query(Post.id, Post.image)
+            .order_by(Post.created_at.desc())
+            .all()
+        )
+
+    # 본문 검색(FULLTEXT 인덱스) -> (id, image, content, created_at, score) 관련도 순
+    # before: 이전 페이지 마지막 결과의 (score, id)
+    def search_post_rows(
+        self, query: str, limit: int, before: ScoreCursor | None = None
+    ) -> list[tuple]:
+        score = match(Post.content, against=query).in_natural_language_mode()
+        q = self.session.query(
+            Post.id, Post.image, Post.content, Post.created_at, score.label("score")
+        ).filter(score)
+        if before:
+            q = q.filter(
+                or_(score < before.score, and_(score == before.score, Post.id < before.id))
+            )
+        return q.order_by(score.desc(), Post.id.desc()).limit(limit).all()
+
+    # 태그별 게시글 (id, image, created_at) 최신순
+    # post_tag (tag, created_at, post_id) 인덱스 범위 조회 후 PK로 feed_post join
+    def get_tag_post_rows(
+        self, tag: str, limit: int, before: Cursor | None = None
+    ) -> list[tuple[int, str, datetime]]:
+        q = (
+            self.session.query(Post.id, Post.image, PostTag.created_at)
+            .select_from(PostTag)
+            .join(Post, Post.id == PostTag.post_id)
+            .filter(PostTag.tag == tag)
+        )
+        if before:
+            q = q.filter(
+                or_(
+                    PostTag.created_at < before.created_at,
+                    and_(PostTag.created_at == before.created_at, PostTag.post_id < before.id),
+                )
+            )
+        return (
+            q.order_by(PostTag.created_at.desc(), PostTag.post_id.desc())
+            .limit(limit)
+            .all()
+        )
+
+    # Redis(tags:count)를 쓸 수 없을 때만 사용(tag 인덱스 범위 카운트)
+    def count_tag_posts(self, tag: str) -> int:
+        return self.session.query(func.count(PostTag.id)).filter(PostTag.tag == tag).scalar()
+
     def get_post(self, post_id: int) -> Post | None:
         return self.session.query(Post).filter_by(id=post_id).first()
 
@@ -26,7 +88,7 @@ class PostRepository:
             .join(Post.comments)
             .filter(PostComment.parent_id == None)  # 부모인 댓글만
             .options(
-                joinedload(Post.user),
+                # 작성자 정보는 UserLoader가 IN 쿼리로 한 번에 조회
                 contains_eager(Post.comments).joinedload(PostComment.replies),
             ).first()
         )
@@ -43,6 +105,7 @@ class PostRepository:
 
 
 class PostCommentRepository:
+    @traced("PostCommentRepository")
     def __init__(self, session: Session = Depends(get_session)):
         self.session = session
 
@@ -58,6 +121,7 @@ class PostCommentRepository:
         self.session.commit()
 
 class PostLikeRepository:
+    @traced("PostLikeRepository")
     def __init__(self, session: Session = Depends(get_session)):
         self.session = session
 
@@ -2,7 +2,8 @@ from datetime import datetime
 
 from pydantic import BaseModel, ConfigDict
 
-from feed.models import Post
+from feed.models import Post, PostComment
+from user.service.user_loader import UserLoader
 
 
 class PostResponse(BaseModel):
@@ -39,6 +40,77 @@ class PostListResponse(BaseModel):
             posts=[PostBriefResponse.build(post=p) for p in posts]
         )
 
+    # (id, image) row에서 바로 응답 dict 생성(모델 인스턴스 X)
+    @staticmethod
+    def build_content(rows: list[tuple[int, str]]) -> dict:
+        get_static_path = Post.get_static_path
+        return {
+            "posts": [
+                {"id": post_id, "image": get_static_path(image)}
+                for post_id, image in rows
+            ]
+        }
+
+
+class TagPostListResponse(BaseModel):
+    tag: str
+    count: int  # 태그가 달린 전체 게시글 수
+    posts: list[PostBriefResponse]  # 최신순
+    next_cursor: str | None
+
+    # (id, image, created_at) row에서 바로 응답 dict 생성
+    @staticmethod
+    def build_content(tag: str, count: int, rows: list[tuple], next_cursor: str | None) -> dict:
+        get_static_path = Post.get_static_path
+        return {
+            "tag": tag,
+            "count": count,
+            "posts": [
+                {"id": post_id, "image": get_static_path(image)} for post_id, image, _ in rows
+            ],
+            "next_cursor": next_cursor,
+        }
+
+
+class TrendingTagResponse(BaseModel):
+    tag: str
+    count: int  # 최근 24시간 동안 태그가 달린 게시글 작성/수정 수
+
+
+class TrendingTagListResponse(BaseModel):
+    tags: list[TrendingTagResponse]
+
+
+class PostSearchItemResponse(BaseModel):
+    id: int
+    image: str
+    content: str
+    created_at: datetime
+    score: float  # 관련도(클수록 먼저)
+
+
+class PostSearchResponse(BaseModel):
+    posts: list[PostSearchItemResponse]
+    next_cursor: str | None
+
+    # (id, image, content, created_at, score) row에서 바로 응답 dict 생성
+    @staticmethod
+    def build_content(rows: list[tuple], next_cursor: str | None) -> dict:
+        get_static_path = Post.get_static_path
+        return {
+            "posts": [
+                {
+                    "id": post_id,
+                    "image": get_static_path(image),
+                    "content": content,
+                    "created_at": created_at,
+                    "score": score,
+                }
+                for post_id, image, content, created_at, score in rows
+            ],
+            "next_cursor": next_cursor,
+        }
+
 
 class PostUserResponse(BaseModel):
     id: int
@@ -47,6 +119,12 @@ class PostUserResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+def _user_content(user) -> dict | None:
+    if user is None:
+        return None
+    return {"id": user.id, "username": user.username}
+
+
 class PostDetailResponse(BaseModel):
     id: int
     image: str
@@ -57,6 +135,49 @@ class PostDetailResponse(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+    @staticmethod
+    def _load_users(post: Post, user_loader: UserLoader) -> None:
+        # 게시글 작성자 + 댓글/대댓글 작성자를 모아서 한 번에 조회
+        user_loader.add(post.user_id)
+        for comment in post.comments:
+            user_loader.add(comment.user_id)
+            for reply in comment.replies:
+                user_loader.add(reply.user_id)
+        user_loader.dispatch()
+
+    @classmethod
+    def build(cls, post: Post, user_loader: UserLoader):
+        cls._load_users(post=post, user_loader=user_loader)
+        return cls(
+            id=post.id,
+            image=post.image,
+            content=post.content,
+            created_at=post.created_at,
+            user=PostUserResponse.model_validate(
+                obj=user_loader.get(post.user_id)
+            ),
+            comments=[
+                PostCommentResponse.build(comment=c, user_loader=user_loader)
+                for c in post.comments
+            ],
+        )
+
+    # build()와 같은 구조의 dict를 바로 생성(댓글 수천 개에서도 모델 인스턴스 X)
+    @classmethod
+    def build_content(cls, post: Post, user_loader: UserLoader) -> dict:
+        cls._load_users(post=post, user_loader=user_loader)
+        return {
+            "id": post.id,
+            "image": post.image,
+            "content": post.content,
+            "created_at": post.created_at,
+            "user": _user_content(user_loader.get(post.user_id)),
+            "comments": [
+                PostCommentResponse.build_content(comment=c, user_loader=user_loader)
+                for c in post.comments
+            ],
+        }
+
 
 class PostCommentResponse(BaseModel):
     id: int
@@ -66,9 +187,43 @@ class PostCommentResponse(BaseModel):
     parent_id: int | None
     replies: "list[PostCommentResponse]"  # 대댓글
     created_at: datetime
+    author: PostUserResponse | None = None  # 탈퇴한 사용자는 None
 
     model_config = ConfigDict(from_attributes=True)
 
+    @classmethod
+    def build(cls, comment: PostComment, user_loader: UserLoader):
+        author = user_loader.get(comment.user_id)
+        return cls(
+            id=comment.id,
+            post_id=comment.post_id,
+            user_id=comment.user_id,
+            content=comment.content,
+            parent_id=comment.parent_id,
+            replies=[
+                cls.build(comment=r, user_loader=user_loader)
+                for r in comment.replies
+            ],
+            created_at=comment.created_at,
+            author=PostUserResponse.model_validate(obj=author) if author else None,
+        )
+
+    @classmethod
+    def build_content(cls, comment: PostComment, user_loader: UserLoader) -> dict:
+        return {
+            "id": comment.id,
+            "post_id": comment.post_id,
+            "user_id": comment.user_id,
+            "content": comment.content,
+            "parent_id": comment.parent_id,
+            "replies": [
+                cls.build_content(comment=r, user_loader=user_loader)
+                for r in comment.replies
+            ],
+            "created_at": comment.created_at,
+            "author": _user_content(user_loader.get(comment.user_id)),
+        }
+
 class PostLikeResponse(BaseModel):
     id: int
     user_id: int
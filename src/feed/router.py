@@ -2,17 +2,42 @@ import os
 import shutil
 import uuid
 
-from fastapi import APIRouter, status, Depends, UploadFile, File, Form, Body, HTTPException
+from fastapi import APIRouter, status, Depends, UploadFile, File, Form, Body, HTTPException, Query, Request
 from sqlalchemy.exc import IntegrityError
 from starlette.responses import JSONResponse
 
-from feed.models import Post, PostComment, PostLike
+from config.http_cache import (
+    POSTS_CACHE_CONTROL,
+    POST_DETAIL_CACHE_CONTROL,
+    is_not_modified,
+    make_etag,
+    not_modified,
+    set_cache_headers,
+)
+from config.pagination import decode_cursor, decode_score_cursor, encode_cursor, encode_score_cursor
+from config.profiling import ProfiledRoute
+from config.serialization import json_response
+from config.tracing import span
+from feed.models import Post, PostComment, PostLike, normalize_tag
 from feed.repository import PostRepository, PostCommentRepository, PostLikeRepository
 from feed.request import PostCommentCreateRequestBody
-from feed.response import PostResponse, PostListResponse, PostCommentResponse, PostDetailResponse, PostLikeResponse
+from feed.response import (
+    PostResponse,
+    PostListResponse,
+    PostCommentResponse,
+    PostDetailResponse,
+    PostLikeResponse,
+    PostSearchResponse,
+    TagPostListResponse,
+    TrendingTagListResponse,
+)
+from feed.tags import TRENDING_MAX_LIMIT, tag_counter
+from feed.versions import post_versions
 from user.service.authentication import authenticate
+from user.service.user_loader import UserLoader
 
-router = APIRouter(tags=["Feed"])
+# 동기 핸들러도 요청 프로파일에 포함
+router = APIRouter(tags=["Feed"], route_class=ProfiledRoute)
 
 # 1) Post 생성
 @router.post(
@@ -46,6 +71,7 @@ def create_post_handler(
             detail="User does not exist",
         )
 
+    tag_counter.update(added=new_post.tag_names)
     return PostResponse.build(post=new_post)
 
 
@@ -56,12 +82,89 @@ def create_post_handler(
     status_code=status.HTTP_200_OK,
     response_model=PostListResponse,
 )
-def get_posts_handler(post_repo: PostRepository = Depends()):
+def get_posts_handler(request: Request, post_repo: PostRepository = Depends()):
+    # 0) 목록이 바뀌지 않았으면 304(목록 조회/직렬화 X)
+    count, max_id = post_repo.get_posts_version()
+    etag = make_etag("posts", count, max_id or 0)
+    if is_not_modified(request, etag):
+        return not_modified(etag, POSTS_CACHE_CONTROL)
+
     # 1) 전체 post 조회(created_at 역순) => 최신 게시글 순서대로 조회
-    posts = post_repo.get_posts()
+    rows = post_repo.get_post_rows()
+
+    # 2) row에서 바로 JSON 생성
+    response = json_response(PostListResponse.build_content(rows=rows))
+    return set_cache_headers(response, etag, POSTS_CACHE_CONTROL)
+
+
+# 10) Post 검색(본문, 관련도 순)
+#   - /posts/{post_id}보다 먼저 등록해야 함
+#   - ngram 토큰(2글자)보다 짧은 검색어는 결과가 없으므로 2글자 이상
+@router.get(
+    "/posts/search",
+    status_code=status.HTTP_200_OK,
+    response_model=PostSearchResponse,
+)
+def search_posts_handler(
+    q: str = Query(..., min_length=2, max_length=100),
+    cursor: str | None = None,
+    size: int = Query(20, ge=1, le=50),
+    post_repo: PostRepository = Depends(),
+):
+    before = decode_score_cursor(cursor) if cursor else None  # ValueError -> 400
+
+    # 1개 더 조회해서 다음 페이지 여부 확인
+    rows = post_repo.search_post_rows(query=q, limit=size + 1, before=before)
+    next_cursor = None
+    if len(rows) > size:
+        rows = rows[:size]
+        last = rows[-1]
+        next_cursor = encode_score_cursor(last.score, last.id)
+    return json_response(PostSearchResponse.build_content(rows=rows, next_cursor=next_cursor))
+
 
-    # 2) 그대로 반환
-    return PostListResponse.build(posts=posts)
+# 11) 태그별 게시글 목록(최신순)
+@router.get(
+    "/tags/{tag}/posts",
+    status_code=status.HTTP_200_OK,
+    response_model=TagPostListResponse,
+)
+def get_tag_posts_handler(
+    tag: str,
+    cursor: str | None = None,
+    size: int = Query(20, ge=1, le=50),
+    post_repo: PostRepository = Depends(),
+):
+    tag = normalize_tag(tag)
+    before = decode_cursor(cursor) if cursor else None  # ValueError -> 400
+
+    rows = post_repo.get_tag_post_rows(tag=tag, limit=size + 1, before=before)
+    next_cursor = None
+    if len(rows) > size:
+        rows = rows[:size]
+        last = rows[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    if (count := tag_counter.get_count(tag=tag)) is None:
+        count = post_repo.count_tag_posts(tag=tag)
+    return json_response(
+        TagPostListResponse.build_content(
+            tag=tag, count=count, rows=rows, next_cursor=next_cursor
+        )
+    )
+
+
+# 12) 인기 태그(최근 24시간)
+@router.get(
+    "/tags/trending",
+    status_code=status.HTTP_200_OK,
+    response_model=TrendingTagListResponse,
+)
+def get_trending_tags_handler(limit: int = Query(10, ge=1, le=TRENDING_MAX_LIMIT)):
+    return json_response({
+        "tags": [
+            {"tag": tag, "count": count} for tag, count in tag_counter.get_trending(limit=limit)
+        ]
+    })
 
 
 # 5) Post 상세 조회
@@ -73,14 +176,26 @@ def get_posts_handler(post_repo: PostRepository = Depends()):
 )
 def get_post_handler(
     post_id: int,
+    request: Request,
     post_repo: PostRepository = Depends(),
+    user_loader: UserLoader = Depends(),
 ):
-    if not (post := post_repo.get_post_detail(post_id=post_id)):
+    # 상세 조회(댓글 join) 전에 버전만 비교
+    etag = make_etag("post", post_id, post_versions.get(post_id=post_id))
+    if is_not_modified(request, etag):
+        return not_modified(etag, POST_DETAIL_CACHE_CONTROL)
+
+    with span("post.detail.query"):
+        post = post_repo.get_post_detail(post_id=post_id)
+    if not post:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Post does not exist",
         )
-    return PostDetailResponse.model_validate(obj=post)
+    with span("post.detail.build"):
+        content = PostDetailResponse.build_content(post=post, user_loader=user_loader)
+    response = json_response(content)
+    return set_cache_headers(response, etag, POST_DETAIL_CACHE_CONTROL)
 
 
 # 3) Post 수정(U)
@@ -109,8 +224,11 @@ def update_post_handler(
         )
 
     # 2) Post 업데이트(content)
+    old_tags = post.tag_names
     post.update_content(content=content)
     post_repo.save(post=post)
+    post_versions.bump(post_id=post.id)
+    tag_counter.update(added=post.tag_names - old_tags, removed=old_tags - post.tag_names)
     return PostResponse.build(post=post)
 
 # 4) Post 삭제(D)
@@ -142,7 +260,10 @@ def delete_post_handler(
         )
 
     # 2. 있으면 삭제
+    tags = post.tag_names
     post_repo.delete(post=post)
+    post_versions.delete(post_id=post_id)
+    tag_counter.update(removed=tags)
 
 
 # 6) Post 댓글 작성
@@ -193,6 +314,7 @@ def create_comment_handler(
         parent_id=body.parent_id,
     )
     comment_repo.save(comment=new_comment)
+    post_versions.bump(post_id=post_id)
     return PostCommentResponse.model_validate(obj=new_comment)
 
 # 8) Post 좋아요
@@ -254,3 +376,4 @@ def delete_comment_handler(
         )
 
     comment_repo.delete(comment=comment)
+    post_versions.bump(post_id=comment.post_id)
@@ -0,0 +1,105 @@
+# 태그별 게시글 수 / 인기 태그(Redis sorted set)
+# - tags:count: 태그별 게시글 수(작성/수정/삭제 시 증감) -> post_tag 테이블 집계 X
+# - tags:trending:{시각}: 시간 단위 버킷(태그가 달린 게시글 작성/수정 횟수), window 이후 만료
+#   인기 태그 = 최근 window 시간 버킷 합(ZUNIONSTORE 결과를 잠깐 캐시)
+# - DB 커밋 이후에 반영(Redis 실패/초기화 시 commands/rebuild_tag_counts로 다시 계산)
+import logging
+from datetime import datetime, timedelta
+
+from redis import Redis, RedisError
+
+from config.cache import redis_client
+
+logger = logging.getLogger(__name__)
+COUNT_KEY = "tags:count"
+BUCKET_KEY = "tags:trending:{}"
+TRENDING_CACHE_KEY = "tags:trending:top:{}"
+TRENDING_CACHE_TTL = 60  # 초
+TRENDING_WINDOW_HOURS = 24
+TRENDING_MAX_LIMIT = 50
+
+
+class TagCounter:
+    def __init__(self, client: Redis, window_hours: int = TRENDING_WINDOW_HOURS):
+        self.client = client
+        self.window_hours = window_hours
+        self._last_trending: list[tuple[str, int]] = []
+
+    @staticmethod
+    def get_bucket_key(at: datetime) -> str:
+        return BUCKET_KEY.format(at.strftime("%Y%m%d%H"))
+
+    def add(self, tags: set[str]) -> None:
+        if not tags:
+            return
+        bucket = self.get_bucket_key(datetime.now())
+        with self.client.pipeline(transaction=False) as pipe:
+            for tag in tags:
+                pipe.zincrby(COUNT_KEY, 1, tag)
+                pipe.zincrby(bucket, 1, tag)
+            pipe.expire(bucket, timedelta(hours=self.window_hours + 1))
+            pipe.execute()
+
+    def remove(self, tags: set[str]) -> None:
+        if not tags:
+            return
+        with self.client.pipeline(transaction=False) as pipe:
+            for tag in tags:
+                pipe.zincrby(COUNT_KEY, -1, tag)
+            pipe.zremrangebyscore(COUNT_KEY, "-inf", 0)  # 게시글이 없는 태그
+            pipe.execute()
+
+    # 게시글 작성/수정/삭제 후 호출
+    # 이미 커밋된 요청이 Redis 오류로 실패(-> 클라이언트 재시도로 중복 작성)하지 않도록 로그만 남김
+    def update(self, added: set[str] = frozenset(), removed: set[str] = frozenset()) -> None:
+        try:
+            self.add(tags=added)
+            self.remove(tags=removed)
+        except RedisError:
+            logger.exception(
+                "Failed to update tag counts (run commands.rebuild_tag_counts to repair)"
+            )
+
+    # Redis 오류 시 None -> 호출하는 쪽에서 DB로 계산
+    def get_count(self, tag: str) -> int | None:
+        try:
+            return int(self.client.zscore(COUNT_KEY, tag) or 0)
+        except RedisError:
+            logger.warning("Failed to read tag count", exc_info=True)
+            return None
+
+    # Redis 오류 시 이 프로세스가 마지막으로 조회한 결과(없으면 빈 목록)
+    def get_trending(self, limit: int) -> list[tuple[str, int]]:
+        try:
+            # limit과 관계없이 최대 개수로 조회해서 마지막 결과로 보관
+            self._last_trending = self._get_trending(limit=TRENDING_MAX_LIMIT)
+        except RedisError:
+            logger.warning("Failed to read trending tags", exc_info=True)
+        return self._last_trending[:limit]
+
+    def _get_trending(self, limit: int) -> list[tuple[str, int]]:
+        cache_key = TRENDING_CACHE_KEY.format(self.window_hours)
+        if not self.client.exists(cache_key):
+            now = datetime.now()
+            buckets = [
+                self.get_bucket_key(now - timedelta(hours=h)) for h in range(self.window_hours)
+            ]
+            with self.client.pipeline(transaction=False) as pipe:
+                pipe.zunionstore(cache_key, buckets)
+                pipe.expire(cache_key, TRENDING_CACHE_TTL)
+                pipe.execute()
+        return [
+            (tag, int(score))
+            for tag, score in self.client.zrevrange(cache_key, 0, limit - 1, withscores=True)
+        ]
+
+    # tag -> 게시글 수 전체 교체
+    def rebuild(self, counts: dict[str, int]) -> None:
+        with self.client.pipeline() as pipe:
+            pipe.delete(COUNT_KEY)
+            if counts:
+                pipe.zadd(COUNT_KEY, counts)
+            pipe.execute()
+
+
+tag_counter = TagCounter(client=redis_client)
@@ -0,0 +1,51 @@
+# 게시글 상세 응답 버전(ETag용)
+# - 키가 없으면 시각 기반 값으로 새로 만듦 -> 이전 ETag와 겹치지 않음
+# - 게시글 수정, 댓글 작성/삭제 시 키를 지워서 다음 조회에서 새 버전 발급
+# - 조회만으로 키가 생기므로(없는 게시글 포함) 항상 TTL을 둠 -> 만료돼도 새 버전으로 재검증될 뿐 안전
+# - DB 커밋 이후에 바꿔야 함(버전을 먼저 읽고 새 본문을 받는 건 다음 요청에서 재검증될 뿐 안전)
+# - Redis 오류 시: 조회는 매번 새 버전(304 없이 전체 응답), 변경은 로그만 남김(커밋된 요청을 실패시키지 않음)
+import logging
+import time
+
+from redis import Redis, RedisError
+
+from config.cache import redis_client
+
+logger = logging.getLogger(__name__)
+
+VERSION_TTL_S = 24 * 60 * 60
+
+
+class PostVersionStore:
+    def __init__(self, client: Redis, ttl: int = VERSION_TTL_S):
+        self.client = client
+        self.ttl = ttl
+
+    @staticmethod
+    def get_key(post_id: int) -> str:
+        return f"posts:{post_id}:version"
+
+    def get(self, post_id: int) -> int:
+        key = self.get_key(post_id)
+        try:
+            if (version := self.client.get(key)) is None:
+                self.client.set(key, time.time_ns(), nx=True, ex=self.ttl)
+                version = self.client.get(key) or time.time_ns()  # 그 사이 만료/삭제된 경우
+        except RedisError:
+            logger.warning("Failed to read version of post %d", post_id, exc_info=True)
+            return time.time_ns()  # 이전 ETag와 겹치지 않는 값
+        return int(version)
+
+    # INCR은 키가 만료된 뒤 1부터 다시 시작해서 이전 ETag와 겹칠 수 있음 -> 지우고 새로 발급
+    def bump(self, post_id: int) -> None:
+        self.delete(post_id=post_id)
+
+    def delete(self, post_id: int) -> None:
+        try:
+            self.client.delete(self.get_key(post_id))
+        except RedisError:
+            # 키는 TTL 후 만료 -> 그때까지는 이전 ETag로 304가 나갈 수 있음
+            logger.exception("Failed to invalidate version of post %d", post_id)
+
+
+post_versions = PostVersionStore(client=redis_client)
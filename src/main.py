@@ -1,42 +1,81 @@
 import asyncio
+import hmac
+import importlib
 import time
 
-import requests
 import httpx
-
-
-from fastapi import FastAPI, status, Depends
+from fastapi import APIRouter, FastAPI, HTTPException, Request, status, Depends
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
-from starlette.staticfiles import StaticFiles
+from fastapi.responses import JSONResponse, PlainTextResponse
 from starlette.websockets import WebSocket, WebSocketDisconnect
 
+from config import settings, UserRouterMode
+from config.compression import CompressionMiddleware, PrecompressedStaticFiles
+from config.instrumentation import MetricsMiddleware
+from config.metrics import render_text
+from config.profiling import ProfilingMiddleware
+from config.tracing import TracingMiddleware, create_exporter
+from config.http import get_http_client
+from config.lifespan import lifespan
+from config.serialization import FastJSONResponse
 from config.websocket import WebSocketConnectionManager, ws_connection_manager
 from feed import router as feed_router
-from user.api import router as user_router
 
-app = FastAPI()
-app.mount("/static", StaticFiles(directory="feed/posts"))
-app.include_router(user_router.router)
-app.include_router(feed_router.router)
+router = APIRouter()
+
+
+def create_app() -> FastAPI:
+    # 기본 응답도 orjson으로 인코딩
+    app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
+    app.mount("/static", PrecompressedStaticFiles(directory="feed/posts"))
+    # 가장 안쪽(inline 프로파일도 압축되도록 Compression보다 먼저 추가)
+    app.add_middleware(
+        ProfilingMiddleware,
+        token=settings.profiling_token,
+        directory=settings.profiling_dir,
+        interval=settings.profiling_interval_s,
+        sample_every=settings.profiling_sample_every,
+        keep_slowest=settings.profiling_keep_slowest,
+    )
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.compression_min_size)
+    app.state.span_exporter = create_exporter()
+    app.add_middleware(
+        TracingMiddleware,
+        exporter=app.state.span_exporter,
+        sample_rate=settings.trace_sample_rate,
+        trust_parent_sampling=settings.trace_trust_parent_sampling,
+    )
+    app.add_middleware(MetricsMiddleware)  # 가장 바깥(압축 시간까지 포함)
+
+    # USER_ROUTER 환경변수로 동기/비동기 user 라우터 중 하나를 선택
+    # (선택한 라우터만 import)
+    match settings.user_router:
+        case UserRouterMode.ASYNC:
+            user_router = importlib.import_module("user.api.router_async")
+        case _:
+            user_router = importlib.import_module("user.api.router")
+    app.include_router(user_router.router)
+    app.include_router(feed_router.router)
+    app.include_router(router)
 
+    app.add_exception_handler(RequestValidationError, validation_exception_handler)
+    app.add_exception_handler(ValueError, value_error_handler)
+    app.add_exception_handler(httpx.HTTPStatusError, httpx_status_error_handler)
+    return app
 
 
-@app.exception_handler(RequestValidationError)
 def validation_exception_handler(request, exc: RequestValidationError):
     return JSONResponse(
         content={"error": exc.errors()[0]["msg"]},
         status_code=status.HTTP_400_BAD_REQUEST,
     )
 
-@app.exception_handler(ValueError)
 def value_error_handler(request, exc):
     return JSONResponse(
         content={"error": str(exc)},
         status_code=status.HTTP_400_BAD_REQUEST,
     )
 
-@app.exception_handler(httpx.HTTPStatusError)
 def httpx_status_error_handler(request, exc):
     return JSONResponse(
         content={"error": str(exc)},
@@ -44,15 +83,39 @@ def httpx_status_error_handler(request, exc):
     )
 
 
-@app.get("/")
+@router.get("/")
 def health_check_handler():
     return {"ping": "pong"}
 
+
+# 내부용 메트릭(라우트, DB 풀 상태, 트래픽 양 포함) -> 허용 IP 또는 토큰이 있는 요청만
+def verify_metrics_access(request: Request):
+    if request.client and request.client.host in settings.metrics_allowed_hosts:
+        return
+
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if (
+        settings.metrics_token
+        and scheme.lower() == "bearer"
+        and hmac.compare_digest(token.encode(), settings.metrics_token.encode())
+    ):
+        return
+    raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+
+
+# Prometheus text format
+# 스레드풀 사용량은 이벤트 루프에서 조회해야 하므로 async
+@router.get("/metrics", include_in_schema=False, dependencies=[Depends(verify_metrics_access)])
+async def metrics_handler():
+    return PlainTextResponse(render_text(), media_type="text/plain; version=0.0.4")
+
 #################################
 
 
-@app.get("/sync")
+@router.get("/sync")
 def sync_handler():
+    import requests  # 이 예제에서만 사용 -> 서버 시작 시 import 비용 X
+
     # 1개 호출 -> 0.5x초
     # 3개 호출 -> 1.62초
     # n개 호출 -> (0.5 * n)초
@@ -73,8 +136,8 @@ def sync_handler():
 
 
 
-@app.get("/async")
-async def async_handler():
+@router.get("/async")
+async def async_handler(client: httpx.AsyncClient = Depends(get_http_client)):
     # 1개 -> 0.58초
     # 3개 -> 0.58초
     start_time = time.perf_counter()
@@ -85,34 +148,43 @@ async def async_handler():
         "https://jsonplaceholder.typicode.com/posts",
     ]
 
-    async with httpx.AsyncClient() as client:
-        tasks = []
-        for url in urls:
-            tasks.append(client.get(url))
-        await asyncio.gather(*tasks)
+    tasks = []
+    for url in urls:
+        tasks.append(client.get(url))
+    await asyncio.gather(*tasks)
 
     end_time = time.perf_counter()
     return {
         "duration": end_time - start_time,
     }
 
-@app.websocket(
+@router.websocket(
     "/ws/rooms/{room_id}/{user_id}"
 )
 async def websocket_handler(
     room_id: int,
     user_id: int,
     websocket: WebSocket,  # 사용자의 웹소켓 연결(connection)
+    last_id: int | None = None,  # 재접속 시 마지막으로 받은 메시지 id
     connection_manager: WebSocketConnectionManager = Depends(ws_connection_manager),
 ):
-    await connection_manager.connect(
-        websocket=websocket, room_id=room_id, user_id=user_id
-    )
+    if not await connection_manager.connect(
+        websocket=websocket, room_id=room_id, user_id=user_id, last_id=last_id
+    ):
+        return  # 연결 수 제한 초과
 
     try:
         while True:
-            content = await websocket.receive_text()
-            await connection_manager.broadcast(websocket=websocket, content=content)
+            data = await websocket.receive_text()
+            await connection_manager.receive(websocket=websocket, data=data)
 
     except WebSocketDisconnect:
-        connection_manager.disconnect(websocket=websocket)  # 클라이언트 연결 목록에서 제거
+        pass
+
+    finally:
+        # 연결 종료뿐 아니라 예외(Redis 오류, 취소 등)에도 연결 목록에서 제거
+        await connection_manager.disconnect(websocket=websocket)
+
+
+# uvicorn main:app (또는 uvicorn --factory main:create_app)
+app = create_app()
@@ -0,0 +1,142 @@
+import json
+from datetime import datetime
+
+import pytest
+from fastapi import status
+from starlette.websockets import WebSocketDisconnect
+
+from chat.connection import ChatConnection, CoalescedFrames
+from chat.models import ChatMessage, ChatRoom
+from chat.persistence import chat_message_writer
+from chat.protocol import Protocol, message_event
+from chat.stream import ChatMessageStream
+from config import WebSocketOverflowPolicy, settings
+from config.cache import redis_client
+
+
+@pytest.fixture
+def chat_room(async_client, test_async_session, monkeypatch):
+    async def create():
+        room = ChatRoom(name="test_room")
+        test_async_session.add(room)
+        await test_async_session.commit()
+        return room
+
+    room = async_client.portal.call(create)
+    # 테이블을 다시 만들면 방 id가 재사용됨 -> 이전 실행에서 남은 Stream 삭제
+    keys = (ChatMessageStream.get_key(room.id), ChatMessageStream.get_warm_key(room.id))
+    redis_client.delete(*keys)
+    # DB 저장(write-behind)이 웹소켓 처리와 같은 테스트 커넥션을 동시에 쓰지 않도록 flush 미룸
+    monkeypatch.setattr(chat_message_writer, "flush_interval", 60)
+    yield room
+    chat_message_writer.buffer.clear()  # rollback된 트랜잭션 밖에서 저장되지 않도록
+    redis_client.delete(*keys)
+
+
+# batch 프레임은 이벤트 단위로 풀어서 반환
+def receive_events(websocket, count: int) -> list[dict]:
+    events = []
+    while len(events) < count:
+        event = websocket.receive_json()
+        events.extend(event["e"] if event["t"] == "batch" else [event])
+    return events
+
+
+def test_coalesce_queue_stays_bounded_for_stalled_consumer():
+    # given: writer가 멈춘(읽지 않는) 클라이언트
+    conn = ChatConnection(
+        websocket=None,
+        room_id=1,
+        user_id=1,
+        protocol=Protocol.JSON,
+        max_queue_size=8,
+        overflow_policy=WebSocketOverflowPolicy.COALESCE,
+    )
+
+    # when
+    for i in range(1_000):
+        conn.send(
+            message_event(
+                ChatMessage(
+                    id=i, chat_room_id=1, user_id=2, content=f"m{i}", created_at=datetime.now()
+                )
+            )
+        )
+
+    # then
+    frames = conn._take_frames(limit=10_000)
+    assert len(frames) <= 2 * conn.max_queue_size
+    assert '"c":"m999"' in frames[-1]  # 최신 프레임은 남음
+    assert not conn.queue
+
+
+def test_coalesced_frames_are_sent_in_bounded_batches():
+    # given
+    conn = ChatConnection(websocket=None, room_id=1, user_id=1, protocol=Protocol.JSON)
+    conn.queue.append(CoalescedFrames(frames=[f'"{i}"' for i in range(100)]))
+
+    # when
+    first = conn._take_frames(limit=64)
+    second = conn._take_frames(limit=64)
+
+    # then
+    assert len(first) == 64
+    assert len(second) == 36
+    assert not conn.queue
+
+
+def test_websocket_broadcast_history_and_replay(async_client, test_async_user, chat_room):
+    # given
+    url = f"/ws/rooms/{chat_room.id}/{test_async_user.id}"
+
+    # when
+    with async_client.websocket_connect(url, subprotocols=[Protocol.JSON]) as websocket:
+        entered = websocket.receive_json()
+        for content in ("first", "second", "third"):
+            websocket.send_text(content)
+        sent = receive_events(websocket, count=3)
+
+        # broadcast가 끝난 뒤 처리됨(수신 루프는 순서대로 처리)
+        websocket.send_text(json.dumps({"type": "history"}))
+        history = websocket.receive_json()
+
+    with async_client.websocket_connect(
+        f"{url}?last_id={sent[0]['id']}", subprotocols=[Protocol.JSON]
+    ) as websocket:
+        replay = websocket.receive_json()
+
+    # then
+    assert entered == {"v": 1, "t": "history", "m": [], "n": None}
+    assert [(e["t"], e["u"], e["c"]) for e in sent] == [
+        ("msg", test_async_user.id, "first"),
+        ("msg", test_async_user.id, "second"),
+        ("msg", test_async_user.id, "third"),
+    ]
+    assert history["t"] == "history"
+    assert [m["id"] for m in history["m"]] == [e["id"] for e in sent]  # 오래된 순
+    assert replay["t"] == "replay"
+    assert [m["c"] for m in replay["m"]] == ["second", "third"]
+    assert replay["more"] is False
+
+
+def test_websocket_rejects_connection_over_room_limit(
+    async_client, test_async_user, chat_room, monkeypatch
+):
+    # given
+    monkeypatch.setattr(settings, "ws_max_connections_per_room", 1)
+    url = f"/ws/rooms/{chat_room.id}/{test_async_user.id}"
+
+    with async_client.websocket_connect(url, subprotocols=[Protocol.JSON]) as websocket:
+        websocket.receive_json()
+
+        # when
+        with pytest.raises(WebSocketDisconnect) as exc_info:
+            with async_client.websocket_connect(url, subprotocols=[Protocol.JSON]):
+                pass
+
+        # then
+        assert exc_info.value.code == status.WS_1013_TRY_AGAIN_LATER
+
+        # 거절된 연결 때문에 기존 연결이 끊기지 않음
+        websocket.send_text("still here")
+        assert receive_events(websocket, count=1)[0]["c"] == "still here"
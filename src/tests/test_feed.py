@@ -0,0 +1,246 @@
+import contextlib
+import uuid
+
+import pytest
+from redis import RedisError
+from sqlalchemy.orm import sessionmaker
+
+from config import settings
+from feed import tags
+from feed.models import Post
+from feed.versions import post_versions
+from user.models import User
+
+
+@pytest.fixture
+def test_post(test_session, test_user):
+    post = Post.create(user_id=test_user.id, image="feed/posts/test.png", content="hello")
+    test_session.add(post)
+    test_session.commit()
+    yield post
+    with contextlib.suppress(RedisError):
+        post_versions.delete(post_id=post.id)  # 테이블을 다시 만들면 게시글 id가 재사용됨
+
+
+# 태그 집계는 테스트마다 다른 키 사용(공용 Redis의 실제 집계를 오염시키지 않도록)
+@pytest.fixture
+def tag_keys(monkeypatch):
+    prefix = f"test:{uuid.uuid4().hex}:"
+    monkeypatch.setattr(tags, "COUNT_KEY", prefix + tags.COUNT_KEY)
+    monkeypatch.setattr(tags, "BUCKET_KEY", prefix + tags.BUCKET_KEY)
+    monkeypatch.setattr(tags, "TRENDING_CACHE_KEY", prefix + tags.TRENDING_CACHE_KEY)
+    yield prefix
+    with contextlib.suppress(RedisError):
+        if keys := tags.tag_counter.client.keys(prefix + "*"):
+            tags.tag_counter.client.delete(*keys)
+
+
+# FULLTEXT 인덱스는 커밋된 행만 검색 -> 테스트 트랜잭션(rollback) 대신 실제로 커밋하고 삭제
+@pytest.fixture
+def search_posts(test_db):
+    session = sessionmaker(expire_on_commit=False)(bind=test_db)
+    user = User.create(username="search_user", password="pw")
+    session.add(user)
+    session.commit()
+
+    contents = [
+        "파이썬 입문",
+        "파이썬 파이썬 파이썬 웹 서버",
+        "파이썬 입문",
+        "자바 스프링",
+        "고양이 사진",
+        "오늘 점심 메뉴",
+    ]
+    posts = [
+        Post.create(user_id=user.id, image="feed/posts/test.png", content=content)
+        for content in contents
+    ]
+    session.add_all(posts)
+    session.commit()
+    try:
+        yield posts
+    finally:
+        for post in posts:
+            session.delete(post)
+        session.delete(user)
+        session.commit()
+        session.close()
+
+
+def create_posts(test_session, user: User, contents: list[str]) -> list[Post]:
+    posts = [Post.create(user_id=user.id, image="feed/posts/test.png", content=c) for c in contents]
+    test_session.add_all(posts)
+    test_session.commit()
+    for post in posts:
+        tags.tag_counter.update(added=post.tag_names)  # 게시글 작성 핸들러와 같이 커밋 후 반영
+    return posts
+
+
+def test_get_posts_not_modified(client, test_session, test_user, test_post):
+    # given
+    response = client.get("/posts")
+    etag = response.headers["ETag"]
+
+    # when
+    cached = client.get("/posts", headers={"If-None-Match": etag})
+    create_posts(test_session, test_user, ["new post"])
+    changed = client.get("/posts", headers={"If-None-Match": etag})
+
+    # then
+    assert response.status_code == 200
+    assert [p["id"] for p in response.json()["posts"]] == [test_post.id]
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+    assert not cached.content
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert len(changed.json()["posts"]) == 2
+
+def test_get_post_not_modified_until_comments_change(
+    client, test_session, test_post, test_access_token
+):
+    # given
+    headers = {"Authorization": "Bearer " + test_access_token}
+    response = client.get(f"/posts/{test_post.id}")
+    etag = response.headers["ETag"]
+
+    # when
+    cached = client.get(f"/posts/{test_post.id}", headers={"If-None-Match": etag})
+    comment = client.post(
+        f"/posts/{test_post.id}/comments", json={"content": "comment"}, headers=headers
+    )
+    after_create = client.get(f"/posts/{test_post.id}", headers={"If-None-Match": etag})
+    client.delete(f"/comments/{comment.json()['id']}", headers=headers)
+    after_delete = client.get(
+        f"/posts/{test_post.id}", headers={"If-None-Match": after_create.headers["ETag"]}
+    )
+
+    # then
+    assert response.status_code == 200
+    assert response.headers["ETag"].startswith('W/"')
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+    assert comment.status_code == 201
+    assert after_create.status_code == 200
+    assert after_create.headers["ETag"] != etag
+    assert [c["content"] for c in after_create.json()["comments"]] == ["comment"]
+    assert after_delete.status_code == 200
+    assert after_delete.headers["ETag"] not in (etag, after_create.headers["ETag"])
+    assert after_delete.json()["comments"] == []
+
+def test_get_posts_compression(client, test_session, test_user, test_post):
+    # given
+    small = client.get("/posts", headers={"Accept-Encoding": "gzip"})
+    create_posts(test_session, test_user, [f"post {i}" for i in range(30)])
+
+    # when
+    identity = client.get("/posts", headers={"Accept-Encoding": "identity"})
+    gzipped = client.get("/posts", headers={"Accept-Encoding": "gzip"})
+    not_modified = client.get(
+        "/posts", headers={"Accept-Encoding": "gzip", "If-None-Match": gzipped.headers["ETag"]}
+    )
+
+    # then
+    # 최소 크기 미만은 압축하지 않음
+    assert len(small.content) < settings.compression_min_size
+    assert "Content-Encoding" not in small.headers
+
+    assert len(identity.content) >= settings.compression_min_size
+    assert "Content-Encoding" not in identity.headers
+    assert gzipped.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in gzipped.headers["Vary"]
+    assert gzipped.json() == identity.json()  # 클라이언트가 압축 해제
+
+    # 압축 여부와 관계없이 같은 ETag -> 304도 같은 ETag/Vary
+    assert gzipped.headers["ETag"] == identity.headers["ETag"]
+    assert not_modified.status_code == 304
+    assert not_modified.headers["ETag"] == gzipped.headers["ETag"]
+    assert "Accept-Encoding" in not_modified.headers["Vary"]
+
+def test_get_posts_brotli_negotiation(client, test_session, test_user):
+    # given
+    pytest.importorskip("brotli")  # 선택 의존성
+    create_posts(test_session, test_user, [f"post {i}" for i in range(30)])
+
+    # when
+    preferred = client.get("/posts", headers={"Accept-Encoding": "gzip, br"})
+    weighted = client.get("/posts", headers={"Accept-Encoding": "br;q=0.5, gzip"})
+
+    # then
+    assert preferred.headers["Content-Encoding"] == "br"  # q가 같으면 br 우선
+    assert weighted.headers["Content-Encoding"] == "gzip"
+    assert preferred.json() == weighted.json()
+
+def test_search_posts(client, search_posts):
+    # given
+    match_1, best, match_2 = search_posts[:3]
+
+    # when
+    response = client.get("/posts/search", params={"q": "파이썬"})
+
+    # then
+    assert response.status_code == 200
+    posts = response.json()["posts"]
+    # 관련도 순, 점수가 같으면 최신(id가 큰) 순
+    assert [p["id"] for p in posts] == [best.id, match_2.id, match_1.id]
+    assert posts[0]["score"] > posts[1]["score"] == posts[2]["score"]
+    assert response.json()["next_cursor"] is None
+
+def test_search_posts_cursor_paging(client, search_posts):
+    # given
+    match_1, best, match_2 = search_posts[:3]
+
+    # when
+    first = client.get("/posts/search", params={"q": "파이썬", "size": 2})
+    second = client.get(
+        "/posts/search",
+        params={"q": "파이썬", "size": 2, "cursor": first.json()["next_cursor"]},
+    )
+    invalid = client.get("/posts/search", params={"q": "파이썬", "cursor": "invalid"})
+
+    # then
+    # 같은 점수인 게시글이 페이지 경계에 걸려도 중복/누락 없음
+    assert [p["id"] for p in first.json()["posts"]] == [best.id, match_2.id]
+    assert first.json()["next_cursor"]
+    assert [p["id"] for p in second.json()["posts"]] == [match_1.id]
+    assert second.json()["next_cursor"] is None
+    assert invalid.status_code == 400
+
+def test_get_tag_posts(client, test_session, test_user, tag_keys):
+    # given
+    first, second, third = create_posts(
+        test_session, test_user, ["#Python 첫 글", "#python #FastAPI 둘째 글", "셋째 글 #PYTHON"]
+    )
+
+    # when
+    page_1 = client.get("/tags/Python/posts", params={"size": 2})
+    page_2 = client.get(
+        "/tags/Python/posts", params={"size": 2, "cursor": page_1.json()["next_cursor"]}
+    )
+
+    # then
+    assert page_1.status_code == 200
+    assert page_1.json()["tag"] == "python"
+    assert page_1.json()["count"] == 3
+    assert [p["id"] for p in page_1.json()["posts"]] == [third.id, second.id]  # 최신순
+    assert [p["id"] for p in page_2.json()["posts"]] == [first.id]
+    assert page_2.json()["next_cursor"] is None
+
+def test_get_trending_tags(client, test_session, test_user, tag_keys):
+    # given
+    create_posts(
+        test_session, test_user, ["#Python 첫 글", "#python #FastAPI 둘째 글", "셋째 글 #PYTHON"]
+    )
+
+    # when
+    response = client.get("/tags/trending")
+    limited = client.get("/tags/trending", params={"limit": 1})
+    over_limit = client.get("/tags/trending", params={"limit": tags.TRENDING_MAX_LIMIT + 1})
+
+    # then
+    assert response.status_code == 200
+    assert response.json() == {
+        "tags": [{"tag": "python", "count": 3}, {"tag": "fastapi", "count": 1}]
+    }
+    assert limited.json() == {"tags": [{"tag": "python", "count": 3}]}
+    assert over_limit.status_code == 400
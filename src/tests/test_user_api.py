@@ -1,7 +1,12 @@
 import base64
 
+from sqlalchemy import select
+
+from config import settings
 from tests.conftest import test_session
 from user.models import User
+from user.service.authentication import check_password, encode_access_token
+from user.service.username_filter import username_filter
 
 
 def test_health_check(client):
@@ -84,3 +89,128 @@ def test_delete_me(client, test_session, test_user, test_access_token):
 
     # then
     assert response.status_code == 204
+
+def test_username_availability(client, test_session, test_user):
+    # given
+    username_filter.add(username=test_user.username)
+
+    # when
+    taken = client.get("/users/availability", params={"username": "test_user"})
+    available = client.get("/users/availability", params={"username": "new_user"})
+
+    # then
+    assert taken.status_code == 200
+    assert taken.json() == {"username": "test_user", "available": False}
+    assert available.status_code == 200
+    assert available.json() == {"username": "new_user", "available": True}
+
+def test_get_users(client, test_session, test_user, test_access_token):
+    # given
+    other_user = User.create(username="other_user", password="pw")
+    test_session.add(other_user)
+    test_session.commit()
+
+    # when
+    by_ids = client.get(
+        "/users",
+        params={"ids": [test_user.id, other_user.id]},
+        headers={"Authorization": "Bearer " + test_access_token},
+    )
+    by_usernames = client.get(
+        "/users",
+        params={"usernames": ["other_user"]},
+        headers={"Authorization": "Bearer " + test_access_token},
+    )
+
+    # then
+    assert by_ids.status_code == 200
+    assert {u["username"] for u in by_ids.json()["users"]} == {
+        "test_user", "other_user"
+    }
+    assert by_usernames.status_code == 200
+    assert by_usernames.json()["users"] == [
+        {"id": other_user.id, "username": "other_user"}
+    ]
+
+def test_get_user_not_modified(client, test_session, test_user, test_access_token):
+    # given
+    headers = {"Authorization": "Bearer " + test_access_token}
+    response = client.get("/users/test_user", headers=headers)
+    etag = response.headers["ETag"]
+
+    # when
+    cached = client.get(
+        "/users/test_user", headers={**headers, "If-None-Match": etag}
+    )
+
+    # then
+    assert response.status_code == 200
+    assert response.json() == {"username": "test_user"}
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+    assert not cached.content
+
+def test_metrics(client, monkeypatch):
+    # given
+    monkeypatch.setattr(settings, "metrics_token", "metrics-token")
+    client.get("/")
+
+    # when
+    forbidden = client.get("/metrics")
+    response = client.get("/metrics", headers={"Authorization": "Bearer metrics-token"})
+
+    # then
+    assert forbidden.status_code == 403
+    assert response.status_code == 200
+    assert 'http_request_duration_seconds_count{method="GET",route="/",status="200"}' in response.text
+
+def test_get_me_async(async_client, test_async_user):
+    # given
+    access_token = encode_access_token(user_id=test_async_user.id)
+
+    # when
+    response = async_client.get(
+        "/users/me",
+        headers={"Authorization": "Bearer " + access_token}
+    )
+
+    # then
+    assert response.status_code == 200
+    assert response.json()["id"] == test_async_user.id
+    assert response.json()["username"] == test_async_user.username
+
+def test_user_sign_up_async(async_client, test_async_session):
+    # given
+
+    # when
+    response = async_client.post(
+        "/users",
+        json={"username": "test_user", "password": "pw"}
+    )
+
+    # then
+    assert response.status_code == 201
+    assert response.json()["id"]
+    assert response.json()["username"] == "test_user"
+
+    user = async_client.portal.call(
+        test_async_session.scalar, select(User).where(User.username == "test_user")
+    )
+    assert user
+    assert check_password(plain_text="pw", hashed_password=user.password)
+
+def test_user_login_async(async_client, test_async_user):
+    # given
+    encoded_bytes = base64.b64encode(b"test_user:pw")
+
+    # when
+    response = async_client.post(
+        "/users/login",
+        headers={"Authorization": "Basic " + encoded_bytes.decode("utf-8")},
+    )
+    wrong_password = async_client.post("/users/login", auth=("test_user", "wrong"))
+
+    # then
+    assert response.status_code == 200
+    assert response.json()["access_token"]
+    assert wrong_password.status_code == 401
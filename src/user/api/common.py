@@ -0,0 +1,10 @@
+# 동기/비동기 user 라우터가 같이 쓰는 값(라우터 모듈끼리 import하지 않도록)
+import asyncio
+
+# 사용자 일괄 조회(GET /users?ids=...) 최대 개수
+MAX_BATCH_SIZE = 100
+
+
+async def send_welcome_email(username):
+    await asyncio.sleep(5)
+    print(f"{username}님 회원가입을 환영합니다!")
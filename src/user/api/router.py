@@ -1,26 +1,32 @@
-import asyncio
-
 import httpx
-from fastapi import APIRouter, Path, Body, status, HTTPException, Depends, BackgroundTasks
+from fastapi import APIRouter, Path, Query, Body, status, HTTPException, Depends, BackgroundTasks, Request
 from fastapi.responses import RedirectResponse
 from fastapi.security import HTTPBasicCredentials, HTTPBasic
 
 from config import settings
+from config.http_cache import (
+    USER_PROFILE_CACHE_CONTROL, is_not_modified, make_etag, not_modified, set_cache_headers
+)
+from config.serialization import json_response, model_response
 from config.cache import redis_client
+from user.api.common import MAX_BATCH_SIZE, send_welcome_email
 from user.service.authentication import check_password, encode_access_token, authenticate
 from user.service.email_service import send_otp
 from user.models import User, SocialProvider
 from user.service.otp_service import create_otp
+from user.service.username_filter import username_filter
 from user.repository import UserRepository
 from user.schema.request import SignUpRequestBody
-from user.schema.response import UserMeResponse, UserResponse, JWTResponse
+from user.schema.response import (
+    UserMeResponse,
+    UserResponse,
+    UserListResponse,
+    JWTResponse,
+    UsernameAvailabilityResponse,
+)
 
 router = APIRouter(prefix="/users", tags=["User"])
 
-async def send_welcome_email(username):
-    await asyncio.sleep(5)
-    print(f"{username}님 회원가입을 환영합니다!")
-
 
 @router.post(
     "",
@@ -34,9 +40,28 @@ async def sign_up_handler(
 ):
     new_user = User.create(username=body.username, password=body.password)
     user_repo.save(user=new_user)
+    username_filter.add(username=new_user.username)
     background_tasks.add_task(send_welcome_email, username=new_user.username)
     return UserMeResponse.model_validate(obj=new_user)
 
+# username 중복 확인(회원가입 입력 중 호출)
+# : 블룸 필터에 없으면 DB 조회 없이 바로 응답
+@router.get(
+    "/availability",
+    response_model=UsernameAvailabilityResponse,
+    status_code=status.HTTP_200_OK,
+)
+def check_username_availability_handler(
+    username: str = Query(..., max_length=10),
+    user_repo: UserRepository = Depends(),
+):
+    if not username_filter.might_contain(username=username):
+        return UsernameAvailabilityResponse(username=username, available=True)
+
+    # 필터 오탐(false positive)일 수 있으므로 DB에서 확인
+    user: User | None = user_repo.get_user_by_username(username=username)
+    return UsernameAvailabilityResponse(username=username, available=user is None)
+
 @router.post(
     "/login",
     response_model=JWTResponse,
@@ -136,6 +161,7 @@ def kakao_social_callback_handler(
                 email=email,
             )
             user_repo.save(user=user)
+            username_filter.add(username=user.username)
 
             # 4) JWT 반환
             return JWTResponse(
@@ -226,7 +252,7 @@ def get_me_handler(
     user_repo: UserRepository = Depends(),
 ):
     if user := user_repo.get_user_by_id(user_id=user_id):
-        return UserMeResponse.model_validate(obj=user)
+        return model_response(UserMeResponse.model_validate(obj=user))
 
     raise HTTPException(
         status_code=status.HTTP_404_NOT_FOUND,
@@ -265,6 +291,7 @@ def delete_user_handler(
 ):
     if user := user_repo.get_user_by_id(user_id=user_id):
         user_repo.delete(user=user)
+        username_filter.remove(username=user.username)
         return
 
     raise HTTPException(
@@ -273,6 +300,38 @@ def delete_user_handler(
     )
 
 
+# 여러 사용자 정보 한 번에 조회(IN 쿼리 1번)
+# : GET /users?ids=1&ids=2 또는 GET /users?usernames=a&usernames=b
+@router.get(
+    "",
+    response_model=UserListResponse,
+    status_code=status.HTTP_200_OK,
+)
+def get_users_handler(
+    _: int = Depends(authenticate),
+    ids: list[int] | None = Query(None),
+    usernames: list[str] | None = Query(None),
+    user_repo: UserRepository = Depends(),
+):
+    if bool(ids) == bool(usernames):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Either ids or usernames is required",
+        )
+
+    if len(ids or usernames) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Up to {MAX_BATCH_SIZE} users can be requested at once",
+        )
+
+    if ids:
+        users = user_repo.get_users_by_ids(user_ids=ids)
+    else:
+        users = user_repo.get_users_by_usernames(usernames=usernames)
+    return json_response(UserListResponse.build_content(users=users))
+
+
 # 다른 사람 정보를 조회하는 경우
 @router.get(
     "/{username}",
@@ -280,13 +339,19 @@ def delete_user_handler(
     status_code=status.HTTP_200_OK,
 )
 def get_user_handler(
+    request: Request,
     _: str = Depends(authenticate),
     username: str = Path(..., max_length=10),
     user_repo: UserRepository = Depends(),
 ):
     user: User | None = user_repo.get_user_by_username(username=username)
     if user:
-        return UserResponse(username=user.username)
+        # 응답 본문(username)은 사용자 id가 같으면 바뀌지 않음
+        etag = make_etag("user", user.id)
+        if is_not_modified(request, etag):
+            return not_modified(etag, USER_PROFILE_CACHE_CONTROL)
+        response = model_response(UserResponse(username=user.username))
+        return set_cache_headers(response, etag, USER_PROFILE_CACHE_CONTROL)
 
     raise HTTPException(
         status_code=status.HTTP_404_NOT_FOUND,
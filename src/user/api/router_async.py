@@ -1,17 +1,35 @@
-from fastapi import APIRouter, Path, Body, status, HTTPException, Depends
+import httpx
+from fastapi import APIRouter, Path, Query, Body, status, HTTPException, Depends, BackgroundTasks, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import RedirectResponse
 from fastapi.security import HTTPBasicCredentials, HTTPBasic
 
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
-
-from config.database.connection_async import get_async_session
+from config import settings
+from config.http_cache import (
+    USER_PROFILE_CACHE_CONTROL, is_not_modified, make_etag, not_modified, set_cache_headers
+)
+from config.serialization import json_response, model_response
+from config.cache import async_redis_client
+from config.http import get_http_client
+from user.api.common import MAX_BATCH_SIZE, send_welcome_email
 from user.service.authentication import check_password, encode_access_token, authenticate
-from user.models import User
+from user.service.email_service import send_otp
+from user.models import User, SocialProvider
+from user.service.otp_service import create_otp
+from user.service.username_filter import async_username_filter
+from user.repository import AsyncUserRepository
 from user.schema.request import SignUpRequestBody
-from user.schema.response import UserMeResponse, UserResponse, JWTResponse
+from user.schema.response import (
+    UserMeResponse,
+    UserResponse,
+    UserListResponse,
+    JWTResponse,
+    UsernameAvailabilityResponse,
+)
 
 router = APIRouter(prefix="/users", tags=["AsyncUser"])
 
+
 @router.post(
     "",
     response_model=UserMeResponse,
@@ -19,15 +37,33 @@ router = APIRouter(prefix="/users", tags=["AsyncUser"])
 )
 async def sign_up_handler(
     body: SignUpRequestBody,
-    session: AsyncSession = Depends(get_async_session),
+    background_tasks: BackgroundTasks,
+    user_repo: AsyncUserRepository = Depends(),
 ):
-    new_user = User.create(username=body.username, password=body.password)
-    session.add(new_user)
-    await session.commit()  # db 저장
-
-    return UserMeResponse(
-        id=new_user.id, username=new_user.username, password=new_user.password
+    # bcrypt 해싱은 CPU를 오래 점유하기 때문에
+    # 이벤트 루프를 막지 않도록 스레드풀에서 실행
+    new_user = await run_in_threadpool(
+        User.create, username=body.username, password=body.password
     )
+    await user_repo.save(user=new_user)
+    await async_username_filter.add(username=new_user.username)
+    background_tasks.add_task(send_welcome_email, username=new_user.username)
+    return UserMeResponse.model_validate(obj=new_user)
+
+@router.get(
+    "/availability",
+    response_model=UsernameAvailabilityResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def check_username_availability_handler(
+    username: str = Query(..., max_length=10),
+    user_repo: AsyncUserRepository = Depends(),
+):
+    if not await async_username_filter.might_contain(username=username):
+        return UsernameAvailabilityResponse(username=username, available=True)
+
+    user: User | None = await user_repo.get_user_by_username(username=username)
+    return UsernameAvailabilityResponse(username=username, available=user is None)
 
 @router.post(
     "/login",
@@ -36,16 +72,14 @@ async def sign_up_handler(
 )
 async def login_handler(
     credentials: HTTPBasicCredentials = Depends(HTTPBasic()),
-    session: AsyncSession = Depends(get_async_session),
+    user_repo: AsyncUserRepository = Depends(),
 ):
-    result = await session.execute(
-        select(User).filter(User.username == credentials.username)
-    )
-    user: User | None = result.scalars().first()
-
-    if user:
-        if check_password(
-            plain_text=credentials.password, hashed_password=user.password
+    if user := await user_repo.get_user_by_username(username=credentials.username):
+        # bcrypt 검증도 스레드풀에서 실행
+        if await run_in_threadpool(
+            check_password,
+            plain_text=credentials.password,
+            hashed_password=user.password,
         ):
             return JWTResponse(
                 access_token=encode_access_token(user_id=user.id),
@@ -60,19 +94,156 @@ async def login_handler(
     )
 
 
+@router.get(
+    "/social/kakao/login",
+    status_code=status.HTTP_200_OK,
+)
+async def kakao_social_login_handler():
+    return RedirectResponse(
+        "https://kauth.kakao.com/oauth/authorize"
+        f"?client_id={settings.kakao_rest_api_key}"
+        f"&redirect_uri={settings.kakao_redirect_url}"
+        f"&response_type=code",
+    )
+
+
+@router.get(
+    "/social/kakao/callback",
+    status_code=status.HTTP_200_OK,
+)
+async def kakao_social_callback_handler(
+    code: str,
+    user_repo: AsyncUserRepository = Depends(),
+    client: httpx.AsyncClient = Depends(get_http_client),
+):
+    # lifespan에서 만든 클라이언트를 공유(요청마다 커넥션 풀 생성 X)
+    # 1) auth_code -> access_token 발급받기
+    response = await client.post(
+        "https://kauth.kakao.com/oauth/token",
+        data={
+            "grant_type": "authorization_code",
+            "client_id": settings.kakao_rest_api_key,
+            "redirect_uri": settings.kakao_redirect_url,
+            "code": code,
+        },
+        headers={
+            "Content-Type": "application/x-www-form-urlencoded;charset=UTF-8",
+        }
+    )
+    response.raise_for_status()
+
+    # 2) access_token -> 사용자 정보 조회
+    access_token: str = response.json().get("access_token")
+    profile_response = await client.get(
+        "https://kapi.kakao.com/v2/user/me",
+        headers={"Authorization": f"Bearer {access_token}"}
+    )
+    profile_response.raise_for_status()
+
+    # 3) 사용자 정보 -> 회원가입/로그인
+    user_profile: dict = profile_response.json()
+
+    user_subject: str = str(user_profile["id"])
+    email: str = user_profile["kakao_account"]["email"]
+
+    user: User | None = await user_repo.get_user_by_social_email(
+        social_provider=SocialProvider.KAKAO, email=email
+    )
+
+    # 이미 가입된 사용자 -> 로그인
+    if user:
+        return JWTResponse(
+            access_token=encode_access_token(user_id=user.id)
+        )
+
+    # 처음 소셜 로그인하는 경우
+    user = await run_in_threadpool(
+        User.social_signup,
+        social_provider=SocialProvider.KAKAO,
+        subject=user_subject,
+        email=email,
+    )
+    await user_repo.save(user=user)
+    await async_username_filter.add(username=user.username)
+
+    # 4) JWT 반환
+    return JWTResponse(
+        access_token=encode_access_token(user_id=user.id)
+    )
+
+
+@router.post(
+    "/email/otp",
+    status_code=status.HTTP_200_OK,
+)
+async def create_email_otp_handler(
+    background_tasks: BackgroundTasks,
+    user_id: int = Depends(authenticate),
+    email: str = Body(
+        ...,
+        pattern=r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$",
+        embed=True,
+        examples=["admin@example.com"],
+    ),
+    user_repo: AsyncUserRepository = Depends(),
+):
+    if not (user := await user_repo.get_user_by_id(user_id=user_id)):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found",
+        )
+
+    # 3분 TTL 걸고 OTP를 Redis 저장
+    otp: int = create_otp()
+    cache_key: str = f"users:{user.id}:email:otp"
+    async with async_redis_client.pipeline(transaction=True) as pipe:
+        pipe.hset(name=cache_key, mapping={"otp": otp, "email": email})
+        pipe.expire(cache_key, 3 * 60)
+        await pipe.execute()
+
+    background_tasks.add_task(send_otp, email=email, otp=otp)
+    return {"detail": "Success"}
+
+
+@router.post("/email/otp/verify")
+async def verify_email_otp_handler(
+    user_id: int = Depends(authenticate),
+    otp: int = Body(..., embed=True, ge=100_000, le=999_999),
+    user_repo: AsyncUserRepository = Depends(),
+):
+    if not (user := await user_repo.get_user_by_id(user_id=user_id)):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found",
+        )
+
+    cached_data = await async_redis_client.hgetall(f"users:{user.id}:email:otp")
+    if not (cached_otp := cached_data.get("otp")):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="OTP not found",
+        )
+
+    if otp != int(cached_otp):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="OTP mismatch",
+        )
+
+    email: str = cached_data.get("email")
+    user.update_email(email=email)
+    await user_repo.save(user=user)
+    return UserMeResponse.model_validate(obj=user)
+
+
 # 내 정보 조회
 @router.get("/me")
 async def get_me_handler(
     user_id: int = Depends(authenticate),
-    session: AsyncSession = Depends(get_async_session),
+    user_repo: AsyncUserRepository = Depends(),
 ):
-    result = await session.execute(select(User).filter(User.username == username))
-    user: User | None = result.scalars().first()
-
-    if user:
-        return UserMeResponse(
-            id=user.id, username=user.username, password=user.password
-        )
+    if user := await user_repo.get_user_by_id(user_id=user_id):
+        return model_response(UserMeResponse.model_validate(obj=user))
 
     raise HTTPException(
         status_code=status.HTTP_404_NOT_FOUND,
@@ -88,19 +259,12 @@ async def get_me_handler(
 async def update_user_handler(
     user_id: int = Depends(authenticate),
     new_password: str = Body(..., embed=True),
-    session: AsyncSession = Depends(get_async_session),
+    user_repo: AsyncUserRepository = Depends(),
 ):
-    result = await session.execute(select(User).filter(User.username == username))
-    user: User | None = result.scalars().first()
-
-    if user:
-        user.update_password(password=new_password)
-        session.add(user)
-        session.commit()
-
-        return UserMeResponse(
-            id=user.id, username=user.username, password=user.password
-        )
+    if user := await user_repo.get_user_by_id(user_id=user_id):
+        await run_in_threadpool(user.update_password, password=new_password)
+        await user_repo.save(user=user)
+        return UserMeResponse.model_validate(obj=user)
 
     raise HTTPException(
         status_code=status.HTTP_404_NOT_FOUND,
@@ -114,14 +278,11 @@ async def update_user_handler(
 )
 async def delete_user_handler(
     user_id: int = Depends(authenticate),
-    session: AsyncSession = Depends(get_async_session),
+    user_repo: AsyncUserRepository = Depends(),
 ):
-    result = await session.execute(select(User).filter(User.username == username))
-    user: User | None = result.scalars().first()
-
-    if user:
-        await session.delete(user)  # mark
-        await session.commit()
+    if user := await user_repo.get_user_by_id(user_id=user_id):
+        await user_repo.delete(user=user)
+        await async_username_filter.remove(username=user.username)
         return
 
     raise HTTPException(
@@ -130,6 +291,38 @@ async def delete_user_handler(
     )
 
 
+# 여러 사용자 정보 한 번에 조회(IN 쿼리 1번)
+# : GET /users?ids=1&ids=2 또는 GET /users?usernames=a&usernames=b
+@router.get(
+    "",
+    response_model=UserListResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def get_users_handler(
+    _: int = Depends(authenticate),
+    ids: list[int] | None = Query(None),
+    usernames: list[str] | None = Query(None),
+    user_repo: AsyncUserRepository = Depends(),
+):
+    if bool(ids) == bool(usernames):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Either ids or usernames is required",
+        )
+
+    if len(ids or usernames) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Up to {MAX_BATCH_SIZE} users can be requested at once",
+        )
+
+    if ids:
+        users = await user_repo.get_users_by_ids(user_ids=ids)
+    else:
+        users = await user_repo.get_users_by_usernames(usernames=usernames)
+    return json_response(UserListResponse.build_content(users=users))
+
+
 # 다른 사람 정보를 조회하는 경우
 @router.get(
     "/{username}",
@@ -137,15 +330,19 @@ async def delete_user_handler(
     status_code=status.HTTP_200_OK,
 )
 async def get_user_handler(
+    request: Request,
     _: str = Depends(authenticate),
     username: str = Path(..., max_length=10),
-    session: AsyncSession = Depends(get_async_session),
+    user_repo: AsyncUserRepository = Depends(),
 ):
-    result = await session.execute(select(User).filter(User.username == username))
-    user: User | None = result.scalars().first()
-
+    user: User | None = await user_repo.get_user_by_username(username=username)
     if user:
-        return UserResponse(username=user.username)
+        # 응답 본문(username)은 사용자 id가 같으면 바뀌지 않음
+        etag = make_etag("user", user.id)
+        if is_not_modified(request, etag):
+            return not_modified(etag, USER_PROFILE_CACHE_CONTROL)
+        response = model_response(UserResponse(username=user.username))
+        return set_cache_headers(response, etag, USER_PROFILE_CACHE_CONTROL)
 
     raise HTTPException(
         status_code=status.HTTP_404_NOT_FOUND,
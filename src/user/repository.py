@@ -1,12 +1,17 @@
 # DB에 작업(생성, 조회, 수정, 삭제)
 from fastapi import Depends
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from config.database.connection import get_session
+from config.database.connection_async import get_async_session
+from config.tracing import traced
 from user.models import User, SocialProvider
 
 
 class UserRepository:
+    @traced("UserRepository")
     def __init__(self, session: Session = Depends(get_session)):
         self.session = session
 
@@ -20,6 +25,12 @@ class UserRepository:
     def get_user_by_username(self, username: str) -> User | None:
         return self.session.query(User).filter_by(username=username).first()
 
+    def get_users_by_ids(self, user_ids: list[int]) -> list[User]:
+        return self.session.query(User).filter(User.id.in_(user_ids)).all()
+
+    def get_users_by_usernames(self, usernames: list[str]) -> list[User]:
+        return self.session.query(User).filter(User.username.in_(usernames)).all()
+
     def get_user_by_social_email(
         self, social_provider: SocialProvider, email: str
     ) -> User | None:
@@ -31,3 +42,51 @@ class UserRepository:
     def delete(self, user: User) -> None:
         self.session.delete(user)
         self.session.commit()
+
+
+# user/api/router_async.py 에서 사용
+class AsyncUserRepository:
+    @traced("AsyncUserRepository")
+    def __init__(self, session: AsyncSession = Depends(get_async_session)):
+        self.session = session
+
+    async def save(self, user: User) -> None:
+        self.session.add(user)
+        await self.session.commit()
+
+    async def get_user_by_id(self, user_id: int) -> User | None:
+        result = await self.session.execute(select(User).filter_by(id=user_id))
+        return result.scalars().first()
+
+    async def get_user_by_username(self, username: str) -> User | None:
+        result = await self.session.execute(
+            select(User).filter_by(username=username)
+        )
+        return result.scalars().first()
+
+    async def get_users_by_ids(self, user_ids: list[int]) -> list[User]:
+        result = await self.session.execute(
+            select(User).filter(User.id.in_(user_ids))
+        )
+        return list(result.scalars().all())
+
+    async def get_users_by_usernames(self, usernames: list[str]) -> list[User]:
+        result = await self.session.execute(
+            select(User).filter(User.username.in_(usernames))
+        )
+        return list(result.scalars().all())
+
+    async def get_user_by_social_email(
+        self, social_provider: SocialProvider, email: str
+    ) -> User | None:
+        result = await self.session.execute(
+            select(User).filter(
+                User.social_provider == social_provider,
+                User.email == email,
+            )
+        )
+        return result.scalars().first()
+
+    async def delete(self, user: User) -> None:
+        await self.session.delete(user)
+        await self.session.commit()
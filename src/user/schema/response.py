@@ -15,5 +15,30 @@ class UserResponse(BaseModel):
     username: str
 
 
+# 여러 사용자 정보 한 번에 조회
+class UserBriefResponse(BaseModel):
+    id: int
+    username: str
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class UserListResponse(BaseModel):
+    users: list[UserBriefResponse]
+
+    @classmethod
+    def build(cls, users: list):
+        return cls(users=[UserBriefResponse.model_validate(obj=u) for u in users])
+
+    @staticmethod
+    def build_content(users: list) -> dict:
+        return {"users": [{"id": u.id, "username": u.username} for u in users]}
+
+
 class JWTResponse(BaseModel):
     access_token: str
+
+
+class UsernameAvailabilityResponse(BaseModel):
+    username: str
+    available: bool
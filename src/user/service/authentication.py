@@ -7,11 +7,14 @@ from typing import TypedDict
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
+from config import get_settings
+from config.tracing import traced
+
 
 # password
 def hash_password(plain_text: str) -> str:
     hashed_password_bytes: bytes = bcrypt.hashpw(
-        plain_text.encode("utf-8"), bcrypt.gensalt()
+        plain_text.encode("utf-8"), bcrypt.gensalt(rounds=get_settings().bcrypt_rounds)
     )
     return hashed_password_bytes.decode("utf-8")
 
@@ -44,6 +47,7 @@ def decode_access_token(access_token: str) -> JWTPayload:
         access_token, SECRET_KEY, algorithms=[ALGORITHM]
     )
 
+@traced("authenticate")
 def authenticate(
     auth_header: HTTPAuthorizationCredentials = Depends(HTTPBearer())
 ) -> int:
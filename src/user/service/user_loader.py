@@ -0,0 +1,42 @@
+# 요청 단위(request-scoped) DataLoader
+# - add()로 필요한 user_id를 모아두고
+# - dispatch() 한 번에 IN 쿼리 1번으로 조회(중복 제거)
+# - 같은 요청 안에서는 조회 결과를 재사용
+from fastapi import Depends
+
+from user.models import User
+from user.repository import UserRepository
+
+
+class UserLoader:
+    def __init__(self, user_repo: UserRepository = Depends()):
+        self.user_repo = user_repo
+        self._pending: set[int] = set()
+        self._cache: dict[int, User | None] = {}
+
+    def add(self, user_id: int) -> None:
+        if user_id not in self._cache:
+            self._pending.add(user_id)
+
+    def dispatch(self) -> None:
+        if not self._pending:
+            return
+
+        user_ids, self._pending = self._pending, set()
+        users = self.user_repo.get_users_by_ids(user_ids=list(user_ids))
+        found = {user.id: user for user in users}
+        for user_id in user_ids:
+            # 탈퇴한 사용자는 None으로 캐싱(같은 id를 다시 조회하지 않음)
+            self._cache[user_id] = found.get(user_id)
+
+    def get(self, user_id: int) -> User | None:
+        if user_id not in self._cache:
+            self.add(user_id)
+            self.dispatch()
+        return self._cache[user_id]
+
+    def load_many(self, user_ids: list[int]) -> dict[int, User | None]:
+        for user_id in user_ids:
+            self.add(user_id)
+        self.dispatch()
+        return {user_id: self._cache[user_id] for user_id in user_ids}
@@ -0,0 +1,125 @@
+# 사용 중인 username을 Redis 카운팅 블룸 필터로 관리
+# - 필터에 없으면 -> 확실히 사용 가능(DB 조회 X)
+# - 필터에 있으면 -> 아마도 사용 중(DB 조회로 확인)
+# 회원 탈퇴 시 제거할 수 있도록 비트 대신 4bit 카운터(BITFIELD u4)를 사용
+# Redis 오류 시: 조회는 "아마도 사용 중"으로 보고 DB 조회, 추가/제거는 로그만 남김
+#   (이미 커밋된 가입/탈퇴가 실패하지 않도록, 어긋난 필터는 commands.rebuild_username_filter로 다시 생성)
+import hashlib
+import logging
+
+from redis import Redis, RedisError
+from redis.asyncio import Redis as AsyncRedis
+
+from config.cache import redis_client, async_redis_client
+
+FILTER_KEY = "users:username:bloom"
+FILTER_SIZE = 2 ** 24  # 카운터 개수(8MB) -> 사용자 100만명 기준 오탐률 약 0.1%
+HASH_COUNT = 7
+COUNTER_TYPE = "u4"
+COUNTER_MAX = 15
+
+logger = logging.getLogger(__name__)
+FILTER_UPDATE_FAILED = (
+    "Failed to update username filter (run commands.rebuild_username_filter to repair)"
+)
+
+
+def get_offsets(username: str) -> list[int]:
+    # double hashing: h1 + i * h2
+    digest = hashlib.blake2b(username.encode("utf-8"), digest_size=16).digest()
+    h1 = int.from_bytes(digest[:8], "little")
+    h2 = int.from_bytes(digest[8:], "little") | 1
+    return [(h1 + i * h2) % FILTER_SIZE for i in range(HASH_COUNT)]
+
+
+def build_filter_bytes(usernames) -> bytes:
+    # BITFIELD u4 #i 카운터는 i번째 니블(상위 니블부터)에 저장됨
+    counters = bytearray(FILTER_SIZE // 2)
+    for username in usernames:
+        for offset in get_offsets(username):
+            index, high = divmod(offset, 2)
+            value = counters[index]
+            if high == 0:
+                if (value >> 4) < COUNTER_MAX:
+                    counters[index] = value + 0x10
+            elif (value & 0x0F) < COUNTER_MAX:
+                counters[index] = value + 1
+    return bytes(counters)
+
+
+class UsernameFilter:
+    def __init__(self, client: Redis, key: str = FILTER_KEY):
+        self.client = client
+        self.key = key
+
+    def _incrby(self, username: str, increment: int) -> None:
+        bitfield = self.client.bitfield(self.key, default_overflow="SAT")
+        for offset in get_offsets(username):
+            bitfield.incrby(COUNTER_TYPE, f"#{offset}", increment)
+        bitfield.execute()
+
+    def add(self, username: str) -> None:
+        try:
+            self._incrby(username=username, increment=1)
+        except RedisError:
+            logger.exception(FILTER_UPDATE_FAILED)
+
+    def remove(self, username: str) -> None:
+        try:
+            self._incrby(username=username, increment=-1)
+        except RedisError:
+            logger.exception(FILTER_UPDATE_FAILED)
+
+    def might_contain(self, username: str) -> bool:
+        bitfield = self.client.bitfield(self.key)
+        for offset in get_offsets(username):
+            bitfield.get(COUNTER_TYPE, f"#{offset}")
+        try:
+            return all(bitfield.execute())
+        except RedisError:
+            logger.warning("Username filter unavailable, checking DB", exc_info=True)
+            return True
+
+    def rebuild(self, usernames) -> None:
+        # 임시 키에 새로 만든 뒤 RENAME으로 교체(조회 중단 없음)
+        tmp_key = f"{self.key}:rebuild"
+        self.client.set(tmp_key, build_filter_bytes(usernames))
+        self.client.rename(tmp_key, self.key)
+
+
+class AsyncUsernameFilter:
+    def __init__(self, client: AsyncRedis, key: str = FILTER_KEY):
+        self.client = client
+        self.key = key
+
+    async def _incrby(self, username: str, increment: int) -> None:
+        bitfield = self.client.bitfield(self.key, default_overflow="SAT")
+        for offset in get_offsets(username):
+            bitfield.incrby(COUNTER_TYPE, f"#{offset}", increment)
+        await bitfield.execute()
+
+    async def add(self, username: str) -> None:
+        try:
+            await self._incrby(username=username, increment=1)
+        except RedisError:
+            logger.exception(FILTER_UPDATE_FAILED)
+
+    async def remove(self, username: str) -> None:
+        try:
+            await self._incrby(username=username, increment=-1)
+        except RedisError:
+            logger.exception(FILTER_UPDATE_FAILED)
+
+    async def might_contain(self, username: str) -> bool:
+        bitfield = self.client.bitfield(self.key)
+        for offset in get_offsets(username):
+            bitfield.get(COUNTER_TYPE, f"#{offset}")
+        try:
+            return all(await bitfield.execute())
+        except RedisError:
+            logger.warning("Username filter unavailable, checking DB", exc_info=True)
+            return True
+
+
+username_filter = UsernameFilter(client=redis_client)
+async_username_filter = AsyncUsernameFilter(client=async_redis_client)